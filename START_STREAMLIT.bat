@@ -13,7 +13,9 @@ echo   - From phone (same WiFi): http://192.168.1.8:8501
 echo.
 echo ========================================
 echo.
-echo Make sure Backend and ML services are running!
+echo Make sure the Backend is running. The ML engines are loaded from
+echo ..\ml-service and run inside Streamlit when that folder is present;
+echo otherwise (or with EMBEDDED_ENGINES=0) start the ML service too.
 echo.
 
 cd streamlit-app
@@ -2,6 +2,9 @@ const express = require('express');
 const router = express.Router();
 const auth = require('../middleware/auth');
 const User = require('../models/User');
+const axios = require('axios');
+
+const ML_SERVICE_URL = process.env.ML_SERVICE_URL || 'http://localhost:5001';
 
 // Simulated device list
 const AVAILABLE_DEVICES = [
@@ -165,4 +168,23 @@ router.post('/sync/:deviceId', auth, async (req, res) => {
   }
 });
 
+// Bulk upload of device readings (NDJSON or packed binary), streamed to the ML service
+router.post('/ingest/:deviceId', auth, async (req, res) => {
+  try {
+    const mlResponse = await axios.post(`${ML_SERVICE_URL}/api/ingest`, req, {
+      params: { userId: String(req.userId) },
+      headers: {
+        'Content-Type': req.headers['content-type'] || 'application/x-ndjson',
+        ...(req.headers.traceparent ? { traceparent: req.headers.traceparent } : {})
+      },
+      maxBodyLength: Infinity,
+      validateStatus: (status) => status < 500
+    });
+
+    res.status(mlResponse.status).json({ deviceId: req.params.deviceId, ...mlResponse.data });
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
 module.exports = router;
@@ -9,6 +9,7 @@ const Tesseract = require('tesseract.js');
 const pdfParse = require('pdf-parse');
 const sharp = require('sharp');
 const { analyzeWithGeminiVision } = require('../services/prescriptionAnalyzer');
+const chunkedUploads = require('../services/chunkedUploads');
 
 // Ensure uploads directory exists
 const uploadsDir = path.join(__dirname, '../uploads/documents');
@@ -16,6 +17,9 @@ if (!fs.existsSync(uploadsDir)) {
   fs.mkdirSync(uploadsDir, { recursive: true });
 }
 
+// Chunked uploads in progress; a dot directory, so express.static never serves partial files
+const incomingDir = path.join(uploadsDir, '..', '.incoming');
+
 // Multer configuration
 const storage = multer.diskStorage({
   destination: (req, file, cb) => {
@@ -320,6 +324,97 @@ router.post('/upload', auth, upload.single('document'), async (req, res) => {
   }
 });
 
+const sendUploadError = (res, error) => {
+  if (error instanceof chunkedUploads.UploadError) {
+    return res.status(error.status).json({ error: error.message, ...error.details });
+  }
+  res.status(500).json({ error: error.message });
+};
+
+const uploadStatus = (manifest) => ({
+  uploadId: manifest.id,
+  chunkSize: manifest.chunkSize,
+  fileSize: manifest.fileSize,
+  received: manifest.received
+});
+
+// Start a resumable upload: { fileName, fileSize, sha256, documentType, notes }
+router.post('/uploads', auth, async (req, res) => {
+  try {
+    const { fileName, documentType } = req.body;
+    if (!/\.(jpeg|jpg|png|pdf|doc|docx)$/i.test(fileName || '')) {
+      return res.status(400).json({ error: 'Only images, PDFs, and documents are allowed' });
+    }
+    if (!MedicalDocument.schema.path('documentType').enumValues.includes(documentType)) {
+      return res.status(400).json({ error: 'Unknown document type' });
+    }
+
+    const manifest = await chunkedUploads.createUpload(incomingDir, { ...req.body, userId: req.userId });
+    res.status(201).json(uploadStatus(manifest));
+  } catch (error) {
+    sendUploadError(res, error);
+  }
+});
+
+// How much of an upload the server holds, to resume after an interruption
+router.get('/uploads/:uploadId', auth, async (req, res) => {
+  try {
+    const manifest = await chunkedUploads.loadUpload(incomingDir, req.params.uploadId, req.userId);
+    res.json(uploadStatus(manifest));
+  } catch (error) {
+    sendUploadError(res, error);
+  }
+});
+
+// Append one chunk: raw body at ?offset=N, its hex SHA-256 in X-Chunk-Sha256
+router.put('/uploads/:uploadId', auth, async (req, res) => {
+  try {
+    const manifest = await chunkedUploads.loadUpload(incomingDir, req.params.uploadId, req.userId);
+    const offset = Number(req.query.offset);
+    await chunkedUploads.writeChunk(incomingDir, manifest, offset, req.get('X-Chunk-Sha256'), req);
+    res.json(uploadStatus(manifest));
+  } catch (error) {
+    sendUploadError(res, error);
+  }
+});
+
+// Verify the whole file and turn it into a document
+router.post('/uploads/:uploadId/complete', auth, async (req, res) => {
+  try {
+    const manifest = await chunkedUploads.loadUpload(incomingDir, req.params.uploadId, req.userId);
+    const filename = await chunkedUploads.completeUpload(incomingDir, manifest, uploadsDir);
+
+    const document = new MedicalDocument({
+      userId: req.userId,
+      documentType: manifest.documentType,
+      fileName: manifest.fileName,
+      fileUrl: `/uploads/documents/${filename}`,
+      fileSize: manifest.fileSize,
+      notes: manifest.notes
+    });
+
+    await document.save();
+
+    res.status(201).json({
+      message: 'Document uploaded successfully',
+      document
+    });
+  } catch (error) {
+    sendUploadError(res, error);
+  }
+});
+
+// Abandon an upload and free its space
+router.delete('/uploads/:uploadId', auth, async (req, res) => {
+  try {
+    const manifest = await chunkedUploads.loadUpload(incomingDir, req.params.uploadId, req.userId);
+    await chunkedUploads.removeUpload(incomingDir, manifest.id);
+    res.json({ message: 'Upload cancelled' });
+  } catch (error) {
+    sendUploadError(res, error);
+  }
+});
+
 // Analyze prescription with OCR
 router.post('/analyze-prescription', auth, analyzeUpload.single('document'), async (req, res) => {
   try {
@@ -7,6 +7,12 @@ const axios = require('axios');
 
 const ML_SERVICE_URL = process.env.ML_SERVICE_URL || 'http://localhost:5001';
 
+// Forward W3C trace context so ML spans join the caller's trace
+const traceHeaders = (req) => (req.headers.traceparent ? { traceparent: req.headers.traceparent } : {});
+
+// The ML service caches profile-derived features per user and version; every profile save bumps updatedAt
+const profileVersion = (user) => (user.updatedAt ? user.updatedAt.getTime() : undefined);
+
 // Predict health status
 router.post('/predict', auth, async (req, res) => {
   try {
@@ -23,6 +29,8 @@ router.post('/predict', auth, async (req, res) => {
 
     // Prepare data for ML service
     const predictionData = {
+      userId: String(req.userId),
+      profileVersion: profileVersion(user),
       metrics: healthData.metrics,
       userProfile: {
         age: user.profile.age,
@@ -36,7 +44,9 @@ router.post('/predict', auth, async (req, res) => {
     };
 
     // Call ML service
-    const mlResponse = await axios.post(`${ML_SERVICE_URL}/api/predict`, predictionData);
+    const mlResponse = await axios.post(`${ML_SERVICE_URL}/api/predict`, predictionData, {
+      headers: traceHeaders(req)
+    });
     
     // Update health data with prediction
     healthData.prediction = mlResponse.data.prediction;
@@ -45,6 +55,7 @@ router.post('/predict', auth, async (req, res) => {
     res.json({
       message: 'Prediction completed successfully',
       prediction: mlResponse.data.prediction,
+      cached: Boolean(mlResponse.data.cached),
       healthData: healthData
     });
   } catch (error) {
@@ -74,11 +85,15 @@ router.post('/nutrition', auth, async (req, res) => {
       heartRate: latestHealth.metrics.heartRate,
       exerciseFrequency: user.profile.exerciseFrequency,
       dietType: user.profile.dietType,
-      healthConditions: user.profile.currentChronicConditions
+      healthConditions: user.profile.currentChronicConditions,
+      userId: String(req.userId),
+      profileVersion: profileVersion(user)
     };
 
     // Call ML service for nutrition recommendations
-    const mlResponse = await axios.post(`${ML_SERVICE_URL}/api/nutrition`, nutritionData);
+    const mlResponse = await axios.post(`${ML_SERVICE_URL}/api/nutrition`, nutritionData, {
+      headers: traceHeaders(req)
+    });
 
     res.json(mlResponse.data);
   } catch (error) {
@@ -87,4 +102,38 @@ router.post('/nutrition', auth, async (req, res) => {
   }
 });
 
+// Downsampled metric trend for charts (payload size follows `width`, not history length)
+router.get('/trends', auth, async (req, res) => {
+  try {
+    const { metric = 'heartRate', start, end, width, method } = req.query;
+    const mlResponse = await axios.get(`${ML_SERVICE_URL}/api/trends`, {
+      params: { userId: String(req.userId), metric, start, end, width, method },
+      headers: traceHeaders(req),
+      validateStatus: (status) => status < 500
+    });
+
+    res.status(mlResponse.status).json(mlResponse.data);
+  } catch (error) {
+    console.error('Trend error:', error.message);
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Raw readings newer than `since`, in pages, for clients that keep their own copy (the Streamlit chart)
+router.get('/history', auth, async (req, res) => {
+  try {
+    const { metric = 'heartRate', since, limit } = req.query;
+    const mlResponse = await axios.get(`${ML_SERVICE_URL}/api/history`, {
+      params: { userId: String(req.userId), metric, since, limit },
+      headers: traceHeaders(req),
+      validateStatus: (status) => status < 500
+    });
+
+    res.status(mlResponse.status).json(mlResponse.data);
+  } catch (error) {
+    console.error('History error:', error.message);
+    res.status(500).json({ error: error.message });
+  }
+});
+
 module.exports = router;
@@ -5,6 +5,9 @@ const User = require('../models/User');
 const multer = require('multer');
 const path = require('path');
 const fs = require('fs');
+const axios = require('axios');
+
+const ML_SERVICE_URL = process.env.ML_SERVICE_URL || 'http://localhost:5001';
 
 // Ensure uploads directory exists
 const uploadsDir = path.join(__dirname, '../uploads/avatars');
@@ -67,6 +70,11 @@ router.put('/profile', auth, async (req, res) => {
 
     await user.save();
 
+    // Drop the ML service's cached features for the old profile; a failure only delays it
+    // until the next request, which carries the new profile version anyway
+    axios.post(`${ML_SERVICE_URL}/api/profile-updated`, { userId: String(req.userId) }, { timeout: 2000 })
+      .catch((error) => console.error('Profile update notification failed:', error.message));
+
     res.json({
       message: 'Profile updated successfully',
       user: await User.findById(req.userId).select('-password')
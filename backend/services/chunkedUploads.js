@@ -0,0 +1,186 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const { Transform } = require('stream');
+const { pipeline } = require('stream/promises');
+
+// Receiver for resumable document uploads. The client announces the file
+// (name, size, SHA-256), then PUTs it in chunks at increasing offsets. Each
+// chunk is streamed straight to a .part file while it is hashed, so memory
+// stays at one socket buffer whatever the file size; only chunks whose hash
+// matches advance the upload. State lives next to the .part file as a small
+// JSON manifest, so an interrupted upload (client or server restart) resumes
+// from the last verified byte.
+
+const CHUNK_BYTES = parseInt(process.env.UPLOAD_CHUNK_BYTES) || 4 * 1024 * 1024;
+const MAX_UPLOAD_BYTES = parseInt(process.env.MAX_CHUNKED_UPLOAD_BYTES) || 2 * 1024 * 1024 * 1024;
+const STALE_UPLOAD_MS = 24 * 60 * 60 * 1000;
+const UPLOAD_ID = /^[a-f0-9]{32}$/;
+const SHA256_HEX = /^[a-f0-9]{64}$/;
+
+class UploadError extends Error {
+  constructor(status, message, details = {}) {
+    super(message);
+    this.status = status;
+    this.details = details;
+  }
+}
+
+// Uploads with a chunk in flight; a second writer for the same upload is refused
+const busy = new Set();
+
+const manifestPath = (dir, id) => path.join(dir, `${id}.json`);
+const partPath = (dir, id) => path.join(dir, `${id}.part`);
+
+const saveManifest = async (dir, manifest) => {
+  // Write-then-rename so a crash never leaves a half-written manifest
+  const target = manifestPath(dir, manifest.id);
+  await fs.promises.writeFile(`${target}.tmp`, JSON.stringify(manifest));
+  await fs.promises.rename(`${target}.tmp`, target);
+};
+
+const removeUpload = async (dir, id) => {
+  await Promise.all([manifestPath(dir, id), partPath(dir, id)].map(file => fs.promises.rm(file, { force: true })));
+};
+
+const pruneStaleUploads = async (dir) => {
+  const cutoff = Date.now() - STALE_UPLOAD_MS;
+  for (const name of await fs.promises.readdir(dir)) {
+    const id = name.split('.')[0];
+    if (!UPLOAD_ID.test(id) || busy.has(id)) continue;
+    const stat = await fs.promises.stat(path.join(dir, name)).catch(() => null);
+    if (stat && stat.mtimeMs < cutoff) {
+      await removeUpload(dir, id);
+    }
+  }
+};
+
+const createUpload = async (dir, { userId, fileName, fileSize, sha256, documentType, notes }) => {
+  const size = Number(fileSize);
+  if (!fileName || !Number.isInteger(size) || size <= 0) {
+    throw new UploadError(400, 'fileName and a positive integer fileSize are required');
+  }
+  if (size > MAX_UPLOAD_BYTES) {
+    throw new UploadError(413, `Files are limited to ${MAX_UPLOAD_BYTES} bytes`);
+  }
+  if (!SHA256_HEX.test(String(sha256 || '').toLowerCase())) {
+    throw new UploadError(400, 'sha256 must be the hex SHA-256 of the whole file');
+  }
+
+  await fs.promises.mkdir(dir, { recursive: true });
+  await pruneStaleUploads(dir);
+  const manifest = {
+    id: crypto.randomBytes(16).toString('hex'),
+    userId: String(userId),
+    fileName: path.basename(fileName),
+    fileSize: size,
+    sha256: sha256.toLowerCase(),
+    documentType,
+    notes: notes || '',
+    chunkSize: CHUNK_BYTES,
+    received: 0,
+    createdAt: new Date().toISOString()
+  };
+  await fs.promises.writeFile(partPath(dir, manifest.id), '');
+  await saveManifest(dir, manifest);
+  return manifest;
+};
+
+const loadUpload = async (dir, id, userId) => {
+  if (!UPLOAD_ID.test(id || '')) {
+    throw new UploadError(404, 'Upload not found');
+  }
+  let manifest;
+  try {
+    manifest = JSON.parse(await fs.promises.readFile(manifestPath(dir, id), 'utf8'));
+  } catch (error) {
+    throw new UploadError(404, 'Upload not found');
+  }
+  if (manifest.userId !== String(userId)) {
+    throw new UploadError(404, 'Upload not found');
+  }
+  return manifest;
+};
+
+const writeChunk = async (dir, manifest, offset, sha256, body) => {
+  // Only the next expected byte is accepted; the client resumes from `received`
+  if (offset !== manifest.received) {
+    body.resume();
+    throw new UploadError(409, 'Unexpected offset', { received: manifest.received });
+  }
+  if (busy.has(manifest.id)) {
+    body.resume();
+    throw new UploadError(409, 'Another chunk is being written', { received: manifest.received });
+  }
+
+  busy.add(manifest.id);
+  try {
+    const hash = crypto.createHash('sha256');
+    const limit = Math.min(manifest.chunkSize, manifest.fileSize - offset);
+    let bytes = 0;
+    const verify = new Transform({
+      transform(chunk, encoding, callback) {
+        bytes += chunk.length;
+        if (bytes > limit) {
+          callback(new UploadError(413, `Chunks are limited to ${limit} bytes here`));
+          return;
+        }
+        hash.update(chunk);
+        callback(null, chunk);
+      }
+    });
+    // Bytes past `received` are only trusted once the chunk verifies; a failed
+    // chunk is simply overwritten by the retry at the same offset
+    await pipeline(body, verify, fs.createWriteStream(partPath(dir, manifest.id), { flags: 'r+', start: offset }));
+
+    if (!bytes) {
+      throw new UploadError(400, 'Empty chunk');
+    }
+    if (hash.digest('hex') !== String(sha256 || '').toLowerCase()) {
+      throw new UploadError(422, 'Chunk checksum mismatch', { received: manifest.received });
+    }
+    manifest.received += bytes;
+    await saveManifest(dir, manifest);
+    return manifest;
+  } finally {
+    busy.delete(manifest.id);
+  }
+};
+
+const fileSha256 = async (file) => {
+  const hash = crypto.createHash('sha256');
+  for await (const chunk of fs.createReadStream(file)) {
+    hash.update(chunk);
+  }
+  return hash.digest('hex');
+};
+
+const completeUpload = async (dir, manifest, destinationDir) => {
+  if (manifest.received !== manifest.fileSize) {
+    throw new UploadError(409, 'Upload is incomplete', { received: manifest.received });
+  }
+  const part = partPath(dir, manifest.id);
+  // The file may be larger than the last verified chunk after a crash mid-write
+  await fs.promises.truncate(part, manifest.fileSize);
+  if (await fileSha256(part) !== manifest.sha256) {
+    // Every chunk verified but the whole doesn't: start over rather than keep a corrupt file
+    await removeUpload(dir, manifest.id);
+    throw new UploadError(422, 'File checksum mismatch; upload it again');
+  }
+
+  const uniqueSuffix = Date.now() + '-' + Math.round(Math.random() * 1E9);
+  const filename = 'doc-' + uniqueSuffix + path.extname(manifest.fileName);
+  await fs.promises.rename(part, path.join(destinationDir, filename));
+  await fs.promises.rm(manifestPath(dir, manifest.id), { force: true });
+  return filename;
+};
+
+module.exports = {
+  CHUNK_BYTES,
+  UploadError,
+  createUpload,
+  loadUpload,
+  writeChunk,
+  completeUpload,
+  removeUpload
+};
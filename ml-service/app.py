@@ -1,68 +1,198 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import numpy as np
-from datetime import datetime
 import os
-from dotenv import load_dotenv
-from prediction_engine import HealthPredictor
-from nutrition_engine import NutritionRecommender
 
-load_dotenv()
+# python-dotenv is only imported when there is a .env file to read
+_env_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.path.exists(_env_file):
+    from dotenv import load_dotenv
+    load_dotenv(_env_file)
+
+from flask import Flask, request
+from flask_cors import CORS
+from datetime import datetime
+from fingerprint import PredictionCache
+from profiling import RequestProfiler
+from schemas import NutritionRequest, PredictionRequest, ValidationError
+from serialization import json_response
+from startup import DataStores, EngineRegistry, fast_start_enabled
+from tracing import Tracer
 
 app = Flask(__name__)
 CORS(app)
+profiler = RequestProfiler(app)
+tracer = Tracer(app)
+
+# Initialize engines (in the background from a snapshot when FAST_START=1)
+engines = EngineRegistry()
+if fast_start_enabled():
+    engines.load_in_background()
+else:
+    engines.load()
 
-# Initialize engines
-health_predictor = HealthPredictor()
-nutrition_recommender = NutritionRecommender()
+# Metric history, ingestion and forecasts (NumPy; built on first use when FAST_START=1)
+stores = DataStores()
+if not fast_start_enabled():
+    stores.load()
+# Last prediction per user, reused while no input crosses a scoring threshold
+predictions = PredictionCache()
+
+def validation_error_response(error: ValidationError):
+    return json_response({
+        'success': False,
+        'error': 'Invalid request',
+        'details': error.errors
+    }, 400)
 
 @app.route('/api/health-check', methods=['GET'])
 def health_check():
-    return jsonify({
+    return json_response({
         'status': 'OK',
         'service': 'ML Service',
+        'enginesReady': engines.ready,
+        'predictionCache': predictions.stats(),
+        'featureStore': engines.features.stats() if engines.ready else None,
         'timestamp': datetime.now().isoformat()
     })
 
 @app.route('/api/predict', methods=['POST'])
 def predict_health():
     try:
-        data = request.json
-        metrics = data.get('metrics', {})
-        user_profile = data.get('userProfile', {})
+        payload = PredictionRequest.from_dict(request.get_json(silent=True))
+        if payload.user_id:
+            stores.history.append(payload.user_id, payload.metrics)
+            stores.forecasts.observe(payload.user_id, payload.metrics)
+        
+        features = engines.features.get(payload.user_id, payload.profile_version, payload.user_profile)
         
-        # Make prediction
-        prediction = health_predictor.predict(metrics, user_profile)
+        # Make prediction (or reuse the user's last one when nothing material changed)
+        if payload.user_id:
+            prediction, cached = predictions.predict(engines.predictor, payload.user_id,
+                                                     payload.metrics, payload.user_profile, features)
+        else:
+            prediction, cached = engines.predictor.predict(payload.metrics, payload.user_profile, features), False
         
-        return jsonify({
+        result = {
             'success': True,
             'prediction': prediction,
+            'cached': cached,
             'timestamp': datetime.now().isoformat()
-        })
+        }
+        if payload.user_id:
+            result['forecast'] = stores.forecasts.forecast(payload.user_id)
+        return json_response(result)
+    except ValidationError as e:
+        return validation_error_response(e)
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/nutrition', methods=['POST'])
 def get_nutrition_recommendations():
     try:
-        data = request.json
+        payload = NutritionRequest.from_dict(request.get_json(silent=True))
         
-        recommendations = nutrition_recommender.generate_recommendations(data)
+        features = engines.features.get(payload.user_id, payload.profile_version, payload)
+        recommendations = engines.recommender.generate_recommendations(payload, features)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'recommendations': recommendations,
             'timestamp': datetime.now().isoformat()
         })
+    except ValidationError as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+@app.route('/api/profile-updated', methods=['POST'])
+def profile_updated():
+    """Sent by the backend after a profile save; drops everything derived from the old profile"""
+    user_id = (request.get_json(silent=True) or {}).get('userId')
+    if not isinstance(user_id, str) or not user_id:
+        return validation_error_response(ValidationError([{'field': 'userId', 'message': 'is required'}]))
+    
+    invalidated = engines.features.invalidate(user_id)
+    predictions.invalidate(user_id)
+    return json_response({
+        'success': True,
+        'invalidated': invalidated,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/ingest', methods=['POST'])
+def ingest_readings():
+    try:
+        result = stores.ingestor.ingest(request.stream, request.mimetype, request.args.get('userId'))
+        
+        return json_response({
+            'success': True,
+            **result,
+            'timestamp': datetime.now().isoformat()
+        })
+    except ValidationError as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+@app.route('/api/forecast', methods=['GET'])
+def get_forecast():
+    user_id = request.args.get('userId')
+    if not user_id:
+        return validation_error_response(ValidationError([{'field': 'userId', 'message': 'is required'}]))
+    
+    return json_response({
+        'success': True,
+        'forecast': stores.forecasts.forecast(user_id),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/trends', methods=['GET'])
+def get_trends():
+    try:
+        from trends import trend_for_query
+        trend = trend_for_query(stores.archive, stores.history, request.args.to_dict())
+        
+        return json_response({
+            'success': True,
+            'trend': trend,
+            'timestamp': datetime.now().isoformat()
+        })
+    except ValidationError as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+@app.route('/api/history', methods=['GET'])
+def get_history():
+    try:
+        from trends import history_for_query
+        page = history_for_query(stores.archive, stores.history, request.args.to_dict())
+        
+        return json_response({
+            'success': True,
+            **page,
+            'timestamp': datetime.now().isoformat()
+        })
+    except ValidationError as e:
+        return validation_error_response(e)
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5001))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # The debug reloader starts the app twice, which doubles cold-start time
+    debug = os.getenv('FLASK_DEBUG', '0' if fast_start_enabled() else '1') == '1'
+    app.run(host='0.0.0.0', port=port, debug=debug)
@@ -0,0 +1,84 @@
+"""
+Scan speed of the columnar history files in columnar.py.
+
+Writes a year of per-minute heart-rate readings for one user (one segment
+per day, as live ingestion produces), compacts them, and times range scans
+before and after compaction: a full year, one month and one day, each
+followed by a mean over the returned values.
+
+    python benchmarks/bench_columnar.py [--days 365]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from columnar import ColumnarHistory  # noqa: E402
+
+ROUNDS = 5
+START = 1_704_067_200  # 2024-01-01T00:00:00Z
+
+
+def best_ms(fn) -> float:
+    best = float('inf')
+    for _ in range(ROUNDS):
+        began = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - began)
+    return round(best * 1000, 3)
+
+
+def scans(root: str) -> dict:
+    # A fresh instance each time, so segment maps are not already warm
+    def scan(start, end):
+        times, values = ColumnarHistory(root).scan('bench-user', 'heartRate', start, end)
+        return float(values.mean()), len(times)
+
+    year_end = START + 365 * 86400
+    month = START + 180 * 86400
+    return {
+        'year_ms': best_ms(lambda: scan(None, None)),
+        'month_ms': best_ms(lambda: scan(month, month + 30 * 86400)),
+        'day_ms': best_ms(lambda: scan(month, month + 86400)),
+        'records_in_year': scan(START, year_end)[1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='medtwin-history-')
+    try:
+        history = ColumnarHistory(root)
+        rng = np.random.default_rng(5)
+        began = time.perf_counter()
+        for day in range(args.days):
+            times = START + day * 86400 + np.arange(0, 86400, 60)
+            history.append('bench-user', 'heartRate', times, rng.normal(72, 8, len(times)))
+        write_s = time.perf_counter() - began
+
+        results = {'write_ms_per_day': round(write_s / args.days * 1000, 3), 'daily_segments': scans(root)}
+        began = time.perf_counter()
+        removed = ColumnarHistory(root).compact()
+        results['compaction'] = {'ms': round((time.perf_counter() - began) * 1000, 1),
+                                 'segments_removed': removed}
+        results['compacted'] = scans(root)
+        results['segments_after'] = len(os.listdir(os.path.join(root, 'bench-user', 'heartRate'))) // 2
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
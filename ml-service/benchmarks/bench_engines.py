@@ -0,0 +1,198 @@
+"""
+Benchmarks for HealthPredictor and NutritionRecommender.
+
+Measures single-call latency percentiles, batch throughput and memory per call
+on seeded synthetic inputs, writes the results as JSON and, when a baseline
+file exists, exits non-zero if any metric regressed beyond the threshold.
+
+Timings only compare on the machine that recorded them, so baseline.json is
+not committed: record it once on the machine that runs the gate (from the
+main branch), then gate changes with --require-baseline, which also fails
+when there is no baseline to compare against (`npm run bench:ml:baseline`
+and `npm run bench:ml` from the repository root do both).
+
+    python benchmarks/bench_engines.py                      # run + compare
+    python benchmarks/bench_engines.py --save-baseline      # record baseline
+    python benchmarks/bench_engines.py --require-baseline   # gate: no baseline is a failure
+    python benchmarks/bench_engines.py --threshold 0.1      # stricter gate
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from prediction_engine import HealthPredictor  # noqa: E402
+from nutrition_engine import NutritionRecommender  # noqa: E402
+from synthetic import SyntheticGenerator, nutrition_payload, prediction_payload  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_THRESHOLD = float(os.getenv('BENCH_REGRESSION_THRESHOLD', '0.25'))
+
+# Metric name -> True when higher is better. p99 is reported but not gated:
+# at sub-millisecond latencies it is dominated by scheduler noise.
+GATED_METRICS = {
+    'p50_ms': False,
+    'p90_ms': False,
+    'throughput_per_s': True,
+    'bytes_per_call': False
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def bench_callable(fn: Callable[[Dict], object], payloads: List[Dict], iterations: int,
+                   memory_samples: int, batch_repeats: int = 5) -> Dict:
+    # Warm up caches and lazy paths before timing
+    for payload in payloads[:min(50, len(payloads))]:
+        fn(payload)
+
+    latencies = []
+    for i in range(iterations):
+        payload = payloads[i % len(payloads)]
+        start = time.perf_counter()
+        fn(payload)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    # Best of several batch runs is far more stable than a single run
+    batch_elapsed = float('inf')
+    for _ in range(batch_repeats):
+        gc.collect()
+        batch_start = time.perf_counter()
+        for payload in payloads:
+            fn(payload)
+        batch_elapsed = min(batch_elapsed, time.perf_counter() - batch_start)
+
+    peaks = []
+    tracemalloc.start()
+    for payload in payloads[:memory_samples]:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn(payload)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50), 4),
+        'p90_ms': round(percentile(latencies, 90), 4),
+        'p99_ms': round(percentile(latencies, 99), 4),
+        'max_ms': round(latencies[-1], 4),
+        'batch_size': len(payloads),
+        'throughput_per_s': round(len(payloads) / batch_elapsed, 1),
+        'bytes_per_call': int(sum(peaks) / len(peaks)) if peaks else 0
+    }
+
+
+def run(iterations: int, seed: int, memory_samples: int) -> Dict:
+    cases = list(SyntheticGenerator(seed).cases())
+    predictor = HealthPredictor()
+    recommender = NutritionRecommender()
+
+    predict_payloads = [prediction_payload(case) for case in cases]
+    nutrition_payloads = [nutrition_payload(case) for case in cases]
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'cases': len(cases),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'benchmarks': {
+            'HealthPredictor.predict': bench_callable(
+                lambda p: predictor.predict(p['metrics'], p['userProfile']),
+                predict_payloads, iterations, memory_samples
+            ),
+            'NutritionRecommender.generate_recommendations': bench_callable(
+                recommender.generate_recommendations,
+                nutrition_payloads, iterations, memory_samples
+            )
+        }
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a message per gated metric that regressed beyond the threshold"""
+    regressions = []
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+        for metric, higher_is_better in GATED_METRICS.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > threshold:
+                regressions.append(f'{name} {metric}: {old} -> {new} ({change:+.1%} worse)')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ML engines')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--memory-samples', type=int, default=200)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed fractional regression before failing (default 0.25)')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--require-baseline', action='store_true',
+                        help='exit 2 when there is no baseline instead of passing')
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.seed, args.memory_samples)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    for name, stats in results['benchmarks'].items():
+        print(f"{name}: p50={stats['p50_ms']}ms p90={stats['p90_ms']}ms p99={stats['p99_ms']}ms "
+              f"throughput={stats['throughput_per_s']}/s mem={stats['bytes_per_call']}B/call")
+    print(f'Results written to {args.output}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline found; run with --save-baseline to create one')
+        return 2 if args.require_baseline else 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f'Regressions beyond {args.threshold:.0%}:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print(f'No regressions beyond {args.threshold:.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Throughput of the /api/ingest pipeline in ingest.py on one core.
+
+Builds a wearable-style upload (a sample every 5 seconds for several users
+and metrics) as NDJSON and as packed binary records, then times parsing,
+per-minute aggregation and the archive write, in process, from an
+in-memory stream. Reports readings per second for each format.
+
+    python benchmarks/bench_ingest.py [--readings 1000000]
+"""
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from columnar import ColumnarHistory  # noqa: E402
+from ingest import RECORD_DTYPE, Ingestor  # noqa: E402
+from timeseries import METRICS, TimeSeriesStore  # noqa: E402
+
+START = 1_704_067_200
+# A typical wearable line: heart rate, SpO2, stress and steps in one sample
+LINE_METRICS = ('heartRate', 'oxygenSaturation', 'stressLevel', 'steps')
+ROUNDS = 3
+
+
+def ndjson_body(readings: int, users: int) -> bytes:
+    rng = np.random.default_rng(1)
+    lines = []
+    samples = readings // len(LINE_METRICS)
+    for i in range(samples):
+        user = i % users
+        line = {'userId': f'user-{user}', 'timestamp': START + (i // users) * 5,
+                'heartRate': int(rng.integers(55, 120)), 'oxygenSaturation': int(rng.integers(92, 100)),
+                'stressLevel': round(float(rng.uniform(1, 9)), 1), 'steps': int(rng.integers(0, 30))}
+        lines.append(json.dumps(line, separators=(',', ':')))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def binary_body(readings: int) -> bytes:
+    rng = np.random.default_rng(2)
+    records = np.empty(readings, dtype=RECORD_DTYPE)
+    metrics = [i for i, (key, _) in enumerate(METRICS) if key in LINE_METRICS]
+    records['t'] = START + (np.arange(readings) // len(metrics)) * 5
+    records['m'] = np.tile(metrics, readings // len(metrics) + 1)[:readings]
+    records['v'] = rng.uniform(50, 120, readings)
+    return records.tobytes()
+
+
+def run(body: bytes, mimetype: str, user_id=None) -> dict:
+    best, result = float('inf'), None
+    for _ in range(ROUNDS):
+        root = tempfile.mkdtemp(prefix='medtwin-ingest-')
+        try:
+            ingestor = Ingestor(ColumnarHistory(root), TimeSeriesStore())
+            began = time.perf_counter()
+            result = ingestor.ingest(io.BytesIO(body), mimetype, user_id)
+            ingestor.aggregator.flush(everything=True)
+            best = min(best, time.perf_counter() - began)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    readings = result['accepted']
+    return {'readings': readings, 'body_mb': round(len(body) / 1e6, 2),
+            'seconds': round(best, 3), 'readings_per_second': round(readings / best)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--readings', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=20)
+    args = parser.parse_args()
+
+    results = {
+        'ndjson': run(ndjson_body(args.readings, args.users), 'application/x-ndjson'),
+        'binary': run(binary_body(args.readings), 'application/octet-stream', 'user-0')
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
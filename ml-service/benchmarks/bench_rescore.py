@@ -0,0 +1,72 @@
+"""
+Throughput and memory of the cohort re-scoring job in rescore.py.
+
+Writes a synthetic cohort (half in our snapshot format, half shaped like a
+mongoexport of healthdatas) and runs the job single-process and with every
+core. Reports snapshots per second and peak RSS.
+
+    python benchmarks/bench_rescore.py [--snapshots 200000]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import rescore  # noqa: E402
+from synthetic import SyntheticGenerator, prediction_payload  # noqa: E402
+
+
+def write_cohort(path: str, snapshots: int):
+    cases = list(SyntheticGenerator(9).cases())
+    rng = random.Random(9)
+    with open(path, 'w') as f:
+        for i in range(snapshots):
+            payload = prediction_payload(cases[i % len(cases)])
+            previous = rng.choice(['Low', 'Moderate', 'High', None])
+            if i % 2:
+                doc = {'_id': {'$oid': f'{i:024x}'}, 'userId': {'$oid': f'{i % 50000:024x}'},
+                       'dataSource': 'device', 'metrics': payload['metrics'],
+                       'prediction': {'riskLevel': previous} if previous else {}}
+            else:
+                doc = {'userId': f'user-{i % 50000}', 'metrics': payload['metrics'],
+                       'userProfile': payload['userProfile'], 'previousRiskLevel': previous}
+            f.write(json.dumps(doc, separators=(',', ':')) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--snapshots', type=int, default=200_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='medtwin-rescore-')
+    try:
+        cohort = os.path.join(directory, 'cohort.jsonl')
+        write_cohort(cohort, args.snapshots)
+        results = {'snapshots': args.snapshots, 'input_mb': round(os.path.getsize(cohort) / 1e6, 1)}
+        for workers in sorted({1, os.cpu_count() or 1}):
+            output = os.path.join(directory, f'out-{workers}.tsv')
+            summary = rescore.run(cohort, output, workers)
+            results[f'workers_{workers}'] = {
+                'snapshots_per_second': summary['snapshotsPerSecond'],
+                'seconds': summary['seconds'],
+                'output_mb': round(os.path.getsize(output) / 1e6, 1),
+                'changed': summary['changed']
+            }
+        # ru_maxrss is KiB on Linux; children covers the worker processes
+        results['peak_rss_mb'] = round(max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                                           resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024, 1)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
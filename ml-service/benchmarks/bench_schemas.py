@@ -0,0 +1,123 @@
+"""
+Compare the typed request models in schemas.py with plain-dict handling.
+
+For each synthetic /api/predict and /api/nutrition payload this measures:
+  - decode: generated slotted decoder vs. a dict-building loop doing the same
+    coercion and range checks
+  - access: engine-style field reads (attribute vs. dict.get with default)
+  - bytes: tracemalloc bytes allocated per decoded request
+
+    python benchmarks/bench_schemas.py
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from schemas import NUMBER, STRING, HealthMetrics, NutritionRequest, PredictionRequest, Schema  # noqa: E402
+from synthetic import SyntheticGenerator, nutrition_payload, prediction_payload  # noqa: E402
+
+ROUNDS = 20
+
+
+def dict_decode(schema, data: Dict) -> Dict:
+    """Reference dict path: same coercion and checks, building a new dict"""
+    result = {}
+    for field in schema.FIELDS:
+        value = data.get(field.key)
+        if value is None:
+            result[field.key] = list(field.default) if isinstance(field.default, list) else field.default
+            continue
+        if isinstance(field.kind, type) and issubclass(field.kind, Schema):
+            result[field.key] = dict_decode(field.kind, value)
+            continue
+        if field.kind == NUMBER:
+            if isinstance(value, str):
+                value = float(value) if '.' in value else int(value)
+            if field.minimum is not None and value < field.minimum:
+                raise ValueError(field.key)
+            if field.maximum is not None and value > field.maximum:
+                raise ValueError(field.key)
+        elif field.kind == STRING and not isinstance(value, str):
+            raise ValueError(field.key)
+        result[field.key] = value
+    return result
+
+
+def time_per_call(fn: Callable, items: List) -> float:
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def bytes_per_call(fn: Callable, items: List) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [fn(item) for item in items]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before - sys.getsizeof(kept)) / len(items)
+
+
+def access_dict(metrics: Dict) -> int:
+    # The reads HealthPredictor used to make against the raw dict
+    total = 0
+    for _ in range(4):
+        total += bool(metrics.get('heartRate')) + (metrics.get('bloodPressureSystolic', 0) > 140)
+        total += (metrics.get('oxygenSaturation', 100) < 90) + (metrics.get('stressLevel', 0) > 6)
+        total += (metrics.get('sleepHours', 8) < 7) + (metrics.get('steps', 10000) < 3000)
+    return total
+
+
+def access_typed(metrics: HealthMetrics) -> int:
+    total = 0
+    for _ in range(4):
+        total += bool(metrics.heart_rate) + (metrics.systolic is not None and metrics.systolic > 140)
+        total += (metrics.oxygen_saturation is not None and metrics.oxygen_saturation < 90)
+        total += (metrics.stress_level is not None and metrics.stress_level > 6)
+        total += (metrics.sleep_hours is not None and metrics.sleep_hours < 7)
+        total += (metrics.steps is not None and metrics.steps < 3000)
+    return total
+
+
+def main():
+    cases = list(SyntheticGenerator(7).cases())
+    # Round-trip through JSON so inputs look exactly like request.get_json() output
+    predict = [json.loads(json.dumps(prediction_payload(c))) for c in cases]
+    nutrition = [json.loads(json.dumps(nutrition_payload(c))) for c in cases]
+
+    results = {}
+    for name, schema, payloads in (('predict', PredictionRequest, predict),
+                                   ('nutrition', NutritionRequest, nutrition)):
+        results[name] = {
+            'decode_us': {
+                'typed': round(time_per_call(schema.from_dict, payloads), 3),
+                'dict': round(time_per_call(lambda p, s=schema: dict_decode(s, p), payloads), 3)
+            },
+            'bytes_per_request': {
+                'typed': round(bytes_per_call(schema.from_dict, payloads), 1),
+                'dict': round(bytes_per_call(lambda p, s=schema: dict_decode(s, p), payloads), 1)
+            }
+        }
+
+    raw_metrics = [p['metrics'] for p in predict]
+    typed_metrics = [PredictionRequest.from_dict(p).metrics for p in predict]
+    results['predict']['access_us'] = {
+        'typed': round(time_per_call(access_typed, typed_metrics), 3),
+        'dict': round(time_per_call(access_dict, raw_metrics), 3)
+    }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
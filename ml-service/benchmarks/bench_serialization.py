@@ -0,0 +1,85 @@
+"""
+Bytes and time per /api/nutrition and /api/predict response for each
+serialization option: Flask-style json.dumps (the old jsonify path), the
+stdlib and orjson encoders with and without pre-encoded static fragments,
+and each of those under gzip and brotli.
+
+    python benchmarks/bench_serialization.py
+"""
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from nutrition_engine import NutritionRecommender  # noqa: E402
+from prediction_engine import HealthPredictor  # noqa: E402
+from serialization import BROTLI_QUALITY, GZIP_LEVEL, HAS_BROTLI, JSONSerializer, orjson  # noqa: E402
+from synthetic import SyntheticGenerator, nutrition_payload, prediction_payload  # noqa: E402
+
+ROUNDS = 5
+
+
+def jsonify_like(obj) -> bytes:
+    # What Flask's default JSON provider does for jsonify() outside debug mode
+    return json.dumps(obj, ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def measure(encode, responses):
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for response in responses:
+            encode(response)
+        best = min(best, time.perf_counter() - start)
+    sizes = [len(encode(r)) for r in responses]
+    return {
+        'us_per_response': round(best / len(responses) * 1e6, 2),
+        'bytes_per_response': round(sum(sizes) / len(sizes))
+    }
+
+
+def main():
+    cases = list(SyntheticGenerator(3).cases())[:200]
+    recommender = NutritionRecommender()
+    predictor = HealthPredictor()
+    stamp = datetime.now().isoformat()
+    workloads = {
+        'nutrition': [{'success': True, 'timestamp': stamp,
+                       'recommendations': recommender.generate_recommendations(nutrition_payload(c))}
+                      for c in cases],
+        'predict': [{'success': True, 'timestamp': stamp,
+                     'prediction': predictor.predict(**dict(zip(('metrics', 'user_profile'),
+                                                                prediction_payload(c).values())))}
+                    for c in cases]
+    }
+
+    encoders = {'jsonify': jsonify_like}
+    for name in ('json', 'orjson'):
+        if name == 'orjson' and orjson is None:
+            continue
+        encoders[name] = JSONSerializer(name, use_fragments=False).dumps
+        encoders[f'{name}+fragments'] = JSONSerializer(name, use_fragments=True).dumps
+
+    compressors = {'identity': None, 'gzip': lambda b: gzip.compress(b, compresslevel=GZIP_LEVEL)}
+    if HAS_BROTLI:
+        import brotli
+        compressors['br'] = lambda b: brotli.compress(b, quality=BROTLI_QUALITY)
+
+    results = {}
+    for workload, responses in workloads.items():
+        results[workload] = {}
+        for enc_name, encode in encoders.items():
+            for comp_name, comp in compressors.items():
+                fn = encode if comp is None else (lambda r, e=encode, c=comp: c(e(r)))
+                results[workload][f'{enc_name}/{comp_name}'] = measure(fn, responses)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Cold-start cost of the ML service.
+
+Reports, for FAST_START=0 and FAST_START=1 (first run builds the snapshot,
+later runs restore it):
+  - import_ms: wall time of `import app` in a fresh interpreter
+  - first_response_ms: process launch to the first successful /api/nutrition
+  - top_imports: the slowest direct imports of app.py from `python -X importtime`
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import http.client
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIR = os.path.dirname(BENCH_DIR)
+NUTRITION_BODY = json.dumps({'occupation': 'Software Engineer', 'age': 30}).encode('utf-8')
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def child_env(fast_start: bool, snapshot_dir: str, port: int = 0) -> dict:
+    env = dict(os.environ, FAST_START='1' if fast_start else '0', SNAPSHOT_DIR=snapshot_dir,
+               TRACING_ENABLED='0', FLASK_DEBUG='0', PYTHONDONTWRITEBYTECODE='')
+    if port:
+        env['PORT'] = str(port)
+    return env
+
+
+def import_ms(env: dict) -> float:
+    code = 'import time; s = time.perf_counter(); import app; print(time.perf_counter() - s)'
+    out = subprocess.run([sys.executable, '-c', code], cwd=SERVICE_DIR, env=env,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+def top_imports(env: dict, limit: int = 10) -> list:
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=SERVICE_DIR,
+                         env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)', line)
+        if not match:
+            continue
+        depth = len(match.group(3))
+        if depth == 1:
+            # importtime lists children before their parent; keep only app's
+            if match.group(4) == 'app':
+                break
+            rows = []
+        elif depth == 3:
+            rows.append({'module': match.group(4), 'cumulative_ms': int(match.group(2)) / 1000})
+    rows.sort(key=lambda r: r['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+
+def first_response_ms(env: dict, port: int, timeout: float = 30.0) -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, 'app.py'], cwd=SERVICE_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+                conn.request('POST', '/api/nutrition', body=NUTRITION_BODY,
+                             headers={'Content-Type': 'application/json'})
+                status = conn.getresponse().status
+                conn.close()
+                if status == 200:
+                    return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError('ML service did not answer in time')
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def median(values: list) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    snapshot_dir = tempfile.mkdtemp(prefix='medtwin-snapshot-')
+    results = {}
+    try:
+        for label, fast in (('FAST_START=0', False), ('FAST_START=1', True)):
+            env = child_env(fast, snapshot_dir)
+            imports = [import_ms(env) for _ in range(args.runs)]
+            responses = []
+            for _ in range(args.runs):
+                port = free_port()
+                responses.append(first_response_ms(child_env(fast, snapshot_dir, port), port))
+            results[label] = {
+                'import_ms': round(median(imports), 1),
+                'first_response_ms': round(median(responses), 1),
+                'first_response_ms_runs': [round(r, 1) for r in responses],
+                'top_imports': top_imports(env)
+            }
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
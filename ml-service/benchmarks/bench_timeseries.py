@@ -0,0 +1,117 @@
+"""
+Memory and speed of the per-user history store in timeseries.py, compared
+with the obvious alternative of a deque of reading dicts per user.
+
+Reports bytes per user (array bytes and tracemalloc-measured total),
+append cost per reading and window-read cost.
+
+    python benchmarks/bench_timeseries.py [--users 2000] [--capacity 256]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from schemas import HealthMetrics  # noqa: E402
+from timeseries import METRICS, TimeSeriesStore  # noqa: E402
+
+ROUNDS = 5
+
+
+def readings(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [HealthMetrics.from_dict({
+        'heartRate': rng.randint(55, 110), 'bloodPressureSystolic': rng.randint(100, 150),
+        'bloodPressureDiastolic': rng.randint(60, 95), 'oxygenSaturation': rng.randint(92, 100),
+        'temperature': round(rng.uniform(36, 38), 1), 'stressLevel': rng.randint(1, 9),
+        'bloodGlucose': rng.randint(70, 180), 'sleepHours': round(rng.uniform(4, 9), 1),
+        'steps': rng.randint(0, 15000)
+    }) for _ in range(count)]
+
+
+class DequeStore:
+    """Baseline: one bounded deque of {metric: value} dicts per user"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.users = {}
+
+    def append(self, user_id, metrics, timestamp):
+        entry = {'t': timestamp}
+        for key, attr in METRICS:
+            value = getattr(metrics, attr)
+            if value is not None:
+                entry[key] = value
+        self.users.setdefault(user_id, deque(maxlen=self.capacity)).append(entry)
+
+    def window(self, user_id, metric, size):
+        items = list(self.users[user_id])[-size:]
+        return [e['t'] for e in items if metric in e], [e[metric] for e in items if metric in e]
+
+
+def fill(store, users: int, capacity: int, samples):
+    for u in range(users):
+        for i in range(capacity):
+            store.append(f'user-{u}', samples[(u + i) % len(samples)], 1_700_000_000 + i * 60)
+
+
+def measure(name, make, users, capacity, samples):
+    tracemalloc.start()
+    store = make()
+    fill(store, users, capacity, samples)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    append_us = window_us = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for i, reading in enumerate(samples):
+            store.append('user-0', reading, 1_800_000_000 + i)
+        append_us = min(append_us, (time.perf_counter() - start) / len(samples) * 1e6)
+
+        start = time.perf_counter()
+        for i in range(len(samples)):
+            store.window(f'user-{i % users}', 'heartRate', 60)
+        window_us = min(window_us, (time.perf_counter() - start) / len(samples) * 1e6)
+
+    result = {
+        'traced_bytes_per_user': round(traced / users),
+        'append_us': round(append_us, 3),
+        'window_60_us': round(window_us, 3)
+    }
+    if isinstance(store, TimeSeriesStore):
+        result['array_bytes_per_user'] = round(store.nbytes / users)
+    return name, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--capacity', type=int, default=256)
+    args = parser.parse_args()
+
+    samples = readings(1000)
+    results = dict([
+        measure('ring_buffer', lambda: TimeSeriesStore(args.capacity, max_bytes=1 << 40),
+                args.users, args.capacity, samples),
+        measure('deque_of_dicts', lambda: DequeStore(args.capacity), args.users, args.capacity, samples)
+    ])
+
+    # LRU cap: how many users fit in the default budget and whether eviction keeps it
+    capped = TimeSeriesStore(args.capacity, max_bytes=8 * 1024 * 1024)
+    fill(capped, args.users, 4, samples)
+    results['lru_cap'] = {'max_bytes': capped.max_bytes, 'bytes': capped.nbytes,
+                          'users_kept': len(capped), 'evictions': capped.evictions}
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Payload size and compute time of /api/trends as history grows.
+
+For per-minute series of one day, one month and one year, times
+trends.compute_trend at a fixed chart width and reports the encoded
+response size next to the size of sending every raw point.
+
+    python benchmarks/bench_trends.py [--width 800]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from serialization import serializer  # noqa: E402
+from trends import METHODS, compute_trend  # noqa: E402
+
+ROUNDS = 5
+START = 1_704_067_200
+SPANS = {'day': 1, 'month': 30, 'year': 365}
+
+
+def series(days: int):
+    rng = np.random.default_rng(days)
+    n = days * 1440
+    t = START + np.arange(n, dtype=np.int64) * 60
+    y = 72 + 8 * np.sin(np.arange(n) / 720) + rng.normal(0, 3, n)
+    return t.astype(np.uint32), y.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--width', type=int, default=800)
+    args = parser.parse_args()
+
+    results = {}
+    for name, days in SPANS.items():
+        t, y = series(days)
+        raw_bytes = len(serializer.dumps({'t': t.tolist(), 'v': np.round(y.astype(float), 2).tolist()}))
+        results[name] = {'points': len(t), 'raw_payload_bytes': raw_bytes}
+        for method in METHODS:
+            best = float('inf')
+            for _ in range(ROUNDS):
+                began = time.perf_counter()
+                trend = compute_trend(t, y, args.width, method)
+                best = min(best, time.perf_counter() - began)
+            results[name][method] = {'ms': round(best * 1000, 2),
+                                     'payload_bytes': len(serializer.dumps(trend))}
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
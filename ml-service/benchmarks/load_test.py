@@ -0,0 +1,283 @@
+"""
+Local HTTP load generator for the ML service.
+
+Replays the request shapes backend/routes/predictions.js sends to
+/api/predict and /api/nutrition against a service on localhost.
+
+    # closed loop: 8 clients sending back-to-back for 30s
+    python benchmarks/load_test.py --mode closed --concurrency 8 --duration 30
+
+    # open loop: Poisson arrivals at 200 req/s, starting the service ourselves
+    python benchmarks/load_test.py --mode open --rate 200 --start-server
+
+Open-loop latencies are measured from each request's scheduled send time, so
+queueing behind a slow response is counted (no coordinated omission). Closed-loop
+latencies are corrected by back-filling the samples a fixed-rate client would
+have recorded while it was stalled (--expected-interval-ms).
+"""
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SERVICE_DIR)
+
+from synthetic import SyntheticGenerator, nutrition_payload, prediction_payload  # noqa: E402
+
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '::1'}
+ENDPOINTS = {
+    'predict': ('/api/predict', prediction_payload),
+    'nutrition': ('/api/nutrition', nutrition_payload)
+}
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """'predict=0.7,nutrition=0.3' -> cumulative weights"""
+    weights = []
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f'Unknown endpoint in mix: {name}')
+        weights.append((name, float(weight or 1)))
+    total = sum(w for _, w in weights)
+    cumulative, running = [], 0.0
+    for name, weight in weights:
+        running += weight / total
+        cumulative.append((name, running))
+    return cumulative
+
+
+class RequestPool:
+    """Pre-encoded request bodies so the generator itself stays cheap"""
+
+    def __init__(self, mix: List[Tuple[str, float]], seed: int):
+        self.mix = mix
+        self.rng = random.Random(seed)
+        cases = list(SyntheticGenerator(seed).cases())
+        self.bodies = {
+            name: [json.dumps(build(case)).encode('utf-8') for case in cases]
+            for name, (_, build) in ENDPOINTS.items()
+        }
+        self._lock = threading.Lock()
+
+    def next(self) -> Tuple[str, str, bytes]:
+        with self._lock:
+            r = self.rng.random()
+            name = next((n for n, cutoff in self.mix if r <= cutoff), self.mix[-1][0])
+            body = self.rng.choice(self.bodies[name])
+        return name, ENDPOINTS[name][0], body
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.corrected: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def record(self, name: str, latency_ms: float, error: Optional[str], expected_interval_ms: float = 0):
+        with self._lock:
+            self.completed += 1
+            if error:
+                self.errors[error] = self.errors.get(error, 0) + 1
+                return
+            self.latencies[name].append(latency_ms)
+            self.corrected.append(latency_ms)
+            # Coordinated-omission back-fill for closed-loop runs
+            if expected_interval_ms > 0:
+                missing = latency_ms - expected_interval_ms
+                while missing > expected_interval_ms:
+                    self.corrected.append(missing)
+                    missing -= expected_interval_ms
+
+
+def send(conn: http.client.HTTPConnection, path: str, body: bytes) -> Optional[str]:
+    """Send one request, returning an error label or None on success"""
+    try:
+        conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        response.read()
+        if response.status >= 400:
+            return f'HTTP {response.status}'
+        return None
+    except (OSError, http.client.HTTPException) as e:
+        conn.close()
+        return type(e).__name__
+
+
+def run_closed(host: str, port: int, pool: RequestPool, recorder: Recorder, concurrency: int,
+               duration: float, expected_interval_ms: float):
+    deadline = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        while time.perf_counter() < deadline:
+            name, path, body = pool.next()
+            start = time.perf_counter()
+            error = send(conn, path, body)
+            recorder.record(name, (time.perf_counter() - start) * 1000, error, expected_interval_ms)
+        conn.close()
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def run_open(host: str, port: int, pool: RequestPool, recorder: Recorder, rate: float,
+             duration: float, workers: int, poisson: bool):
+    jobs: 'queue.Queue' = queue.Queue()
+    rng = random.Random(0)
+
+    def worker():
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            intended, name, path, body = job
+            error = send(conn, path, body)
+            # Measured from the scheduled send time, including time spent queued
+            recorder.record(name, (time.perf_counter() - intended) * 1000, error)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+
+    start = time.perf_counter()
+    intended = start
+    while intended - start < duration:
+        now = time.perf_counter()
+        if intended > now:
+            time.sleep(intended - now)
+        jobs.put((intended,) + pool.next())
+        intended += rng.expovariate(rate) if poisson else 1.0 / rate
+
+    for _ in threads:
+        jobs.put(None)
+    for t in threads:
+        t.join()
+
+
+def percentiles(values: List[float]) -> Dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(pct):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 3)
+
+    return {'p50': pick(50), 'p90': pick(90), 'p99': pick(99), 'p99.9': pick(99.9),
+            'max': round(ordered[-1], 3), 'count': len(ordered)}
+
+
+def wait_for_service(host: str, port: int, timeout: float = 30) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request('GET', '/api/health-check')
+            if conn.getresponse().status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+    return False
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the ML service on localhost')
+    parser.add_argument('--url', default='http://127.0.0.1:5001')
+    parser.add_argument('--mix', default='predict=0.6,nutrition=0.4')
+    parser.add_argument('--mode', choices=['open', 'closed'], default='closed')
+    parser.add_argument('--rate', type=float, default=100.0, help='open loop arrivals per second')
+    parser.add_argument('--arrivals', choices=['poisson', 'constant'], default='poisson')
+    parser.add_argument('--workers', type=int, default=32, help='open loop sender threads')
+    parser.add_argument('--concurrency', type=int, default=8, help='closed loop clients')
+    parser.add_argument('--expected-interval-ms', type=float, default=0.0,
+                        help='closed loop coordinated-omission correction interval')
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start-server', action='store_true', help='launch app.py on a free local port')
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'results', 'load_test.json'))
+    args = parser.parse_args()
+
+    server = None
+    if args.start_server:
+        host, port = '127.0.0.1', free_port()
+        env = dict(os.environ, PORT=str(port), TRACING_ENABLED=os.getenv('TRACING_ENABLED', '0'))
+        server = subprocess.Popen(
+            [sys.executable, '-c',
+             'from app import app; import os; '
+             'app.run(host="127.0.0.1", port=int(os.environ["PORT"]), threaded=True)'],
+            cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    else:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+        if host not in LOCAL_HOSTS:
+            parser.error('load tests may only target localhost')
+
+    try:
+        if not wait_for_service(host, port):
+            print(f'ML service not reachable on {host}:{port}')
+            return 1
+
+        pool = RequestPool(parse_mix(args.mix), args.seed)
+        recorder = Recorder()
+        started = time.perf_counter()
+        if args.mode == 'closed':
+            run_closed(host, port, pool, recorder, args.concurrency, args.duration, args.expected_interval_ms)
+        else:
+            run_open(host, port, pool, recorder, args.rate, args.duration, args.workers,
+                     args.arrivals == 'poisson')
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    errors = sum(recorder.errors.values())
+    report = {
+        'mode': args.mode,
+        'mix': args.mix,
+        'durationS': round(elapsed, 2),
+        'requests': recorder.completed,
+        'throughputPerS': round(recorder.completed / elapsed, 1),
+        'errorRate': round(errors / recorder.completed, 4) if recorder.completed else 0.0,
+        'errors': recorder.errors,
+        'latencyMs': {name: percentiles(values) for name, values in recorder.latencies.items() if values},
+        'correctedLatencyMs': percentiles(recorder.corrected)
+    }
+    if args.mode == 'open':
+        report['targetRatePerS'] = args.rate
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
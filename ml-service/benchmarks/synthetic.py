@@ -0,0 +1,146 @@
+"""
+Seeded synthetic inputs for the ML engines.
+
+Profile values come from the enums of the backend's User model. Cases
+cover every occupation (plus one neither the model nor the nutrition engine
+knows), every diet type, every chronic condition alone and in combinations of
+up to three, and metric sets with missing and extreme values, so benchmarks
+and equivalence checks exercise all of the engine branches.
+"""
+import itertools
+import os
+import random
+import re
+import sys
+from typing import Dict, Iterator, List
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from nutrition_engine import NutritionRecommender  # noqa: E402
+
+USER_MODEL = os.path.join(os.path.dirname(SERVICE_DIR), 'backend', 'models', 'User.js')
+
+
+def user_enum(field: str) -> List[str]:
+    """The values of a profile field's enum in the backend's User model"""
+    with open(USER_MODEL, encoding='utf-8') as f:
+        source = f.read()
+    # `field: { type: String, enum: [...] }`, or `field: [{ ... enum: [...] }]` for lists
+    match = re.search(r'\b' + field + r'\s*:\s*\[?\s*\{[^}]*?\benum\s*:\s*\[([^\]]*)\]', source)
+    if match is None:
+        raise ValueError(f'no enum for {field} in {USER_MODEL}')
+    return re.findall(r"'([^']*)'", match.group(1))
+
+
+OCCUPATIONS = list(dict.fromkeys(user_enum('occupation') + list(NutritionRecommender().occupation_profiles)
+                                 + ['Astronaut']))
+DIET_TYPES = user_enum('dietType')
+CONDITIONS = user_enum('currentChronicConditions')
+GENDERS = user_enum('gender')
+EXERCISE_FREQUENCIES = user_enum('exerciseFrequency')
+
+# Realistic (low, high) and extreme values per metric
+METRIC_RANGES = {
+    'heartRate': ((55, 110), (25, 220)),
+    'bloodPressureSystolic': ((95, 145), (60, 240)),
+    'bloodPressureDiastolic': ((60, 95), (30, 150)),
+    'oxygenSaturation': ((90, 100), (60, 100)),
+    'temperature': ((36.0, 37.8), (33.0, 42.0)),
+    'stressLevel': ((1, 9), (1, 10)),
+    'bloodGlucose': ((70, 180), (30, 450)),
+    'sleepHours': ((4.5, 9.5), (0.0, 16.0)),
+    'steps': ((1000, 14000), (0, 60000))
+}
+INTEGER_METRICS = {'heartRate', 'bloodPressureSystolic', 'bloodPressureDiastolic',
+                   'oxygenSaturation', 'stressLevel', 'bloodGlucose', 'steps'}
+
+# 'None' is what the profile form stores for no conditions, so it only appears alone
+MAX_COMBINED_CONDITIONS = 3
+CONDITION_COMBOS = [['None']] + [
+    list(combo)
+    for size in range(MAX_COMBINED_CONDITIONS + 1)
+    for combo in itertools.combinations([c for c in CONDITIONS if c != 'None'], size)
+]
+
+
+class SyntheticGenerator:
+    """Deterministic generator of metric snapshots and user profiles"""
+
+    def __init__(self, seed: int = 42):
+        self.rng = random.Random(seed)
+
+    def _value(self, name: str, mode: str):
+        normal, extreme = METRIC_RANGES[name]
+        low, high = extreme if mode == 'extreme' else normal
+        if mode == 'extreme':
+            value = self.rng.choice([low, high])
+        else:
+            value = self.rng.uniform(low, high)
+        return int(round(value)) if name in INTEGER_METRICS else round(value, 1)
+
+    def metrics(self, mode: str = 'normal') -> Dict:
+        """mode is 'normal', 'missing' (random subset absent) or 'extreme'"""
+        result = {}
+        for name in METRIC_RANGES:
+            if mode == 'missing' and self.rng.random() < 0.5:
+                continue
+            result[name] = self._value(name, mode)
+        return result
+
+    def profile(self, occupation: str, diet_type: str, conditions: List[str]) -> Dict:
+        return {
+            'age': self.rng.choice([8, 15, 25, 34, 47, 58, 66, 81]),
+            'gender': self.rng.choice(GENDERS),
+            'weight': round(self.rng.uniform(40, 120), 1),
+            'height': round(self.rng.uniform(140, 200), 1),
+            'occupation': occupation,
+            'exerciseFrequency': self.rng.choice(EXERCISE_FREQUENCIES),
+            'dietType': diet_type,
+            'healthConditions': list(conditions)
+        }
+
+    def cases(self) -> Iterator[Dict]:
+        """One case per occupation x diet x condition combination, cycling metric modes"""
+        modes = itertools.cycle(['normal', 'missing', 'extreme'])
+        for occupation, diet_type, conditions in itertools.product(OCCUPATIONS, DIET_TYPES, CONDITION_COMBOS):
+            profile = self.profile(occupation, diet_type, conditions)
+            metrics = self.metrics(next(modes))
+            yield {'metrics': metrics, 'userProfile': profile}
+
+
+def prediction_payload(case: Dict) -> Dict:
+    """Request body shape sent by backend/routes/predictions.js to /api/predict"""
+    profile = case['userProfile']
+    return {
+        'metrics': case['metrics'],
+        'userProfile': {
+            'age': profile['age'],
+            'gender': profile['gender'],
+            'weight': profile['weight'],
+            'height': profile['height'],
+            'occupation': profile['occupation'],
+            'exerciseFrequency': profile['exerciseFrequency'],
+            'sleepHours': case['metrics'].get('sleepHours')
+        }
+    }
+
+
+def nutrition_payload(case: Dict) -> Dict:
+    """Request body shape sent by backend/routes/predictions.js to /api/nutrition"""
+    profile = case['userProfile']
+    payload = {
+        'occupation': profile['occupation'],
+        'gender': profile['gender'],
+        'age': profile['age'],
+        'weight': profile['weight'],
+        'height': profile['height'],
+        'exerciseFrequency': profile['exerciseFrequency'],
+        'dietType': profile['dietType'],
+        'healthConditions': profile['healthConditions']
+    }
+    # The backend forwards whatever the latest reading has, so these may be absent
+    for key in ('stressLevel', 'heartRate'):
+        if key in case['metrics']:
+            payload[key] = case['metrics'][key]
+    return payload
@@ -0,0 +1,349 @@
+"""
+Durable long-term metric history for the ML service.
+
+Readings are appended to per-user, per-metric columnar segments under
+HISTORY_DIR/<user>/<metric>/. A segment is two flat files, `.ts`
+(uint32 epoch seconds) and `.val` (float32), written append-only and read
+through numpy.memmap, so range scans are zero-copy. Writes are partitioned
+into one segment per UTC day; a background compactor merges sealed days
+into large segments so a year of per-minute data is a handful of files.
+
+Crash safety: a segment's record count is the shorter of its two columns,
+in whole records, and anything past it is truncated on load. Compaction
+writes merged files under temporary names and renames them into place
+before deleting the sources. Leftover sources are detected by their overlap
+with the newer generation and removed.
+
+Other processes (the nightly forecast fit) open the archive with
+read_only=True: they skip torn or leftover files instead of repairing them,
+and never write, so they cannot race the service's appends or compaction.
+"""
+import glob
+import os
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+HISTORY_DIR = os.getenv('HISTORY_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'history'))
+FSYNC = os.getenv('HISTORY_FSYNC', '0') == '1'
+# Merged segments stop growing at about three months of per-minute data
+COMPACT_TARGET_RECORDS = int(os.getenv('HISTORY_COMPACT_TARGET', str(1 << 17)))
+INDEX_STRIDE = 1024
+SECONDS_PER_DAY = 86400
+
+TIME_DTYPE = np.dtype('<u4')
+VALUE_DTYPE = np.dtype('<f4')
+_SEGMENT_RE = re.compile(r'^seg-(\d{10})-g(\d+)\.ts$')
+_SAFE_ID_RE = re.compile(r'[^A-Za-z0-9_-]')
+
+
+def _fsync(f):
+    f.flush()
+    if FSYNC:
+        os.fsync(f.fileno())
+
+
+class Segment:
+    """One immutable-once-sealed run of (timestamp, value) records"""
+
+    __slots__ = ('path', 'first', 'generation', 'count', '_times', '_values', '_sparse', '_mapped')
+
+    def __init__(self, path: str, first: int, generation: int, count: int):
+        self.path = path  # without extension
+        self.first = first
+        self.generation = generation
+        self.count = count
+        self._times = self._values = self._sparse = None
+        self._mapped = 0
+
+    @property
+    def day(self) -> int:
+        return self.first // SECONDS_PER_DAY
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Memory-mapped (times, values); remapped only when the segment has grown"""
+        if self._mapped != self.count:
+            if self.count:
+                self._times = np.memmap(self.path + '.ts', TIME_DTYPE, mode='r', shape=(self.count,))
+                self._values = np.memmap(self.path + '.val', VALUE_DTYPE, mode='r', shape=(self.count,))
+            else:
+                self._times = np.empty(0, TIME_DTYPE)
+                self._values = np.empty(0, VALUE_DTYPE)
+            # Every INDEX_STRIDE-th timestamp; a lookup touches at most one stride of the column
+            self._sparse = np.array(self._times[::INDEX_STRIDE])
+            self._mapped = self.count
+        return self._times, self._values
+
+    @property
+    def last(self) -> int:
+        times, _ = self.columns()
+        return int(times[-1]) if len(times) else self.first
+
+    def _locate(self, timestamp: int, side: str) -> int:
+        times, _ = self.columns()
+        block = int(np.searchsorted(self._sparse, timestamp, side)) - 1
+        if block < 0:
+            return 0
+        begin = block * INDEX_STRIDE
+        end = min(begin + INDEX_STRIDE, len(times))
+        return begin + int(np.searchsorted(times[begin:end], timestamp, side))
+
+    def slice(self, start: Optional[int], end: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Views of the records with start <= t <= end"""
+        times, values = self.columns()
+        lo = 0 if start is None else self._locate(start, 'left')
+        hi = len(times) if end is None else self._locate(end, 'right')
+        return times[lo:hi], values[lo:hi]
+
+    def remove(self):
+        for ext in ('.ts', '.val'):
+            try:
+                os.remove(self.path + ext)
+            except FileNotFoundError:
+                pass
+
+
+class ColumnarHistory:
+    """Append-only columnar history for every user and metric"""
+
+    def __init__(self, root: str = HISTORY_DIR, read_only: bool = False):
+        self.root = root
+        self.read_only = read_only
+        self._series: Dict[Tuple[str, str], List[Segment]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compactor = None
+        self._stop = threading.Event()
+
+    # -- layout ---------------------------------------------------------
+
+    @staticmethod
+    def _safe(name: str) -> str:
+        safe = _SAFE_ID_RE.sub('', str(name))[:64]
+        if not safe:
+            raise ValueError(f'invalid history key: {name!r}')
+        return safe
+
+    def _dir(self, user_id: str, metric: str) -> str:
+        return os.path.join(self.root, self._safe(user_id), self._safe(metric))
+
+    def _lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._registry_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _segments(self, user_id: str, metric: str) -> List[Segment]:
+        """Segments oldest first; loaded and repaired on first use (caller holds the lock)"""
+        key = (user_id, metric)
+        segments = self._series.get(key)
+        if segments is None:
+            segments = self._series[key] = self._load(self._dir(user_id, metric))
+        return segments
+
+    def _load(self, directory: str) -> List[Segment]:
+        found = []
+        for path in glob.glob(os.path.join(directory, 'seg-*.ts')):
+            match = _SEGMENT_RE.match(os.path.basename(path))
+            if not match:
+                continue
+            base = path[:-3]
+            try:
+                sizes = os.path.getsize(base + '.ts'), os.path.getsize(base + '.val')
+            except FileNotFoundError:
+                # No values file, or (read-only) the writer removed the segment meanwhile
+                if not self.read_only and os.path.exists(path):
+                    os.remove(path)
+                continue
+            count = min(sizes[0] // TIME_DTYPE.itemsize, sizes[1] // VALUE_DTYPE.itemsize)
+            # Drop a torn trailing write so both columns hold exactly `count` records
+            if not self.read_only:
+                for size, ext, dtype in zip(sizes, ('.ts', '.val'), (TIME_DTYPE, VALUE_DTYPE)):
+                    if size != count * dtype.itemsize:
+                        os.truncate(base + ext, count * dtype.itemsize)
+            found.append(Segment(base, int(match.group(1)), int(match.group(2)), count))
+
+        # Values files whose timestamps never made it are unfinished compaction output
+        if not self.read_only:
+            for path in glob.glob(os.path.join(directory, '*.val')) + glob.glob(os.path.join(directory, '*.tmp')):
+                if path.endswith('.tmp') or not os.path.exists(path[:-4] + '.ts'):
+                    os.remove(path)
+
+        # A compaction that renamed its output but did not finish deleting its
+        # sources leaves them overlapping a newer generation
+        found.sort(key=lambda s: (s.first, -s.generation))
+        segments = []
+        for segment in found:
+            if segments and segment.first <= segments[-1].last and segment.generation < segments[-1].generation:
+                if not self.read_only:
+                    segment.remove()
+                continue
+            if segment.count:
+                segments.append(segment)
+            elif not self.read_only:
+                segment.remove()
+        return segments
+
+    # -- writes ---------------------------------------------------------
+
+    def append(self, user_id: str, metric: str, times, values):
+        """Append records in time order; timestamps older than the stored ones are rejected"""
+        if self.read_only:
+            raise ValueError('history is open read-only')
+        times = np.asarray(times, dtype=TIME_DTYPE)
+        values = np.asarray(values, dtype=VALUE_DTYPE)
+        if times.shape != values.shape or times.ndim != 1:
+            raise ValueError('times and values must be 1-D arrays of equal length')
+        if not len(times):
+            return
+        if np.any(times[1:] < times[:-1]):
+            raise ValueError('timestamps must be non-decreasing')
+
+        directory = self._dir(user_id, metric)
+        with self._lock((user_id, metric)):
+            segments = self._segments(user_id, metric)
+            if segments and times[0] < segments[-1].last:
+                raise ValueError(f'{metric} history for {user_id} already extends past {int(times[0])}')
+            os.makedirs(directory, exist_ok=True)
+
+            # One write per UTC day touched by the batch
+            days = times // SECONDS_PER_DAY
+            cuts = np.flatnonzero(days[1:] != days[:-1]) + 1
+            for lo, hi in zip(np.r_[0, cuts], np.r_[cuts, len(times)]):
+                active = segments[-1] if segments else None
+                if active is None or active.generation or active.day != days[lo]:
+                    active = Segment(os.path.join(directory, f'seg-{int(times[lo]):010d}-g0'),
+                                     int(times[lo]), 0, 0)
+                    segments.append(active)
+                # Values first: a crash between the writes leaves extra values, which load trims
+                with open(active.path + '.val', 'ab') as f:
+                    f.write(values[lo:hi].tobytes())
+                    _fsync(f)
+                with open(active.path + '.ts', 'ab') as f:
+                    f.write(times[lo:hi].tobytes())
+                    _fsync(f)
+                active.count += int(hi - lo)
+
+    # -- reads ----------------------------------------------------------
+
+    def scan_segments(self, user_id: str, metric: str, start: Optional[int] = None,
+                      end: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Zero-copy (times, values) views per segment for start <= t <= end"""
+        with self._lock((user_id, metric)):
+            segments = list(self._segments(user_id, metric))
+        for segment in segments:
+            if end is not None and segment.first > end:
+                break
+            if start is not None and segment.last < start:
+                continue
+            times, values = segment.slice(start, end)
+            if len(times):
+                yield times, values
+
+    def scan(self, user_id: str, metric: str, start: Optional[int] = None,
+             end: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(times, values) for start <= t <= end; a view when one segment covers the range"""
+        parts = list(self.scan_segments(user_id, metric, start, end))
+        if not parts:
+            return np.empty(0, TIME_DTYPE), np.empty(0, VALUE_DTYPE)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def last(self, user_id: str, metric: str) -> Optional[int]:
+        """Newest stored timestamp of a series; None when it has no records"""
+        with self._lock((user_id, metric)):
+            segments = self._segments(user_id, metric)
+            return segments[-1].last if segments else None
+
+    def metrics(self, user_id: str) -> List[str]:
+        try:
+            return sorted(os.listdir(os.path.join(self.root, self._safe(user_id))))
+        except FileNotFoundError:
+            return []
+
+    # -- compaction -----------------------------------------------------
+
+    def compact(self, user_id: Optional[str] = None) -> int:
+        """Merge runs of small sealed segments; returns the number of segments removed"""
+        removed = 0
+        if self.read_only:
+            return removed
+        with self._compact_lock:
+            for uid in ([user_id] if user_id else self.users()):
+                for metric in self.metrics(uid):
+                    removed += self._compact_series(uid, metric)
+        return removed
+
+    def users(self) -> List[str]:
+        try:
+            return sorted(os.listdir(self.root))
+        except FileNotFoundError:
+            return []
+
+    def _compact_series(self, user_id: str, metric: str) -> int:
+        lock = self._lock((user_id, metric))
+        with lock:
+            # The newest segment may still be written to; everything before it is sealed
+            sealed = list(self._segments(user_id, metric)[:-1])
+
+        runs, run, size = [], [], 0
+        for segment in sealed:
+            if segment.count >= COMPACT_TARGET_RECORDS or size + segment.count > COMPACT_TARGET_RECORDS:
+                if len(run) > 1:
+                    runs.append(run)
+                run, size = [], 0
+                if segment.count >= COMPACT_TARGET_RECORDS:
+                    continue
+            run.append(segment)
+            size += segment.count
+        if len(run) > 1:
+            runs.append(run)
+
+        removed = 0
+        for run in runs:
+            merged = self._merge(run)
+            with lock:
+                segments = self._segments(user_id, metric)
+                index = segments.index(run[0])
+                segments[index:index + len(run)] = [merged]
+            for segment in run:
+                segment.remove()
+            removed += len(run) - 1
+        return removed
+
+    def _merge(self, run: List[Segment]) -> Segment:
+        generation = max(s.generation for s in run) + 1
+        base = os.path.join(os.path.dirname(run[0].path), f'seg-{run[0].first:010d}-g{generation}')
+        for ext, column in (('.val', 1), ('.ts', 0)):
+            with open(base + ext + '.tmp', 'wb') as f:
+                for segment in run:
+                    f.write(segment.columns()[column].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        # The .ts rename commits the merged segment
+        os.replace(base + '.val.tmp', base + '.val')
+        os.replace(base + '.ts.tmp', base + '.ts')
+        return Segment(base, run[0].first, generation, sum(s.count for s in run))
+
+    def start_compactor(self, interval: float = 3600.0):
+        """Compact every `interval` seconds on a daemon thread"""
+        if self._compactor is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.compact()
+                except OSError:
+                    pass
+
+        self._compactor = threading.Thread(target=run, name='history-compactor', daemon=True)
+        self._compactor.start()
+
+    def stop_compactor(self):
+        self._stop.set()
@@ -0,0 +1,132 @@
+"""
+Per-user features derived from the profile, shared by both engines.
+
+BMI, the age group, the occupation's activity level and the profile part of
+the meal preference tags only change when the profile does, so they are
+computed once per (user, profile version, request kind) and reused by later
+requests of that kind. The kind is part of the key because /api/predict and
+/api/nutrition fill missing fields differently (no weight versus 70 kg), so
+one endpoint's features must never answer the other's. The backend bumps the
+version (the user's updatedAt) on every profile save and also posts
+/api/profile-updated, which drops the user's entries straight away. Requests
+without a version are never cached: nothing would tell a stale entry apart.
+
+Entries are slotted and hold shared strings and interned tag tuples, so a
+user costs a few hundred bytes.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_USERS = int(os.getenv('FEATURE_STORE_USERS', '100000'))
+DEFAULT_ACTIVITY = 'moderate'
+BASE_TAGS = ('easy', 'budget', 'quick')
+AGE_GROUP_TAGS = {'child': 'kid_friendly', 'teen': 'high_energy', 'elderly': 'light', 'adult': 'balanced'}
+
+# Only a handful of distinct tag tuples exist; every entry points at one of them
+_interned_tags: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def bmi(weight: Optional[float], height: Optional[float]) -> Optional[float]:
+    return weight / ((height / 100) ** 2) if weight and height else None
+
+
+def age_group(age: float) -> str:
+    if age <= 12:
+        return 'child'
+    if age <= 19:
+        return 'teen'
+    if age >= 60:
+        return 'elderly'
+    return 'adult'
+
+
+class ProfileFeatures:
+    __slots__ = ('version', 'bmi', 'age_group', 'activity_level', 'profile_tags')
+
+    def __init__(self, version, bmi: Optional[float], age_group_: str, activity_level: str,
+                 profile_tags: Tuple[str, ...]):
+        self.version = version
+        self.bmi = bmi
+        self.age_group = age_group_
+        self.activity_level = activity_level
+        self.profile_tags = profile_tags
+
+    @classmethod
+    def derive(cls, profile, occupation_profiles: Dict[str, Dict], version=None) -> 'ProfileFeatures':
+        """profile is a UserProfile or NutritionRequest (anything with age, weight, height, occupation)"""
+        weight = profile.weight
+        group = age_group(profile.age)
+        activity = occupation_profiles.get(profile.occupation, {}).get('activity_level', DEFAULT_ACTIVITY)
+
+        tags = list(BASE_TAGS)
+        tags.append(AGE_GROUP_TAGS[group])
+        if activity in ('active', 'very active'):
+            tags.append('high_energy')
+        elif activity == 'sedentary':
+            tags.append('light')
+        if weight:
+            if weight >= 85:
+                tags.append('light')
+            elif weight <= 55:
+                tags.append('high_energy')
+        tags = tuple(tags)
+        return cls(version, bmi(weight, profile.height), group, activity, _interned_tags.setdefault(tags, tags))
+
+
+class FeatureStore:
+    """Latest ProfileFeatures per user and request kind, least recently used first out"""
+
+    def __init__(self, occupation_profiles: Dict[str, Dict], max_users: int = DEFAULT_MAX_USERS):
+        self.occupation_profiles = occupation_profiles
+        # Caps entries; a user has one per request kind
+        self.max_users = max_users
+        self._entries: 'OrderedDict[Tuple[str, type], ProfileFeatures]' = OrderedDict()
+        self._kinds = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: Optional[str], version, profile) -> ProfileFeatures:
+        """
+        Features for this profile (a UserProfile or NutritionRequest, which is
+        the request kind); computed without caching when there is no user or
+        no version.
+        """
+        if not user_id or version is None:
+            return ProfileFeatures.derive(profile, self.occupation_profiles, version)
+        key = (user_id, type(profile))
+        with self._lock:
+            features = self._entries.get(key)
+            if features is not None and features.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return features
+            self.misses += 1
+
+        features = ProfileFeatures.derive(profile, self.occupation_profiles, version)
+        with self._lock:
+            self._entries[key] = features
+            self._entries.move_to_end(key)
+            self._kinds.add(key[1])
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return features
+
+    def invalidate(self, user_id: str) -> bool:
+        """Drop every entry of the user; returns whether there was one"""
+        with self._lock:
+            self.invalidations += 1
+            dropped = [self._entries.pop((user_id, kind), None) for kind in self._kinds]
+            return any(features is not None for features in dropped)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations
+            }
@@ -0,0 +1,117 @@
+"""
+Skip re-prediction when a user's inputs have not materially changed.
+
+HealthPredictor's output only moves when an input crosses one of its
+thresholds, or changes while outside its normal range (where the score
+and the insight text depend on the exact value). A fingerprint keeps
+exactly that information:
+
+  banded metrics   'normal' anywhere inside the predictor's normal range,
+                   the exact value outside it
+  stress level     always exact (the score is linear in it)
+  steps            below 3000 or not
+  profile          age over 50, a sedentary exercise frequency, BMI band
+
+Metrics the predictor never reads (temperature, calories, weight) are left
+out. Two inputs with the same fingerprint therefore produce the same
+prediction, so the last one per user can be returned without recomputing.
+The fingerprint is a flat tuple of a dozen small values, compared by ==.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from features import ProfileFeatures, bmi
+from schemas import HealthMetrics, UserProfile
+
+DEFAULT_MAX_USERS = int(os.getenv('PREDICTION_CACHE_USERS', '100000'))
+
+# HealthMetrics attribute -> normal_ranges key; the score is flat inside the range
+BANDED = (
+    ('heart_rate', 'heartRate'),
+    ('systolic', 'bloodPressureSystolic'),
+    ('diastolic', 'bloodPressureDiastolic'),
+    ('oxygen_saturation', 'oxygenSaturation'),
+    ('blood_glucose', 'bloodGlucose'),
+    ('sleep_hours', 'sleepHours')
+)
+LOW_STEPS = 3000
+SENIOR_AGE = 50
+SEDENTARY = ('Rarely', 'Never', '')
+BMI_BANDS = (18.5, 25)
+IN_RANGE = 'normal'
+
+
+def fingerprint(metrics: HealthMetrics, profile: UserProfile, normal_ranges: Dict[str, Tuple[float, float]],
+                features: Optional[ProfileFeatures] = None) -> Tuple:
+    """What the predictor's output depends on, and nothing else"""
+    parts = []
+    for attr, key in BANDED:
+        value = getattr(metrics, attr)
+        low, high = normal_ranges[key]
+        if value is not None and low <= value <= high:
+            parts.append(IN_RANGE)
+        else:
+            # 105 and 105.0 score the same but print differently in the insight text
+            parts.append(value if value is None or type(value) is int else (value,))
+    stress, steps = metrics.stress_level, metrics.steps
+    parts.append(stress if stress is None or type(stress) is int else (stress,))
+    parts.append(None if steps is None else steps < LOW_STEPS)
+
+    body_mass_index = features.bmi if features is not None else bmi(profile.weight, profile.height)
+    if body_mass_index is None:
+        parts.append(None)
+    else:
+        parts.append(0 if body_mass_index < BMI_BANDS[0] else 2 if body_mass_index > BMI_BANDS[1] else 1)
+    parts.append(profile.age > SENIOR_AGE)
+    parts.append(profile.exercise_frequency in SEDENTARY)
+    return tuple(parts)
+
+
+class PredictionCache:
+    """The last fingerprint and prediction per user, least recently used first out"""
+
+    def __init__(self, max_users: int = DEFAULT_MAX_USERS):
+        self.max_users = max_users
+        self._entries: 'OrderedDict[str, Tuple[Tuple, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, predictor, user_id: str, metrics: HealthMetrics, profile: UserProfile,
+                features: Optional[ProfileFeatures] = None) -> Tuple[Dict, bool]:
+        """The prediction for these inputs and whether it came from the cache.
+
+        Cached predictions are shared between responses; treat them as read-only.
+        """
+        key = fingerprint(metrics, profile, predictor.normal_ranges, features)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1], True
+            self.misses += 1
+
+        prediction = predictor.predict(metrics, profile, features)
+        with self._lock:
+            self._entries[user_id] = (key, prediction)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return prediction, False
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'users': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / total, 4) if total else None
+            }
@@ -0,0 +1,433 @@
+"""
+Short-term forecasts of slow-moving metrics (weight, blood pressure, sleep).
+
+Each user and metric gets a Holt linear-trend model fitted to daily means.
+Fitting is vectorized across users: the series are a 2-D users x days array
+and every (alpha, beta) pair in a small grid is run over all users at once,
+one day per step, before each user keeps its best pair. Missing days are
+NaN and only advance the trend.
+
+Modes:
+  nightly      refit every user from stored history and save the models
+               (python forecasting.py --nightly, or ForecastService.nightly)
+  incremental  ForecastService.observe() folds each new reading into the
+               current day and applies one Holt step when the day closes
+
+Every user's state is as of the last day folded into it, and forecasts are
+dated from that day. A running service saves its incremental state and picks
+up model files rewritten by a nightly run in another process (see
+ForecastService.start_sync); when both have a user, the newer state wins.
+"""
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from columnar import ColumnarHistory
+from schemas import HealthMetrics
+from timeseries import METRICS, TimeSeriesStore
+
+FORECAST_DIR = os.getenv('FORECAST_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'forecasts'))
+FORECAST_METRICS = ('weight', 'bloodPressureSystolic', 'bloodPressureDiastolic', 'sleepHours')
+HORIZON_DAYS = 7
+HISTORY_DAYS = 90
+ALPHAS = (0.1, 0.3, 0.5, 0.8)
+BETAS = (0.01, 0.1, 0.3)
+DEFAULT_ALPHA, DEFAULT_BETA = 0.3, 0.1
+Z_95 = 1.96
+SECONDS_PER_DAY = 86400
+# Users per nightly fitting chunk; bounds the users x days x grid working set
+CHUNK_USERS = 20000
+SYNC_INTERVAL_SECONDS = float(os.getenv('FORECAST_SYNC_SECONDS', '60'))
+OPEN_DAYS_FILE = 'open-days.json'
+
+_ATTRS = dict(METRICS)
+
+
+class HoltModels:
+    """Fitted Holt state for many users of one metric, one row per user"""
+
+    FIELDS = ('level', 'trend', 'alpha', 'beta', 'sigma2', 'observations', 'day')
+
+    def __init__(self, metric: str):
+        self.metric = metric
+        self.users: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.level = np.empty(0)
+        self.trend = np.empty(0)
+        self.alpha = np.empty(0)
+        self.beta = np.empty(0)
+        self.sigma2 = np.empty(0)
+        self.observations = np.empty(0, dtype=np.int64)
+        # Day number (days since the epoch) the level is as of; -1 before any data
+        self.day = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    # -- fitting --------------------------------------------------------
+
+    @staticmethod
+    def fit_arrays(series: np.ndarray) -> Dict[str, np.ndarray]:
+        """Fit every row of a users x days array (NaN = no reading); returns per-user state"""
+        series = np.asarray(series, dtype=np.float64)
+        users, days = series.shape
+        grid_alpha = np.repeat(ALPHAS, len(BETAS))[:, None]
+        grid_beta = np.tile(BETAS, len(ALPHAS))[:, None]
+        size = len(grid_alpha)
+
+        observed = ~np.isnan(series)
+        has_data = observed.any(axis=1)
+        first = np.where(has_data, observed.argmax(axis=1), days)
+        start = series[np.arange(users), np.minimum(first, days - 1)]
+
+        level = np.broadcast_to(np.where(has_data, start, 0.0), (size, users)).copy()
+        trend = np.zeros((size, users))
+        sse = np.zeros((size, users))
+        count = np.zeros(users, dtype=np.int64)
+
+        for day in range(days):
+            y = series[:, day]
+            # The first reading initialises the level; later ones are scored
+            seen = observed[:, day] & (first < day)
+            predicted = level + trend
+            error = np.where(seen, y - predicted, 0.0)
+            level = predicted + grid_alpha * error
+            trend = trend + grid_alpha * grid_beta * error
+            sse += error * error
+            count += seen
+
+        fitted = count >= 2
+        best = np.where(fitted, sse.argmin(axis=0), int(np.flatnonzero(
+            (grid_alpha[:, 0] == DEFAULT_ALPHA) & (grid_beta[:, 0] == DEFAULT_BETA))[0]))
+        columns = np.arange(users)
+        sigma2 = sse[best, columns] / np.maximum(count, 1)
+        return {
+            'level': np.where(has_data, level[best, columns], np.nan),
+            'trend': trend[best, columns],
+            'alpha': grid_alpha[best, 0],
+            'beta': grid_beta[best, 0],
+            # Too little history for a residual variance: point forecast only
+            'sigma2': np.where(fitted, sigma2, np.nan),
+            'observations': count + has_data
+        }
+
+    def fit(self, user_ids: List[str], series: np.ndarray, last_day: int):
+        """Fit (or refit) the given users; `last_day` is the day of the last column"""
+        state = self.fit_arrays(series)
+        state['day'] = np.full(len(user_ids), last_day, dtype=np.int64)
+        rows = self._ensure_rows(user_ids)
+        for name in self.FIELDS:
+            getattr(self, name)[rows] = state[name]
+
+    def _ensure_rows(self, user_ids: Iterable[str]) -> np.ndarray:
+        new = [u for u in dict.fromkeys(user_ids) if u not in self.rows]
+        if new:
+            for user_id in new:
+                self.rows[user_id] = len(self.users)
+                self.users.append(user_id)
+            grow = len(new)
+            self.level = np.r_[self.level, np.full(grow, np.nan)]
+            self.trend = np.r_[self.trend, np.zeros(grow)]
+            self.alpha = np.r_[self.alpha, np.full(grow, DEFAULT_ALPHA)]
+            self.beta = np.r_[self.beta, np.full(grow, DEFAULT_BETA)]
+            self.sigma2 = np.r_[self.sigma2, np.full(grow, np.nan)]
+            self.observations = np.r_[self.observations, np.zeros(grow, dtype=np.int64)]
+            self.day = np.r_[self.day, np.full(grow, -1, dtype=np.int64)]
+        return np.fromiter((self.rows[u] for u in user_ids), dtype=np.int64, count=len(user_ids))
+
+    # -- incremental ----------------------------------------------------
+
+    def update(self, user_ids: List[str], values: np.ndarray, days):
+        """
+        One Holt step per user with the mean of day `days` (a day number, or
+        one per user). Days in between with no value only advance the trend,
+        as in fitting; days the state already covers are skipped.
+        """
+        rows = self._ensure_rows(user_ids)
+        values = np.asarray(values, dtype=np.float64)
+        days = np.broadcast_to(np.asarray(days, dtype=np.int64), rows.shape)
+        newer = days > self.day[rows]
+        rows, values, days = rows[newer], values[newer], days[newer]
+        level, trend = self.level[rows], self.trend[rows]
+        alpha, beta = self.alpha[rows], self.beta[rows]
+        n = self.observations[rows]
+
+        fresh = np.isnan(level)
+        skipped = np.where(fresh, 0, days - self.day[rows] - 1)
+        predicted = level + (skipped + 1) * trend
+        error = np.where(fresh, 0.0, values - predicted)
+        self.level[rows] = np.where(fresh, values, predicted + alpha * error)
+        self.trend[rows] = trend + alpha * beta * error
+        # Running mean of squared one-step errors; the first observation only sets the level
+        sigma2 = self.sigma2[rows]
+        scored = np.maximum(n, 1)
+        previous = np.where(np.isnan(sigma2), 0.0, sigma2)
+        self.sigma2[rows] = np.where(fresh, sigma2, (previous * (scored - 1) + error * error) / scored)
+        self.observations[rows] = n + 1
+        self.day[rows] = days
+
+    def merge(self, other: 'HoltModels'):
+        """Take other's rows for users it has, unless ours are as of a later day"""
+        theirs = np.arange(len(other))
+        ours = self._ensure_rows(other.users)
+        take = other.day[theirs] >= self.day[ours]
+        for name in self.FIELDS:
+            getattr(self, name)[ours[take]] = getattr(other, name)[theirs[take]]
+
+    # -- forecasting ----------------------------------------------------
+
+    def forecast(self, rows: np.ndarray, horizon: int = HORIZON_DAYS,
+                 today: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Point forecasts and 95% intervals, each rows x horizon, for the days in
+        'days'. They start the day after each user's state, or at `today` when
+        the state is older.
+        """
+        as_of = self.day[rows, None]
+        first = np.ones_like(as_of) if today is None else np.maximum(today - as_of, 1)
+        steps = first + np.arange(horizon)
+        level, trend = self.level[rows, None], self.trend[rows, None]
+        alpha, beta = self.alpha[rows, None], self.beta[rows, None]
+        mean = level + steps * trend
+        # ETS(A,A,N): var_h = sigma2 * (1 + sum_{j<h} (alpha + alpha*beta*j)^2)
+        weights = (alpha + alpha * beta * np.arange(int(steps.max()))) ** 2
+        weights[:, 0] = 0.0
+        cumulative = np.take_along_axis(np.cumsum(weights, axis=1), steps - 1, axis=1)
+        variance = self.sigma2[rows, None] * (1 + cumulative)
+        spread = Z_95 * np.sqrt(variance)
+        return {'mean': mean, 'lower': mean - spread, 'upper': mean + spread, 'days': as_of + steps}
+
+    # -- persistence ----------------------------------------------------
+
+    def save(self, path: str) -> int:
+        """Write atomically; returns the file's mtime (ns), as read before the rename"""
+        tmp = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp, users=np.array(self.users, dtype=np.str_),
+                 **{name: getattr(self, name) for name in self.FIELDS})
+        mtime = os.stat(tmp).st_mtime_ns
+        os.replace(tmp, path)
+        return mtime
+
+    @classmethod
+    def load(cls, metric: str, path: str) -> 'HoltModels':
+        models = cls(metric)
+        with np.load(path) as data:
+            models.users = data['users'].tolist()
+            for name in cls.FIELDS:
+                setattr(models, name, data[name])
+        models.rows = {user_id: row for row, user_id in enumerate(models.users)}
+        return models
+
+
+def daily_means(times: np.ndarray, values: np.ndarray, first_day: int, days: int) -> np.ndarray:
+    """Mean per UTC day over [first_day, first_day + days); NaN where there are no readings"""
+    index = times.astype(np.int64) // SECONDS_PER_DAY - first_day
+    inside = (index >= 0) & (index < days)
+    index, values = index[inside], values[inside].astype(np.float64)
+    totals = np.bincount(index, weights=values, minlength=days)
+    counts = np.bincount(index, minlength=days)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+
+class ForecastService:
+    """Models for every forecast metric, plus the nightly and incremental paths"""
+
+    def __init__(self, archive: ColumnarHistory, history: Optional[TimeSeriesStore] = None,
+                 directory: str = FORECAST_DIR):
+        self.archive = archive
+        self.history = history
+        self.directory = directory
+        # metric -> mtime (ns) of the model file as last read or written here
+        self._mtimes: Dict[str, int] = {}
+        self.models = {metric: self._load(metric) for metric in FORECAST_METRICS}
+        # (user, metric) -> [day, sum, count] for the day still being collected
+        self._open_days: Dict[tuple, list] = self._load_open_days()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._syncer = None
+        self._stop = threading.Event()
+
+    def _path(self, metric: str) -> str:
+        return os.path.join(self.directory, f'holt-{metric}.npz')
+
+    def _load(self, metric: str) -> HoltModels:
+        path = self._path(metric)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            models = HoltModels.load(metric, path)
+        except (OSError, KeyError, ValueError):
+            return HoltModels(metric)
+        self._mtimes[metric] = mtime
+        return models
+
+    def _load_open_days(self) -> Dict[tuple, list]:
+        try:
+            with open(os.path.join(self.directory, OPEN_DAYS_FILE)) as f:
+                return {(user_id, metric): [day, total, count] for user_id, metric, day, total, count in json.load(f)}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    # -- persistence ----------------------------------------------------
+
+    def _pull(self):
+        """Merge model files another process (a nightly run) rewrote since we last read or wrote them"""
+        for metric in FORECAST_METRICS:
+            try:
+                mtime = os.stat(self._path(metric)).st_mtime_ns
+            except OSError:
+                continue
+            if mtime == self._mtimes.get(metric):
+                continue
+            loaded = self._load(metric)
+            with self._lock:
+                self.models[metric].merge(loaded)
+                # Rows we kept may be newer than the file's
+                self._dirty = True
+
+    def _write_models(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            for metric, models in self.models.items():
+                self._mtimes[metric] = models.save(self._path(metric))
+
+    def save(self):
+        """Write the models, after merging newer files, and the days still being collected"""
+        self._pull()
+        self._write_models()
+        with self._lock:
+            open_days = [[user_id, metric, *state] for (user_id, metric), state in self._open_days.items()]
+            self._dirty = False
+        path = os.path.join(self.directory, OPEN_DAYS_FILE)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(open_days, f)
+        os.replace(tmp, path)
+
+    def sync(self):
+        """Pick up a nightly run's models and save incremental state if it changed"""
+        self._pull()
+        if self._dirty:
+            self.save()
+
+    def start_sync(self, interval: float = SYNC_INTERVAL_SECONDS):
+        """sync() every `interval` seconds on a daemon thread, and once more at exit"""
+        if self._syncer is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                self._sync_quietly()
+
+        self._syncer = threading.Thread(target=run, name='forecast-sync', daemon=True)
+        self._syncer.start()
+        atexit.register(self._sync_quietly)
+
+    def stop_sync(self):
+        self._stop.set()
+
+    def _sync_quietly(self):
+        try:
+            self.sync()
+        except (OSError, ValueError):
+            pass
+
+    # -- fitting --------------------------------------------------------
+
+    def nightly(self, user_ids: Optional[List[str]] = None, days: int = HISTORY_DAYS,
+                now: Optional[float] = None) -> Dict:
+        """Refit all users from stored history in chunks (through yesterday), then save the models"""
+        from trends import load_series
+
+        started = time.perf_counter()
+        today = int((time.time() if now is None else now) // SECONDS_PER_DAY)
+        first_day = today - days
+        if user_ids is None:
+            known = set(self.archive.users())
+            if self.history is not None:
+                known.update(self.history.users())
+            user_ids = sorted(known)
+        for metric in FORECAST_METRICS:
+            for offset in range(0, len(user_ids), CHUNK_USERS):
+                chunk = user_ids[offset:offset + CHUNK_USERS]
+                series = np.full((len(chunk), days), np.nan)
+                for row, user_id in enumerate(chunk):
+                    times, values = load_series(self.archive, self.history, user_id, metric,
+                                                first_day * SECONDS_PER_DAY, today * SECONDS_PER_DAY - 1)
+                    if len(times):
+                        series[row] = daily_means(times, values, first_day, days)
+                fitted = HoltModels.fit_arrays(series)
+                fitted['day'] = np.full(len(chunk), today - 1, dtype=np.int64)
+                # Users with nothing stored in the window keep their incremental state
+                refit = ~np.isnan(fitted['level'])
+                with self._lock:
+                    models = self.models[metric]
+                    rows = models._ensure_rows([u for u, keep in zip(chunk, refit) if keep])
+                    for name in HoltModels.FIELDS:
+                        getattr(models, name)[rows] = fitted[name][refit]
+        # Not save(): merging first would let a running service's state, as of the
+        # same day, win over the refit. The service merges this file instead.
+        self._write_models()
+        return {'users': len(user_ids), 'metrics': len(FORECAST_METRICS),
+                'seconds': round(time.perf_counter() - started, 3)}
+
+    def observe(self, user_id: str, metrics: HealthMetrics, timestamp: Optional[float] = None):
+        """Fold a reading into today's mean; a finished day becomes one Holt step"""
+        day = int((time.time() if timestamp is None else timestamp) // SECONDS_PER_DAY)
+        closed = []
+        with self._lock:
+            for metric in FORECAST_METRICS:
+                value = getattr(metrics, _ATTRS[metric])
+                if value is None:
+                    continue
+                key = (user_id, metric)
+                current = self._open_days.get(key)
+                if current is not None and current[0] != day:
+                    closed.append((metric, current[0], current[1] / current[2]))
+                    current = None
+                if current is None:
+                    current = self._open_days[key] = [day, 0.0, 0]
+                current[1] += value
+                current[2] += 1
+                self._dirty = True
+            for metric, closed_day, mean in closed:
+                self.models[metric].update([user_id], [mean], closed_day)
+
+    def forecast(self, user_id: str, horizon: int = HORIZON_DAYS, now: Optional[float] = None) -> Dict:
+        """Per-metric projections for the next `horizon` days from today; metrics without a model are omitted"""
+        today = int((time.time() if now is None else now) // SECONDS_PER_DAY)
+        result = {}
+        with self._lock:
+            for metric, models in self.models.items():
+                row = models.rows.get(user_id)
+                if row is None or np.isnan(models.level[row]):
+                    continue
+                projection = models.forecast(np.array([row]), horizon, today)
+                result[metric] = [{
+                    'date': time.strftime('%Y-%m-%d', time.gmtime(int(projection['days'][0, step]) * SECONDS_PER_DAY)),
+                    'mean': round(float(projection['mean'][0, step]), 2),
+                    'lower': None if np.isnan(projection['lower'][0, step]) else round(float(projection['lower'][0, step]), 2),
+                    'upper': None if np.isnan(projection['upper'][0, step]) else round(float(projection['upper'][0, step]), 2)
+                } for step in range(horizon)]
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit Holt forecasts for every user with stored history')
+    parser.add_argument('--nightly', action='store_true', help='refit all users and save the models')
+    parser.add_argument('--days', type=int, default=HISTORY_DAYS)
+    args = parser.parse_args()
+    if not args.nightly:
+        parser.error('nothing to do; pass --nightly')
+    # Read-only: the service may be appending to or compacting the same archive
+    print(json.dumps(ForecastService(ColumnarHistory(read_only=True)).nightly(days=args.days)))
+
+
+if __name__ == '__main__':
+    main()
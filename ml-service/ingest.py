@@ -0,0 +1,360 @@
+"""
+Bulk ingestion of wearable readings.
+
+POST /api/ingest takes either of two bodies and reads them incrementally
+from the request stream, so a large upload is never buffered whole:
+
+  application/x-ndjson     one reading per line:
+                           {"userId": "u1", "timestamp": 1700000000, "heartRate": 72, "steps": 12}
+                           (timestamp is epoch seconds; any METRICS key may appear)
+  application/octet-stream packed little-endian records of
+                           uint32 timestamp, uint8 metric index (METRICS order), float32 value;
+                           the user comes from the `userId` query parameter
+
+When `userId` is given as a query parameter it overrides the lines.
+
+Readings are folded into per-minute min/mean/max/count buckets per user and
+metric. A bucket is written to the columnar archive (and its mean to the
+in-memory recent history) once a later minute arrives for that series or
+it is older than FLUSH_GRACE_SECONDS. Every request flushes; between
+requests a background thread does (MinuteAggregator.start_flusher), so the
+last minute of a series that goes quiet is written too, and whatever is
+still pending is written at exit. Readings for minutes that were already
+written, by this process or found in the archive, are counted as late and
+dropped. A closed bucket the archive still refuses (another writer got there
+first) is dropped whole and its readings are counted as late too.
+"""
+import atexit
+import itertools
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from columnar import ColumnarHistory
+from schemas import ValidationError
+from timeseries import METRIC_INDEX, METRICS, TimeSeriesStore
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _DecodeError = orjson.JSONDecodeError
+except ImportError:  # pragma: no cover - optional speedup
+    import json
+    _loads = json.loads
+    _DecodeError = ValueError
+
+CHUNK_BYTES = 256 * 1024
+BATCH_READINGS = 1 << 16
+FLUSH_GRACE_SECONDS = 120
+FLUSH_INTERVAL_SECONDS = float(os.getenv('INGEST_FLUSH_SECONDS', '30'))
+MAX_REPORTED_ERRORS = 10
+BUCKET_SECONDS = 60
+MAX_TIMESTAMP = 2 ** 32 - 1  # archive timestamps are uint32
+
+RECORD_DTYPE = np.dtype([('t', '<u4'), ('m', 'u1'), ('v', '<f4')])
+# Archive series written for every metric, in bucket column order
+AGGREGATES = ('min', 'mean', 'max', 'count')
+
+
+class Batch:
+    """Readings decoded from one stretch of the body, as parallel columns"""
+
+    __slots__ = ('users', 'user', 'metric', 'time', 'value')
+
+    def __init__(self, users: List[str], user, metric, time_, value):
+        self.users = users
+        self.user = np.asarray(user, dtype=np.int32)
+        self.metric = np.asarray(metric, dtype=np.int16)
+        self.time = np.asarray(time_, dtype=np.int64)
+        self.value = np.asarray(value, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+class ParseStats:
+    __slots__ = ('readings', 'rejected', 'errors')
+
+    def __init__(self):
+        self.readings = 0
+        self.rejected = 0
+        self.errors: List[Dict] = []
+
+    def reject(self, field: str, message: str, count: int = 1):
+        self.rejected += count
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'field': field, 'message': message})
+
+
+def _chunks(stream) -> Iterator[bytes]:
+    while True:
+        chunk = stream.read(CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_ndjson(stream, stats: ParseStats, user_override: Optional[str] = None) -> Iterator[Batch]:
+    users: List[str] = []
+    user_codes: Dict[str, int] = {}
+    if user_override:
+        users.append(user_override)
+    u, m, t, v = [], [], [], []
+    metric_index = METRIC_INDEX
+    line_no = 0
+    tail = b''
+
+    # The extra newline terminates a last line that has none
+    for chunk in itertools.chain(_chunks(stream), (b'\n',)):
+        lines = (tail + chunk).split(b'\n')
+        tail = lines.pop()
+        for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                reading = _loads(line)
+                timestamp = reading['timestamp']
+                if type(timestamp) is not int:
+                    timestamp = int(timestamp)
+                if not 0 <= timestamp <= MAX_TIMESTAMP:
+                    raise ValueError(timestamp)
+            except (_DecodeError, KeyError, TypeError, ValueError):
+                stats.reject(f'line {line_no}', 'expected a JSON object with a numeric timestamp')
+                continue
+
+            if user_override:
+                code = 0
+            else:
+                user_id = reading.get('userId')
+                if type(user_id) is not str or not user_id:
+                    stats.reject(f'line {line_no}', 'userId must be a non-empty string')
+                    continue
+                code = user_codes.get(user_id)
+                if code is None:
+                    code = user_codes[user_id] = len(users)
+                    users.append(user_id)
+
+            found = False
+            for key, value in reading.items():
+                index = metric_index.get(key)
+                if index is None:
+                    continue
+                found = True
+                kind = type(value)
+                if kind is not int and kind is not float:
+                    stats.reject(f'line {line_no}', f'{key} must be a number')
+                    continue
+                u.append(code)
+                m.append(index)
+                t.append(timestamp)
+                v.append(value)
+            if not found:
+                stats.reject(f'line {line_no}', 'no known metric (e.g. heartRate, steps)')
+
+        if len(t) >= BATCH_READINGS:
+            stats.readings += len(t)
+            yield Batch(users, u, m, t, v)
+            u, m, t, v = [], [], [], []
+
+    if t:
+        stats.readings += len(t)
+        yield Batch(users, u, m, t, v)
+
+
+def parse_binary(stream, stats: ParseStats, user_id: str) -> Iterator[Batch]:
+    size = RECORD_DTYPE.itemsize
+    tail = b''
+    for chunk in _chunks(stream):
+        data = tail + chunk
+        usable = len(data) - len(data) % size
+        tail = data[usable:]
+        records = np.frombuffer(data, dtype=RECORD_DTYPE, count=usable // size)
+        valid = (records['m'] < len(METRICS)) & np.isfinite(records['v'])
+        if not valid.all():
+            bad = int((~valid).sum())
+            stats.reject('records', f'{bad} records with an unknown metric or a non-finite value', bad)
+            records = records[valid]
+        if len(records):
+            stats.readings += len(records)
+            yield Batch([user_id], np.zeros(len(records), dtype=np.int32), records['m'], records['t'], records['v'])
+    if tail:
+        stats.reject('records', f'body ends with a partial {size}-byte record')
+
+
+class MinuteAggregator:
+    """Pending per-minute buckets and the writer that moves closed ones to storage"""
+
+    def __init__(self, archive: ColumnarHistory, history: Optional[TimeSeriesStore] = None):
+        self.archive = archive
+        self.history = history
+        # (user, metric index) -> {minute: [min, sum, max, count]}
+        self._pending: Dict[Tuple[str, int], Dict[int, List[float]]] = {}
+        self._written_upto: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        # Held from taking closed buckets to writing them, so that flushes write in the order they took
+        # them and a series' four aggregate columns are appended together
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stop = threading.Event()
+
+    def _archived_upto(self, user_id: str, index: int) -> int:
+        """Start of the newest minute any aggregate column of a series holds; -1 when none"""
+        metric = METRICS[index][0]
+        newest = [self.archive.last(user_id, f'{metric}_{name}') for name in AGGREGATES]
+        newest = [t for t in newest if t is not None]
+        return max(newest) if newest else -1
+
+    def add(self, batch: Batch) -> Tuple[int, int, int]:
+        """Fold a batch into pending buckets; returns (buckets touched, late readings, rejected readings)"""
+        if not len(batch):
+            return 0, 0, 0
+        minute = batch.time - batch.time % BUCKET_SECONDS
+        order = np.lexsort((minute, batch.metric, batch.user))
+        user, metric, minute, value = batch.user[order], batch.metric[order], minute[order], batch.value[order]
+
+        change = (user[1:] != user[:-1]) | (metric[1:] != metric[:-1]) | (minute[1:] != minute[:-1])
+        starts = np.r_[0, np.flatnonzero(change) + 1]
+        lows = np.minimum.reduceat(value, starts).tolist()
+        sums = np.add.reduceat(value, starts).tolist()
+        highs = np.maximum.reduceat(value, starts).tolist()
+        counts = np.diff(np.r_[starts, len(value)]).tolist()
+        keys = list(zip(user[starts].tolist(), metric[starts].tolist(), minute[starts].tolist()))
+
+        # Series new to this process start after whatever the archive already holds
+        archived, invalid = {}, set()
+        for code, index, _ in keys:
+            series = (batch.users[code], index)
+            if series in self._written_upto or series in archived or series in invalid:
+                continue
+            try:
+                archived[series] = self._archived_upto(*series)
+            except ValueError:
+                # A user ID the archive cannot store
+                invalid.add(series)
+
+        late = rejected = 0
+        with self._lock:
+            for series, upto in archived.items():
+                self._written_upto.setdefault(series, upto)
+            for (code, index, bucket_start), low, total, high, count in zip(keys, lows, sums, highs, counts):
+                series = (batch.users[code], index)
+                if series in invalid:
+                    rejected += count
+                    continue
+                if bucket_start <= self._written_upto.get(series, -1):
+                    late += count
+                    continue
+                buckets = self._pending.get(series)
+                if buckets is None:
+                    buckets = self._pending[series] = {}
+                bucket = buckets.get(bucket_start)
+                if bucket is None:
+                    buckets[bucket_start] = [low, total, high, count]
+                else:
+                    bucket[0] = min(bucket[0], low)
+                    bucket[1] += total
+                    bucket[2] = max(bucket[2], high)
+                    bucket[3] += count
+        return len(counts), late, rejected
+
+    def flush(self, now: Optional[float] = None, everything: bool = False) -> Tuple[int, int]:
+        """Write closed buckets; returns (buckets written, readings dropped as late)"""
+        with self._flush_lock:
+            return self._flush(now, everything)
+
+    def _flush(self, now: Optional[float], everything: bool) -> Tuple[int, int]:
+        cutoff = (time.time() if now is None else now) - FLUSH_GRACE_SECONDS
+        ready = []
+        with self._lock:
+            for series, buckets in list(self._pending.items()):
+                newest = max(buckets)
+                closed = sorted(b for b in buckets if everything or b < newest or b + BUCKET_SECONDS <= cutoff)
+                if not closed:
+                    continue
+                rows = [buckets.pop(b) for b in closed]
+                if not buckets:
+                    del self._pending[series]
+                self._written_upto[series] = closed[-1]
+                ready.append((series, closed, rows))
+
+        written = dropped = 0
+        for (user_id, index), minutes, rows in ready:
+            metric = METRICS[index][0]
+            columns = np.array(rows, dtype=np.float64)
+            # Checked before any column is written, so the four columns stay the same length
+            if minutes[0] < self._archived_upto(user_id, index):
+                dropped += int(columns[:, 3].sum())
+                continue
+            aggregates = (columns[:, 0], columns[:, 1] / columns[:, 3], columns[:, 2], columns[:, 3])
+            for name, values in zip(AGGREGATES, aggregates):
+                self.archive.append(user_id, f'{metric}_{name}', minutes, values)
+            if self.history is not None:
+                for minute, mean in zip(minutes, aggregates[1].tolist()):
+                    self.history.append_value(user_id, metric, minute, mean)
+            written += len(minutes)
+        return written, dropped
+
+    def start_flusher(self, interval: float = FLUSH_INTERVAL_SECONDS):
+        """flush() every `interval` seconds on a daemon thread, and everything once more at exit"""
+        if self._flusher is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                self._flush_quietly()
+
+        self._flusher = threading.Thread(target=run, name='ingest-flusher', daemon=True)
+        self._flusher.start()
+        atexit.register(self._flush_quietly, True)
+
+    def stop_flusher(self):
+        self._stop.set()
+
+    def _flush_quietly(self, everything: bool = False):
+        try:
+            self.flush(everything=everything)
+        except (OSError, ValueError):
+            pass
+
+
+class Ingestor:
+    """Parses an ingestion body and feeds the aggregator"""
+
+    def __init__(self, archive: ColumnarHistory, history: Optional[TimeSeriesStore] = None):
+        self.aggregator = MinuteAggregator(archive, history)
+
+    def ingest(self, stream, mimetype: str, user_id: Optional[str] = None) -> Dict:
+        stats = ParseStats()
+        if mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+            batches = parse_ndjson(stream, stats, user_id)
+        elif mimetype == 'application/octet-stream':
+            if not user_id:
+                raise ValidationError([{'field': 'userId', 'message': 'query parameter is required for binary batches'}])
+            batches = parse_binary(stream, stats, user_id)
+        else:
+            raise ValidationError([{'field': 'Content-Type',
+                                    'message': 'must be application/x-ndjson or application/octet-stream'}])
+
+        buckets = late = rejected = 0
+        for batch in batches:
+            touched, batch_late, batch_rejected = self.aggregator.add(batch)
+            buckets += touched
+            late += batch_late
+            rejected += batch_rejected
+        if rejected:
+            stats.reject('userId', f'{rejected} readings for a user ID the archive cannot store', rejected)
+        written, dropped = self.aggregator.flush()
+        late += dropped
+        return {
+            # Dropped buckets can hold readings of earlier requests, hence the floor
+            'accepted': max(stats.readings - late - rejected, 0),
+            'late': late,
+            'rejected': stats.rejected,
+            'bucketsUpdated': buckets,
+            'bucketsWritten': written,
+            'errors': stats.errors
+        }
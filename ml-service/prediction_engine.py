@@ -1,5 +1,7 @@
-import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
+from features import ProfileFeatures, bmi
+from schemas import HealthMetrics, UserProfile
+from tracing import span
 
 class HealthPredictor:
     """
@@ -20,23 +22,35 @@ class HealthPredictor:
             'sleepHours': (7, 9)
         }
     
-    def predict(self, metrics: Dict, user_profile: Dict) -> Dict:
+    def predict(self, metrics: Union[HealthMetrics, Dict], user_profile: Union[UserProfile, Dict],
+                features: Optional[ProfileFeatures] = None) -> Dict:
         """Generate health predictions based on metrics and user profile"""
         
+        # Plain dicts (scripts, benchmarks) go through the same typed decoding as the API
+        if isinstance(metrics, dict):
+            metrics = HealthMetrics.from_dict(metrics)
+        if isinstance(user_profile, dict):
+            user_profile = UserProfile.from_dict(user_profile)
+        
         # Calculate overall health score
-        health_score = self._calculate_health_score(metrics, user_profile)
+        with span('predict.health_score'):
+            health_score = self._calculate_health_score(metrics, user_profile)
         
         # Determine risk level
-        risk_level = self._determine_risk_level(health_score, metrics)
+        with span('predict.risk_level'):
+            risk_level = self._determine_risk_level(health_score, metrics)
         
         # Generate insights
-        insights = self._generate_insights(metrics, user_profile, health_score)
+        with span('predict.insights'):
+            insights = self._generate_insights(metrics, user_profile, health_score)
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(metrics, user_profile)
+        with span('predict.recommendations'):
+            recommendations = self._generate_recommendations(metrics, user_profile, features)
         
         # Identify areas needing attention
-        areas_needing_attention = self._identify_problem_areas(metrics)
+        with span('predict.problem_areas'):
+            areas_needing_attention = self._identify_problem_areas(metrics)
         
         return {
             'overallHealthScore': round(health_score, 1),
@@ -46,14 +60,23 @@ class HealthPredictor:
             'areasNeedingAttention': areas_needing_attention
         }
     
-    def _calculate_health_score(self, metrics: Dict, user_profile: Dict) -> float:
+    def assess(self, metrics: Union[HealthMetrics, Dict], user_profile: Union[UserProfile, Dict]) -> Tuple[float, str]:
+        """Health score and risk level only (what batch re-scoring needs)"""
+        if isinstance(metrics, dict):
+            metrics = HealthMetrics.from_dict(metrics)
+        if isinstance(user_profile, dict):
+            user_profile = UserProfile.from_dict(user_profile)
+        health_score = self._calculate_health_score(metrics, user_profile)
+        return round(health_score, 1), self._determine_risk_level(health_score, metrics)
+    
+    def _calculate_health_score(self, metrics: HealthMetrics, user_profile: UserProfile) -> float:
         """Calculate overall health score (0-100)"""
         scores = []
         weights = []
         
         # Heart rate score
-        if metrics.get('heartRate'):
-            hr = metrics['heartRate']
+        if metrics.heart_rate:
+            hr = metrics.heart_rate
             min_hr, max_hr = self.normal_ranges['heartRate']
             if min_hr <= hr <= max_hr:
                 scores.append(100)
@@ -63,9 +86,9 @@ class HealthPredictor:
             weights.append(1.5)
         
         # Blood pressure score
-        if metrics.get('bloodPressureSystolic') and metrics.get('bloodPressureDiastolic'):
-            sys = metrics['bloodPressureSystolic']
-            dia = metrics['bloodPressureDiastolic']
+        if metrics.systolic and metrics.diastolic:
+            sys = metrics.systolic
+            dia = metrics.diastolic
             sys_min, sys_max = self.normal_ranges['bloodPressureSystolic']
             dia_min, dia_max = self.normal_ranges['bloodPressureDiastolic']
             
@@ -75,8 +98,8 @@ class HealthPredictor:
             weights.append(2.0)
         
         # Oxygen saturation score
-        if metrics.get('oxygenSaturation'):
-            o2 = metrics['oxygenSaturation']
+        if metrics.oxygen_saturation:
+            o2 = metrics.oxygen_saturation
             if o2 >= 95:
                 scores.append(100)
             else:
@@ -84,14 +107,14 @@ class HealthPredictor:
             weights.append(1.5)
         
         # Stress level score (inverse - lower is better)
-        if metrics.get('stressLevel'):
-            stress = metrics['stressLevel']
+        if metrics.stress_level:
+            stress = metrics.stress_level
             scores.append(max(0, 100 - stress * 10))
             weights.append(1.0)
         
         # Sleep hours score
-        if metrics.get('sleepHours'):
-            sleep = metrics['sleepHours']
+        if metrics.sleep_hours:
+            sleep = metrics.sleep_hours
             if 7 <= sleep <= 9:
                 scores.append(100)
             else:
@@ -99,8 +122,8 @@ class HealthPredictor:
             weights.append(1.0)
         
         # Blood glucose score
-        if metrics.get('bloodGlucose'):
-            glucose = metrics['bloodGlucose']
+        if metrics.blood_glucose:
+            glucose = metrics.blood_glucose
             if 70 <= glucose <= 140:
                 scores.append(100)
             else:
@@ -115,17 +138,17 @@ class HealthPredictor:
         
         return 75.0  # Default score if no metrics
     
-    def _determine_risk_level(self, health_score: float, metrics: Dict) -> str:
+    def _determine_risk_level(self, health_score: float, metrics: HealthMetrics) -> str:
         """Determine risk level based on health score and critical metrics"""
         
         # Check for critical conditions
         critical_conditions = []
         
-        if metrics.get('bloodPressureSystolic', 0) > 140:
+        if metrics.systolic is not None and metrics.systolic > 140:
             critical_conditions.append('high_bp')
-        if metrics.get('oxygenSaturation', 100) < 90:
+        if metrics.oxygen_saturation is not None and metrics.oxygen_saturation < 90:
             critical_conditions.append('low_oxygen')
-        if metrics.get('stressLevel', 0) > 8:
+        if metrics.stress_level is not None and metrics.stress_level > 8:
             critical_conditions.append('high_stress')
         
         if critical_conditions or health_score < 60:
@@ -135,7 +158,7 @@ class HealthPredictor:
         else:
             return 'Low'
     
-    def _generate_insights(self, metrics: Dict, user_profile: Dict, health_score: float) -> List[str]:
+    def _generate_insights(self, metrics: HealthMetrics, user_profile: UserProfile, health_score: float) -> List[str]:
         """Generate personalized health insights"""
         insights = []
         
@@ -148,108 +171,109 @@ class HealthPredictor:
             insights.append(f"Health score is {health_score:.1f}/100. Several areas need attention for improvement.")
         
         # Specific metric insights
-        if metrics.get('heartRate'):
-            hr = metrics['heartRate']
+        if metrics.heart_rate:
+            hr = metrics.heart_rate
             if hr > 100:
                 insights.append(f"Heart rate ({hr} bpm) is elevated. Consider stress management and regular exercise.")
             elif hr < 60:
                 insights.append(f"Heart rate ({hr} bpm) is lower than average. This is normal for athletes, otherwise consult a doctor.")
         
-        if metrics.get('bloodPressureSystolic'):
-            sys = metrics['bloodPressureSystolic']
+        if metrics.systolic:
+            sys = metrics.systolic
             if sys > 130:
                 insights.append(f"Blood pressure ({sys} mmHg systolic) is elevated. Reduce sodium intake and manage stress.")
             elif sys < 90:
                 insights.append("Blood pressure is on the lower side. Stay hydrated and monitor symptoms.")
         
-        if metrics.get('stressLevel'):
-            stress = metrics['stressLevel']
+        if metrics.stress_level:
+            stress = metrics.stress_level
             if stress > 7:
                 insights.append(f"High stress level detected ({stress}/10). Prioritize relaxation and mental health.")
         
-        if metrics.get('sleepHours'):
-            sleep = metrics['sleepHours']
+        if metrics.sleep_hours:
+            sleep = metrics.sleep_hours
             if sleep < 6:
                 insights.append(f"Insufficient sleep ({sleep} hours). Aim for 7-9 hours for optimal health.")
             elif sleep > 10:
                 insights.append(f"Excessive sleep ({sleep} hours) may indicate underlying issues.")
         
         # Age-related insights
-        age = user_profile.get('age', 30)
-        if age > 50 and metrics.get('bloodPressureSystolic', 0) > 120:
+        if user_profile.age > 50 and metrics.systolic is not None and metrics.systolic > 120:
             insights.append("At your age, maintaining optimal blood pressure is crucial. Regular monitoring recommended.")
         
         return insights
     
-    def _generate_recommendations(self, metrics: Dict, user_profile: Dict) -> List[str]:
+    def _generate_recommendations(self, metrics: HealthMetrics, user_profile: UserProfile,
+                                  features: Optional[ProfileFeatures] = None) -> List[str]:
         """Generate actionable health recommendations"""
         recommendations = []
         
         # Heart rate recommendations
-        if metrics.get('heartRate', 0) > 100:
+        if metrics.heart_rate is not None and metrics.heart_rate > 100:
             recommendations.append("Practice deep breathing exercises for 10 minutes daily")
             recommendations.append("Consider cardiovascular exercise 3-4 times per week")
         
         # Blood pressure recommendations
-        if metrics.get('bloodPressureSystolic', 0) > 130:
+        if metrics.systolic is not None and metrics.systolic > 130:
             recommendations.append("Reduce sodium intake to less than 2,300mg per day")
             recommendations.append("Increase potassium-rich foods (bananas, spinach)")
         
         # Stress recommendations
-        if metrics.get('stressLevel', 0) > 6:
+        if metrics.stress_level is not None and metrics.stress_level > 6:
             recommendations.append("Practice mindfulness meditation for 15 minutes daily")
             recommendations.append("Engage in stress-reducing activities (yoga, walking)")
             recommendations.append("Consider speaking with a mental health professional")
         
         # Sleep recommendations
-        if metrics.get('sleepHours', 8) < 7:
+        if metrics.sleep_hours is not None and metrics.sleep_hours < 7:
             recommendations.append("Establish a consistent sleep schedule")
             recommendations.append("Avoid screens 1 hour before bedtime")
             recommendations.append("Create a relaxing bedtime routine")
         
         # Activity recommendations
-        exercise_freq = user_profile.get('exerciseFrequency', '')
+        exercise_freq = user_profile.exercise_frequency
         if exercise_freq in ['Rarely', 'Never', '']:
             recommendations.append("Start with 30 minutes of moderate exercise 3 times per week")
             recommendations.append("Consider walking, swimming, or cycling")
         
         # Weight management
-        if user_profile.get('weight') and user_profile.get('height'):
-            bmi = user_profile['weight'] / ((user_profile['height'] / 100) ** 2)
-            if bmi > 25:
+        body_mass_index = features.bmi if features is not None else bmi(user_profile.weight, user_profile.height)
+        if body_mass_index is not None:
+            if body_mass_index > 25:
                 recommendations.append("Work with a nutritionist to develop a healthy eating plan")
-            elif bmi < 18.5:
+            elif body_mass_index < 18.5:
                 recommendations.append("Consult with a healthcare provider about healthy weight gain")
         
         return recommendations
     
-    def _identify_problem_areas(self, metrics: Dict) -> List[str]:
+    def _identify_problem_areas(self, metrics: HealthMetrics) -> List[str]:
         """Identify specific health areas needing attention"""
         problem_areas = []
         
-        if metrics.get('heartRate'):
-            hr = metrics['heartRate']
+        if metrics.heart_rate:
+            hr = metrics.heart_rate
             if hr < 60 or hr > 100:
                 problem_areas.append("Cardiovascular Health")
         
-        if metrics.get('bloodPressureSystolic', 0) > 130 or metrics.get('bloodPressureDiastolic', 0) > 85:
+        if (metrics.systolic is not None and metrics.systolic > 130) or \
+                (metrics.diastolic is not None and metrics.diastolic > 85):
             problem_areas.append("Blood Pressure Management")
         
-        if metrics.get('stressLevel', 0) > 6:
+        if metrics.stress_level is not None and metrics.stress_level > 6:
             problem_areas.append("Stress Management")
         
-        if metrics.get('sleepHours', 8) < 6 or metrics.get('sleepHours', 8) > 10:
+        if metrics.sleep_hours is not None and (metrics.sleep_hours < 6 or metrics.sleep_hours > 10):
             problem_areas.append("Sleep Quality")
         
-        if metrics.get('oxygenSaturation', 100) < 95:
+        if metrics.oxygen_saturation is not None and metrics.oxygen_saturation < 95:
             problem_areas.append("Respiratory Function")
         
-        if metrics.get('bloodGlucose'):
-            glucose = metrics['bloodGlucose']
+        if metrics.blood_glucose:
+            glucose = metrics.blood_glucose
             if glucose > 140 or glucose < 70:
                 problem_areas.append("Blood Sugar Regulation")
         
-        if metrics.get('steps', 10000) < 3000:
+        if metrics.steps is not None and metrics.steps < 3000:
             problem_areas.append("Physical Activity Level")
         
         return problem_areas if problem_areas else ["No major areas of concern"]
@@ -0,0 +1,169 @@
+"""
+Opt-in per-request profiling for the ML service (see RequestProfiler).
+
+Flask is imported where a request is handled rather than at the top, like
+serialization.py, so importing this module does not require it.
+"""
+import json
+import os
+import random
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from serialization import json_response
+
+
+class RequestProfiler:
+    """
+    Opt-in per-request cProfile capture for the ML service.
+    A request is profiled when it carries the profiling header with the
+    configured token, or when it is picked by the global sampling rate.
+    """
+
+    HEADER = 'X-Profile-Token'
+    ADMIN_PATH = '/api/admin/profiles'
+
+    def __init__(self, app: Optional['Flask'] = None):
+        self.token = os.getenv('PROFILE_TOKEN', '')
+        self.sample_rate = float(os.getenv('PROFILE_SAMPLE_RATE', '0') or 0)
+        self.directory = os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(__file__), 'profiles'))
+        self.max_profiles = int(os.getenv('PROFILE_MAX_FILES', '50'))
+        self.top_functions = 15
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: 'Flask'):
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule(self.ADMIN_PATH, 'list_profiles', self._list_profiles_view, methods=['GET'])
+
+    def _should_profile(self) -> bool:
+        from flask import request
+
+        if self.token and request.headers.get(self.HEADER) == self.token:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _start(self):
+        # Fast path: nothing configured means nothing to check
+        if not self.token and self.sample_rate <= 0:
+            return None
+        from flask import g, request
+
+        if request.path == self.ADMIN_PATH or not self._should_profile():
+            return None
+
+        # Imported on first use so the service does not pay for it at startup
+        import cProfile
+
+        profiler = cProfile.Profile()
+        g.profiler = profiler
+        g.profile_started = time.perf_counter()
+        profiler.enable()
+        return None
+
+    def _finish(self, response):
+        if not self.token and self.sample_rate <= 0:
+            return response
+        from flask import g, request
+
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - g.pop('profile_started')) * 1000
+        # Request IDs end up in file names, so only keep safe characters
+        request_id = re.sub(r'[^A-Za-z0-9_-]', '', request.headers.get('X-Request-ID', ''))[:64] or uuid.uuid4().hex
+        endpoint = request.endpoint or 'unknown'
+
+        try:
+            self._save(profiler, endpoint, request.path, request_id, elapsed_ms, response.status_code)
+        except OSError:
+            # Profiling must never break the request it is observing
+            pass
+
+        response.headers['X-Profile-ID'] = request_id
+        return response
+
+    def _save(self, profiler, endpoint: str, path: str, request_id: str,
+              elapsed_ms: float, status_code: int):
+        os.makedirs(self.directory, exist_ok=True)
+        # Microsecond stamps keep lexical order equal to capture order
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        base = os.path.join(self.directory, f'{stamp}-{endpoint}-{request_id}')
+
+        profiler.dump_stats(base + '.prof')
+
+        summary = {
+            'requestId': request_id,
+            'endpoint': endpoint,
+            'path': path,
+            'statusCode': status_code,
+            'elapsedMs': round(elapsed_ms, 3),
+            'capturedAt': stamp,
+            'profileFile': os.path.basename(base + '.prof'),
+            'topFunctions': self._top_functions(profiler)
+        }
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        self._enforce_retention()
+
+    def _top_functions(self, profiler) -> List[Dict]:
+        import io
+        import pstats
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                'function': f'{os.path.basename(filename)}:{line}({func})',
+                'calls': ncalls,
+                'totalMs': round(tottime * 1000, 3),
+                'cumulativeMs': round(cumtime * 1000, 3)
+            })
+        rows.sort(key=lambda row: row['cumulativeMs'], reverse=True)
+        return rows[:self.top_functions]
+
+    def _summary_files(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        return sorted(names)
+
+    def _enforce_retention(self):
+        summaries = self._summary_files()
+        excess = len(summaries) - self.max_profiles
+        for name in summaries[:max(0, excess)]:
+            base = os.path.join(self.directory, name[:-len('.json')])
+            for suffix in ('.json', '.prof'):
+                try:
+                    os.remove(base + suffix)
+                except FileNotFoundError:
+                    pass
+
+    def list_profiles(self) -> List[Dict]:
+        """Return stored profile summaries, newest first"""
+        profiles = []
+        for name in reversed(self._summary_files()):
+            try:
+                with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def _list_profiles_view(self):
+        from flask import request
+
+        if not self.token or request.headers.get(self.HEADER) != self.token:
+            return json_response({'success': False, 'error': 'Forbidden'}, 403)
+        return json_response({
+            'success': True,
+            'profiles': self.list_profiles()
+        })
@@ -0,0 +1,219 @@
+"""
+Nightly cohort re-scoring.
+
+Reads metric snapshots as JSON lines, either our own format
+({"userId", "metrics", "userProfile", "previousRiskLevel"}) or a
+`mongoexport --collection healthdatas` dump, where ids are {"$oid": ...}
+and the previous risk is prediction.riskLevel. Snapshots are read in
+chunks, scored across worker processes with HealthPredictor.assess, and
+streamed to a tab-separated output file:
+
+    userId <TAB> healthScore <TAB> riskLevel <TAB> previousRiskLevel
+
+At most `2 x workers` chunks are in flight, so memory is bounded by the chunk
+size rather than the cohort. After each chunk is written a checkpoint
+records the input and output byte offsets and running totals; --resume
+continues from it. A summary with risk-level transitions and throughput is
+written next to the output.
+
+    python rescore.py healthdatas.jsonl --output rescored.tsv [--workers 4] [--resume]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
+CHUNK_LINES = 2000
+RISK_LEVELS = ('Low', 'Moderate', 'High')
+UNKNOWN = 'None'
+
+_predictor = None
+
+
+def _init_worker():
+    global _predictor
+    from prediction_engine import HealthPredictor
+    _predictor = HealthPredictor()
+
+
+def _id(value) -> str:
+    if isinstance(value, dict):
+        value = value.get('$oid', '')
+    return str(value or '')
+
+
+def score_lines(lines: List[bytes]) -> Tuple[bytes, Dict[str, int], int]:
+    """Score one chunk; returns (output bytes, transition counts, bad lines)"""
+    from schemas import ValidationError
+
+    if _predictor is None:
+        _init_worker()
+    out = []
+    transitions: Dict[str, int] = {}
+    bad = 0
+    for line in lines:
+        try:
+            doc = _loads(line)
+            user_id = _id(doc.get('userId') or doc.get('_id'))
+            previous = doc.get('previousRiskLevel') or (doc.get('prediction') or {}).get('riskLevel')
+            score, risk = _predictor.assess(doc.get('metrics') or {}, doc.get('userProfile') or {})
+        except (ValueError, TypeError, AttributeError, ValidationError):
+            bad += 1
+            continue
+        previous = previous if previous in RISK_LEVELS else UNKNOWN
+        out.append(f'{user_id}\t{score}\t{risk}\t{previous}\n')
+        key = f'{previous}->{risk}'
+        transitions[key] = transitions.get(key, 0) + 1
+    return ''.join(out).encode('utf-8'), transitions, bad
+
+
+def read_chunks(path: str, offset: int, chunk_lines: int) -> Iterator[Tuple[List[bytes], int]]:
+    """Yield (non-empty lines, input offset after them)"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        lines = []
+        for line in f:
+            offset += len(line)
+            if line.strip():
+                lines.append(line)
+            if len(lines) >= chunk_lines:
+                yield lines, offset
+                lines = []
+        if lines:
+            yield lines, offset
+
+
+class Checkpoint:
+    """Progress that lets an interrupted run continue where it stopped"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.input_offset = 0
+        self.output_offset = 0
+        self.scored = 0
+        self.bad = 0
+        self.transitions: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'Checkpoint':
+        checkpoint = cls(path)
+        with open(path) as f:
+            data = json.load(f)
+        checkpoint.input_offset = data['inputOffset']
+        checkpoint.output_offset = data['outputOffset']
+        checkpoint.scored = data['scored']
+        checkpoint.bad = data['bad']
+        checkpoint.transitions = data['transitions']
+        return checkpoint
+
+    def add(self, transitions: Dict[str, int], bad: int):
+        for key, count in transitions.items():
+            self.transitions[key] = self.transitions.get(key, 0) + count
+            self.scored += count
+        self.bad += bad
+
+    def save(self):
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'inputOffset': self.input_offset, 'outputOffset': self.output_offset,
+                       'scored': self.scored, 'bad': self.bad, 'transitions': self.transitions}, f)
+        os.replace(tmp, self.path)
+
+
+def run(input_path: str, output_path: str, workers: Optional[int] = None,
+        chunk_lines: int = CHUNK_LINES, resume: bool = False) -> Dict:
+    workers = workers or os.cpu_count() or 1
+    checkpoint_path = f'{output_path}.checkpoint.json'
+    if resume and os.path.exists(checkpoint_path):
+        checkpoint = Checkpoint.load(checkpoint_path)
+    else:
+        checkpoint = Checkpoint(checkpoint_path)
+
+    started = time.perf_counter()
+    scored_before = checkpoint.scored
+    mode = 'r+b' if checkpoint.output_offset and os.path.exists(output_path) else 'wb'
+    with open(output_path, mode) as out:
+        # Anything after the checkpoint was written by a run that did not finish
+        out.seek(checkpoint.output_offset)
+        out.truncate()
+
+        def commit(future, offset):
+            data, transitions, bad = future.result()
+            out.write(data)
+            out.flush()
+            checkpoint.add(transitions, bad)
+            checkpoint.input_offset = offset
+            checkpoint.output_offset = out.tell()
+            checkpoint.save()
+
+        chunks = read_chunks(input_path, checkpoint.input_offset, chunk_lines)
+        if workers == 1:
+            for lines, offset in chunks:
+                commit(_Done(score_lines(lines)), offset)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+                pending = deque()
+                for lines, offset in chunks:
+                    pending.append((pool.submit(score_lines, lines), offset))
+                    # Results are written in input order so the checkpoint offsets stay valid
+                    while len(pending) >= 2 * workers:
+                        commit(*pending.popleft())
+                while pending:
+                    commit(*pending.popleft())
+
+    elapsed = time.perf_counter() - started
+    scored_now = checkpoint.scored - scored_before
+    summary = {
+        'input': input_path,
+        'output': output_path,
+        'workers': workers,
+        'scored': checkpoint.scored,
+        'badLines': checkpoint.bad,
+        'transitions': dict(sorted(checkpoint.transitions.items())),
+        # Users whose previous risk level was known and is now different
+        'changed': sum(count for key, count in checkpoint.transitions.items()
+                       if key.split('->')[0] not in (UNKNOWN, key.split('->')[1])),
+        'seconds': round(elapsed, 3),
+        'snapshotsPerSecond': round(scored_now / elapsed) if elapsed else None
+    }
+    with open(f'{output_path}.summary.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+class _Done:
+    """A completed future, for the single-process path"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Re-score a cohort of health snapshots')
+    parser.add_argument('input', help='JSON lines: our snapshot format or a mongoexport of healthdatas')
+    parser.add_argument('--output', required=True, help='tab-separated results file')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_LINES, help='snapshots per chunk')
+    parser.add_argument('--resume', action='store_true', help='continue from the last checkpoint')
+    args = parser.parse_args(argv)
+
+    summary = run(args.input, args.output, args.workers, args.chunk_size, args.resume)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+Typed request models for the ML endpoints.
+
+Each model is a slotted class whose decoder is generated once, at class
+creation, from its FIELDS table. Decoding coerces and range-checks every
+field in a single pass and collects all problems into one ValidationError,
+which app.py turns into a structured 400 response.
+"""
+from typing import Dict, List, Optional
+
+NUMBER = 'number'
+STRING = 'string'
+STRING_LIST = 'string_list'
+
+
+class ValidationError(ValueError):
+    """Raised when a payload cannot be decoded; carries one entry per bad field"""
+
+    def __init__(self, errors: List[Dict]):
+        super().__init__('; '.join(f"{e['field']}: {e['message']}" for e in errors))
+        self.errors = errors
+
+
+class Field:
+    __slots__ = ('key', 'attr', 'kind', 'default', 'minimum', 'maximum')
+
+    def __init__(self, key: str, attr: str, kind, default=None,
+                 minimum: Optional[float] = None, maximum: Optional[float] = None):
+        self.key = key
+        self.attr = attr
+        # kind is NUMBER, STRING, STRING_LIST or a nested Schema subclass
+        self.kind = kind
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+
+
+def _to_number(value):
+    # Keep ints as ints so engine messages still read "72 bpm", not "72.0 bpm"
+    kind = type(value)
+    if kind is int or kind is float:
+        return value
+    if kind is str:
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            number = float(text)
+            if number != number or number in (float('inf'), float('-inf')):
+                raise ValueError(text)
+            return number
+    raise TypeError(kind.__name__)
+
+
+def _to_string(value):
+    if type(value) is str:
+        return value
+    raise TypeError(type(value).__name__)
+
+
+def _to_string_list(value):
+    if type(value) is not list or any(type(item) is not str for item in value):
+        raise TypeError('expected a list of strings')
+    return value
+
+
+_COERCERS = {NUMBER: _to_number, STRING: _to_string, STRING_LIST: _to_string_list}
+_EXPECTED = {NUMBER: 'a number', STRING: 'a string', STRING_LIST: 'a list of strings'}
+
+
+def _range_message(minimum, maximum):
+    if maximum is None:
+        return f'must be at least {minimum}'
+    if minimum is None:
+        return f'must be at most {maximum}'
+    return f'must be between {minimum} and {maximum}'
+
+
+def _compile_decoder(cls):
+    """
+    Generate a straight-line decoder for cls.FIELDS. Unrolling the field
+    loop avoids per-field attribute lookups and keeps decoding to one pass.
+    """
+    namespace = {'cls': cls, 'new': object.__new__}
+    lines = [
+        'def decode(data, path, errors):',
+        '    obj = new(cls)',
+        '    get = data.get'
+    ]
+    for i, field in enumerate(cls.FIELDS):
+        namespace[f'default_{i}'] = field.default
+        lines.append(f'    value = get({field.key!r})')
+        lines.append('    if value is None:')
+        if isinstance(field.default, list):
+            lines.append(f'        value = list(default_{i})')
+        else:
+            lines.append(f'        value = default_{i}')
+        lines.append('    else:')
+
+        if isinstance(field.kind, type) and issubclass(field.kind, Schema):
+            namespace[f'schema_{i}'] = field.kind
+            lines += [
+                '        if type(value) is dict:',
+                f'            value = schema_{i}._decode(value, path + {field.key + "."!r}, errors)',
+                '        else:',
+                f'            errors.append({{"field": path + {field.key!r}, "message": "must be an object"}})',
+                f'            value = None'
+            ]
+        else:
+            namespace[f'coerce_{i}'] = _COERCERS[field.kind]
+            lines += [
+                '        try:',
+                f'            value = coerce_{i}(value)',
+                '        except (TypeError, ValueError):',
+                f'            errors.append({{"field": path + {field.key!r}, '
+                f'"message": {"must be " + _EXPECTED[field.kind]!r}}})',
+                f'            value = default_{i}'
+            ]
+            bounds = []
+            if field.minimum is not None:
+                bounds.append(f'value < {field.minimum!r}')
+            if field.maximum is not None:
+                bounds.append(f'value > {field.maximum!r}')
+            if bounds:
+                message = _range_message(field.minimum, field.maximum)
+                lines += [
+                    f'        else:',
+                    f'            if {" or ".join(bounds)}:',
+                    f'                errors.append({{"field": path + {field.key!r}, "message": {message!r}}})',
+                    f'                value = default_{i}'
+                ]
+        lines.append(f'    obj.{field.attr} = value')
+    lines.append('    return obj')
+
+    exec('\n'.join(lines), namespace)
+    return namespace['decode']
+
+
+class Schema:
+    """Base class: subclasses declare FIELDS and matching __slots__"""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._decode = staticmethod(_compile_decoder(cls))
+
+    @classmethod
+    def from_dict(cls, data) -> 'Schema':
+        if not isinstance(data, dict):
+            raise ValidationError([{'field': '', 'message': 'request body must be a JSON object'}])
+        errors = []
+        obj = cls._decode(data, '', errors)
+        if errors:
+            raise ValidationError(errors)
+        return obj
+
+    def to_dict(self) -> Dict:
+        result = {}
+        for field in self.FIELDS:
+            value = getattr(self, field.attr)
+            result[field.key] = value.to_dict() if isinstance(value, Schema) else value
+        return result
+
+    def __repr__(self):
+        fields = ', '.join(f'{f.attr}={getattr(self, f.attr)!r}' for f in self.FIELDS)
+        return f'{type(self).__name__}({fields})'
+
+
+class HealthMetrics(Schema):
+    """A metrics snapshot; missing readings are None"""
+
+    __slots__ = ('heart_rate', 'systolic', 'diastolic', 'oxygen_saturation', 'temperature',
+                 'stress_level', 'blood_glucose', 'sleep_hours', 'steps', 'calories_burned', 'weight')
+    FIELDS = (
+        Field('heartRate', 'heart_rate', NUMBER, None, 0, 300),
+        Field('bloodPressureSystolic', 'systolic', NUMBER, None, 0, 300),
+        Field('bloodPressureDiastolic', 'diastolic', NUMBER, None, 0, 200),
+        Field('oxygenSaturation', 'oxygen_saturation', NUMBER, None, 0, 100),
+        Field('temperature', 'temperature', NUMBER, None, 20, 45),
+        Field('stressLevel', 'stress_level', NUMBER, None, 0, 10),
+        Field('bloodGlucose', 'blood_glucose', NUMBER, None, 0, 1000),
+        Field('sleepHours', 'sleep_hours', NUMBER, None, 0, 24),
+        Field('steps', 'steps', NUMBER, None, 0, 200000),
+        Field('caloriesBurned', 'calories_burned', NUMBER, None, 0, 20000),
+        Field('weight', 'weight', NUMBER, None, 0, 500)
+    )
+
+
+class UserProfile(Schema):
+    """Profile fields the health predictor uses"""
+
+    __slots__ = ('age', 'gender', 'weight', 'height', 'occupation', 'exercise_frequency', 'sleep_hours')
+    FIELDS = (
+        Field('age', 'age', NUMBER, 30, 0, 130),
+        Field('gender', 'gender', STRING, ''),
+        Field('weight', 'weight', NUMBER, None, 0, 500),
+        Field('height', 'height', NUMBER, None, 0, 300),
+        Field('occupation', 'occupation', STRING, ''),
+        Field('exerciseFrequency', 'exercise_frequency', STRING, ''),
+        Field('sleepHours', 'sleep_hours', NUMBER, None, 0, 24)
+    )
+
+
+class PredictionRequest(Schema):
+    """Body of POST /api/predict"""
+
+    __slots__ = ('metrics', 'user_profile', 'user_id', 'profile_version')
+    FIELDS = (
+        Field('metrics', 'metrics', HealthMetrics),
+        Field('userProfile', 'user_profile', UserProfile),
+        Field('userId', 'user_id', STRING),
+        Field('profileVersion', 'profile_version', NUMBER)
+    )
+
+    @classmethod
+    def from_dict(cls, data) -> 'PredictionRequest':
+        obj = super().from_dict(data)
+        # Absent sections decode to empty models rather than None
+        if obj.metrics is None:
+            obj.metrics = HealthMetrics.from_dict({})
+        if obj.user_profile is None:
+            obj.user_profile = UserProfile.from_dict({})
+        return obj
+
+
+class NutritionRequest(Schema):
+    """Body of POST /api/nutrition; defaults stand in for fields the profile lacks"""
+
+    __slots__ = ('occupation', 'gender', 'age', 'weight', 'height', 'stress_level',
+                 'heart_rate', 'exercise_frequency', 'diet_type', 'health_conditions',
+                 'user_id', 'profile_version')
+    FIELDS = (
+        Field('occupation', 'occupation', STRING, 'Other'),
+        Field('gender', 'gender', STRING, 'Other'),
+        Field('age', 'age', NUMBER, 30, 0, 130),
+        Field('weight', 'weight', NUMBER, 70, 0, 500),
+        Field('height', 'height', NUMBER, 170, 0, 300),
+        Field('stressLevel', 'stress_level', NUMBER, 5, 0, 10),
+        Field('heartRate', 'heart_rate', NUMBER, 75, 0, 300),
+        Field('exerciseFrequency', 'exercise_frequency', STRING, ''),
+        Field('dietType', 'diet_type', STRING, 'Non-Vegetarian'),
+        Field('healthConditions', 'health_conditions', STRING_LIST, []),
+        Field('userId', 'user_id', STRING),
+        Field('profileVersion', 'profile_version', NUMBER)
+    )
+
+
+class TrendQuery(Schema):
+    """Query string of GET /api/trends (start/end are epoch seconds, window is in seconds)"""
+
+    __slots__ = ('user_id', 'metric', 'start', 'end', 'width', 'method', 'window')
+    FIELDS = (
+        Field('userId', 'user_id', STRING),
+        Field('metric', 'metric', STRING, 'heartRate'),
+        Field('start', 'start', NUMBER, None, 0),
+        Field('end', 'end', NUMBER, None, 0),
+        Field('width', 'width', NUMBER, 800, 10, 5000),
+        Field('method', 'method', STRING, 'lttb'),
+        Field('window', 'window', NUMBER, 3600, 60, 30 * 86400)
+    )
+
+
+class HistoryQuery(Schema):
+    """Query string of GET /api/history (since is epoch seconds, exclusive)"""
+
+    __slots__ = ('user_id', 'metric', 'since', 'limit')
+    FIELDS = (
+        Field('userId', 'user_id', STRING),
+        Field('metric', 'metric', STRING, 'heartRate'),
+        Field('since', 'since', NUMBER, None, 0),
+        Field('limit', 'limit', NUMBER, 100000, 1, 500000)
+    )
@@ -0,0 +1,221 @@
+"""
+Response serialization for the ML service.
+
+Uses orjson when it is installed and falls back to the standard library.
+Values the engines mark as static (StaticList, StaticDict, CatalogItem) are
+encoded once and their bytes spliced into every later response, so the meal
+catalog, hydration tips and advice text are not re-encoded per request.
+Responses are gzip/brotli compressed when the client accepts it.
+
+Flask is only imported by json_response, so the engines (which mark their
+static values with these types) also import in the Streamlit app, where
+Flask is not installed.
+"""
+import importlib.util
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# brotli is only imported when a client first asks for it
+HAS_BROTLI = importlib.util.find_spec('brotli') is not None
+
+MIN_COMPRESS_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '1'))
+BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '1'))
+MAX_ITEM_VARIANTS = 512
+
+
+class StaticList(list):
+    """A list the engines never mutate after construction; encoded once"""
+
+    __slots__ = ('_json',)
+
+
+class StaticDict(dict):
+    """A dict the engines never mutate after construction; encoded once"""
+
+    __slots__ = ('_json', '_variants')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._variants = None
+
+
+class CatalogItem(dict):
+    """
+    A static catalog entry plus a few per-response values (e.g. calories).
+    Behaves like a plain dict; when serialized, the static part's cached
+    bytes are reused and only the extra values are encoded.
+    """
+
+    __slots__ = ('base', 'extra')
+
+    def __init__(self, base: StaticDict, **extra):
+        super().__init__(base)
+        self.update(extra)
+        self.base = base
+        self.extra = extra
+
+
+_STATIC_TYPES = (StaticList, StaticDict)
+_MARKER = re.compile(rb'"\\u0000(\d+)\\u0000"')
+
+
+class JSONSerializer:
+    """Encodes response payloads to bytes with the best available encoder"""
+
+    def __init__(self, encoder: Optional[str] = None, use_fragments: Optional[bool] = None):
+        encoder = encoder or os.getenv('JSON_ENCODER') or ('orjson' if orjson else 'json')
+        if encoder == 'orjson' and orjson is None:
+            encoder = 'json'
+        if use_fragments is None:
+            setting = os.getenv('JSON_FRAGMENTS', '')
+            # orjson encodes the whole payload faster than it can call back for
+            # fragments (see benchmarks/bench_serialization.py), so splicing is
+            # only on by default for the standard-library encoder.
+            use_fragments = setting == '1' if setting else encoder == 'json'
+        self.encoder = encoder
+        self.use_fragments = use_fragments
+        self._native_fragments = encoder == 'orjson' and hasattr(orjson, 'Fragment')
+
+    # -- plain encoding -------------------------------------------------
+
+    def _encode_plain(self, obj) -> bytes:
+        if self.encoder == 'orjson':
+            return orjson.dumps(obj, default=self._orjson_plain_default)
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def _orjson_plain_default(obj):
+        if isinstance(obj, dict):
+            return dict(obj)
+        if isinstance(obj, (list, tuple)):
+            return list(obj)
+        raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+    # -- fragments ------------------------------------------------------
+
+    def _static_bytes(self, obj) -> bytes:
+        try:
+            return obj._json
+        except AttributeError:
+            obj._json = self._encode_plain(obj)
+            return obj._json
+
+    def _item_bytes(self, item: CatalogItem) -> bytes:
+        static = self._static_bytes(item.base)
+        if not item.extra:
+            return static
+        # Per-response values repeat a lot (a few calorie targets), so cache the spliced result
+        key = tuple(item.extra.items())
+        cache = item.base._variants
+        if cache is None:
+            cache = item.base._variants = {}
+        data = cache.get(key)
+        if data is None:
+            extra = self._encode_plain(item.extra)
+            data = extra if static == b'{}' else static[:-1] + b',' + extra[1:]
+            if len(cache) < MAX_ITEM_VARIANTS:
+                cache[key] = data
+        return data
+
+    def _fragment_bytes(self, obj) -> Optional[bytes]:
+        kind = type(obj)
+        if kind is CatalogItem:
+            return self._item_bytes(obj)
+        if kind in _STATIC_TYPES:
+            return self._static_bytes(obj)
+        return None
+
+    def _orjson_fragment_default(self, obj):
+        data = self._fragment_bytes(obj)
+        if data is not None:
+            return orjson.Fragment(data)
+        return self._orjson_plain_default(obj)
+
+    def _substitute(self, obj, fragments: List[bytes]):
+        """Swap static values for marker strings (encoders without fragment support)"""
+        kind = type(obj)
+        if kind is str or kind is int or kind is float or kind is bool or obj is None:
+            return obj
+        if kind is dict:
+            return {key: self._substitute(value, fragments) for key, value in obj.items()}
+        if kind is list:
+            return [self._substitute(value, fragments) for value in obj]
+        data = self._fragment_bytes(obj)
+        if data is not None:
+            fragments.append(data)
+            return f'\x00{len(fragments) - 1}\x00'
+        if isinstance(obj, dict):
+            return {key: self._substitute(value, fragments) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [self._substitute(value, fragments) for value in obj]
+        return obj
+
+    # -- public ---------------------------------------------------------
+
+    def dumps(self, obj) -> bytes:
+        if not self.use_fragments:
+            return self._encode_plain(obj)
+        if self._native_fragments:
+            return orjson.dumps(obj, default=self._orjson_fragment_default,
+                                option=orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+        fragments = []
+        body = self._encode_plain(self._substitute(obj, fragments))
+        if not fragments:
+            return body
+
+        def splice(match):
+            index = int(match.group(1))
+            return fragments[index] if index < len(fragments) else match.group(0)
+
+        body, count = _MARKER.subn(splice, body)
+        if count != len(fragments):
+            # A string in the payload looks like a marker and was spliced too; encode without fragments
+            return self._encode_plain(obj)
+        return body
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',') if part.strip()}
+    if HAS_BROTLI and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == 'br':
+        import brotli
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        import gzip
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+serializer = JSONSerializer()
+
+
+def json_response(payload: Dict, status: int = 200) -> 'Response':
+    """Drop-in for `jsonify` that uses the fast serializer and compression"""
+    from flask import Response, request
+
+    body = serializer.dumps(payload)
+    response = Response(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding:
+            response.set_data(compress(body, encoding))
+            response.headers['Content-Encoding'] = encoding
+    return response
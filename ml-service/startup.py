@@ -0,0 +1,182 @@
+"""
+Engine lifecycle for the ML service.
+
+In fast-start mode (FAST_START=1, meant for scale-to-zero hosts) the engines
+are restored from a pickled startup snapshot on a background thread while the
+server binds its port; requests that arrive first wait for them. Otherwise the
+engines are built synchronously at import time, as before.
+
+The metric history stores and the forecaster need NumPy, so in fast-start
+mode they are built by the first request that uses them instead.
+"""
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+
+from features import FeatureStore
+from nutrition_engine import NutritionRecommender
+from prediction_engine import HealthPredictor
+
+SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(SERVICE_DIR, '.cache'))
+# Any change to these files invalidates the snapshot
+SNAPSHOT_SOURCES = ('prediction_engine.py', 'nutrition_engine.py', 'serialization.py', 'schemas.py')
+
+
+def fast_start_enabled() -> bool:
+    return os.getenv('FAST_START', '0') == '1'
+
+
+def _snapshot_path() -> str:
+    digest = hashlib.sha256(sys.version.encode('utf-8'))
+    for name in SNAPSHOT_SOURCES:
+        with open(os.path.join(SERVICE_DIR, name), 'rb') as f:
+            digest.update(f.read())
+    return os.path.join(SNAPSHOT_DIR, f'engines-{digest.hexdigest()[:16]}.pickle')
+
+
+class EngineRegistry:
+    """Owns the engine instances and knows how to build, snapshot and warm them"""
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self._predictor = None
+        self._recommender = None
+        self._features = None
+        self.loaded_from_snapshot = False
+        self.load_seconds = None
+
+    @property
+    def predictor(self) -> HealthPredictor:
+        self._ready.wait()
+        return self._predictor
+
+    @property
+    def recommender(self) -> NutritionRecommender:
+        self._ready.wait()
+        return self._recommender
+
+    @property
+    def features(self) -> FeatureStore:
+        """Profile-derived features shared by both engines (never snapshotted)"""
+        self._ready.wait()
+        return self._features
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def load(self, use_snapshot: bool = False):
+        started = time.perf_counter()
+        engines = self._read_snapshot() if use_snapshot else None
+        if engines is None:
+            engines = (HealthPredictor(), NutritionRecommender())
+            if use_snapshot:
+                self._prime(*engines)
+                self._write_snapshot(engines)
+        else:
+            self.loaded_from_snapshot = True
+        self._predictor, self._recommender = engines
+        self._features = FeatureStore(self._recommender.occupation_profiles)
+        self.load_seconds = time.perf_counter() - started
+        self._ready.set()
+
+    def load_in_background(self):
+        """Restore engines from the snapshot and warm them without blocking startup"""
+        def run():
+            self.load(use_snapshot=True)
+            self._prime(self._predictor, self._recommender)
+
+        threading.Thread(target=run, name='engine-warmup', daemon=True).start()
+
+    @staticmethod
+    def _prime(predictor: HealthPredictor, recommender: NutritionRecommender):
+        # Exercise the code paths once so first-request work (decoder setup,
+        # encoded catalog fragments) is done before a real request needs it
+        from serialization import serializer
+
+        predictor.predict({'heartRate': 72}, {'age': 30})
+        serializer.dumps(recommender.generate_recommendations({'occupation': 'Other'}))
+
+    def _read_snapshot(self):
+        try:
+            with open(_snapshot_path(), 'rb') as f:
+                return pickle.loads(f.read())
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def _write_snapshot(self, engines):
+        path = _snapshot_path()
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            for stale in glob.glob(os.path.join(SNAPSHOT_DIR, 'engines-*.pickle')):
+                if stale != path:
+                    os.remove(stale)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(pickle.dumps(engines, protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+class DataStores:
+    """The history stores, the ingestor and the forecaster, built together on first use"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._history = None
+        self._archive = None
+        self._ingestor = None
+        self._forecasts = None
+
+    def load(self):
+        """Build the stores now (once; later calls return straight away)"""
+        if self._forecasts is not None:
+            return
+        with self._lock:
+            if self._forecasts is not None:
+                return
+            # Imported here: these modules pull in NumPy
+            from columnar import ColumnarHistory
+            from forecasting import ForecastService
+            from ingest import Ingestor
+            from timeseries import TimeSeriesStore
+
+            # Recent readings per user, fed by /api/predict and /api/ingest
+            self._history = TimeSeriesStore()
+            # Per-minute aggregates from /api/ingest
+            self._archive = ColumnarHistory()
+            self._archive.start_compactor()
+            self._ingestor = Ingestor(self._archive, self._history)
+            # Writes the last minute of series that stop sending, without waiting for another request
+            self._ingestor.aggregator.start_flusher()
+            # 7-day Holt projections, refit nightly by `python forecasting.py --nightly`;
+            # the sync thread saves incremental state and picks up the nightly models
+            forecasts = ForecastService(self._archive, self._history)
+            forecasts.start_sync()
+            self._forecasts = forecasts
+
+    @property
+    def history(self):
+        self.load()
+        return self._history
+
+    @property
+    def archive(self):
+        self.load()
+        return self._archive
+
+    @property
+    def ingestor(self):
+        self.load()
+        return self._ingestor
+
+    @property
+    def forecasts(self):
+        self.load()
+        return self._forecasts
@@ -0,0 +1,55 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from columnar import SECONDS_PER_DAY, ColumnarHistory
+
+START = 1_704_067_200  # midnight UTC
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / 'history')
+
+
+def test_append_and_scan_across_days(root):
+    archive = ColumnarHistory(root)
+    times = START + np.arange(0, 3 * SECONDS_PER_DAY, 3600)
+    archive.append('u1', 'heartRate', times, np.arange(len(times)))
+    assert len(glob.glob(os.path.join(root, 'u1', 'heartRate', '*.ts'))) == 3
+    scanned_times, values = archive.scan('u1', 'heartRate', START + 3600, START + 3 * 3600)
+    assert scanned_times.tolist() == [START + 3600, START + 7200, START + 10800]
+    assert values.tolist() == [1, 2, 3]
+    assert archive.last('u1', 'heartRate') == times[-1]
+    with pytest.raises(ValueError):
+        archive.append('u1', 'heartRate', [START], [0])
+
+
+def test_a_torn_write_is_repaired_on_load(root):
+    ColumnarHistory(root).append('u1', 'weight', [START, START + 60], [80, 81])
+    [ts] = glob.glob(os.path.join(root, 'u1', 'weight', '*.ts'))
+    with open(ts[:-3] + '.val', 'ab') as f:
+        f.write(np.float32(82).tobytes())
+    assert ColumnarHistory(root).scan('u1', 'weight')[1].tolist() == [80, 81]
+    assert os.path.getsize(ts[:-3] + '.val') == 8
+
+
+def test_read_only_never_touches_the_files(root):
+    ColumnarHistory(root).append('u1', 'weight', [START, START + 60], [80, 81])
+    directory = os.path.join(root, 'u1', 'weight')
+    [ts] = glob.glob(os.path.join(directory, '*.ts'))
+    # An append in progress in the service, and a compaction's temporary output
+    with open(ts[:-3] + '.val', 'ab') as f:
+        f.write(np.float32(82).tobytes())
+    with open(os.path.join(directory, 'seg-0000000000-g1.ts.tmp'), 'wb') as f:
+        f.write(b'partial')
+    before = {path: os.path.getsize(path) for path in glob.glob(os.path.join(directory, '*'))}
+
+    reader = ColumnarHistory(root, read_only=True)
+    assert reader.scan('u1', 'weight')[1].tolist() == [80, 81]
+    assert reader.compact() == 0
+    with pytest.raises(ValueError):
+        reader.append('u1', 'weight', [START + 120], [83])
+    assert {path: os.path.getsize(path) for path in glob.glob(os.path.join(directory, '*'))} == before
@@ -0,0 +1,60 @@
+import pytest
+
+from features import FeatureStore
+from fingerprint import fingerprint
+from nutrition_engine import NutritionRecommender
+from prediction_engine import HealthPredictor
+from schemas import NutritionRequest, PredictionRequest
+
+NUTRITIONIST = 'Work with a nutritionist to develop a healthy eating plan'
+
+
+@pytest.fixture(scope='module')
+def engines():
+    return HealthPredictor(), NutritionRecommender()
+
+
+@pytest.fixture
+def store(engines):
+    return FeatureStore(engines[1].occupation_profiles)
+
+
+def predict_request(version=1):
+    return PredictionRequest.from_dict({'userId': 'u9', 'profileVersion': version,
+                                        'metrics': {'heartRate': 72}, 'userProfile': {'height': 150}})
+
+
+def test_nutrition_defaults_never_reach_predictions(engines, store):
+    predictor, recommender = engines
+    nutrition = NutritionRequest.from_dict({'userId': 'u9', 'profileVersion': 1, 'height': 150})
+    recommender.generate_recommendations(nutrition, store.get('u9', 1, nutrition))
+
+    payload = predict_request()
+    features = store.get('u9', 1, payload.user_profile)
+    # The profile has no weight, so there is no BMI, whatever /api/nutrition assumed
+    assert features.bmi is None
+    assert NUTRITIONIST not in predictor.predict(payload.metrics, payload.user_profile, features)['recommendations']
+    assert fingerprint(payload.metrics, payload.user_profile, predictor.normal_ranges, features) == \
+        fingerprint(payload.metrics, payload.user_profile, predictor.normal_ranges)
+
+
+def test_entries_are_reused_per_version_and_kind(store):
+    profile = predict_request().user_profile
+    first = store.get('u9', 1, profile)
+    assert store.get('u9', 1, profile) is first
+    assert store.get('u9', 2, profile) is not first
+    assert store.stats()['hits'] == 1 and store.stats()['misses'] == 2
+
+
+def test_requests_without_a_version_are_not_cached(store):
+    profile = predict_request(version=None).user_profile
+    assert store.get('u9', None, profile) is not store.get('u9', None, profile)
+    assert store.stats()['entries'] == 0
+
+
+def test_invalidate_drops_every_kind(store):
+    store.get('u9', 1, predict_request().user_profile)
+    store.get('u9', 1, NutritionRequest.from_dict({}))
+    assert store.invalidate('u9')
+    assert store.stats()['entries'] == 0
+    assert not store.invalidate('u9')
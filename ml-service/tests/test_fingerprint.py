@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from fingerprint import IN_RANGE, PredictionCache, fingerprint
+from prediction_engine import HealthPredictor
+from schemas import HealthMetrics, UserProfile
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    return HealthPredictor()
+
+
+def random_inputs(rng):
+    # Values cluster around the thresholds, inside and outside the normal ranges
+    metrics = {
+        'heartRate': rng.choice([None, 59, 60, 72, 100, 101, 101.0]),
+        'bloodPressureSystolic': rng.choice([None, 110, 119.5, 121]),
+        'bloodPressureDiastolic': rng.choice([None, 70, 85]),
+        'oxygenSaturation': rng.choice([None, 94, 97, 99]),
+        'bloodGlucose': rng.choice([None, 90, 150]),
+        'sleepHours': rng.choice([None, 5, 7, 8.5]),
+        'stressLevel': rng.choice([None, 2, 7, 7.0]),
+        'steps': rng.choice([None, 1000, 2999, 3000, 12000]),
+        'temperature': rng.choice([None, 36.6, 38.5]),
+        'weight': rng.choice([None, 60, 90])
+    }
+    profile = {
+        'age': rng.choice([30, 50, 51, 70]),
+        'weight': rng.choice([None, 50, 70, 110]),
+        'height': rng.choice([None, 170, 180]),
+        'exerciseFrequency': rng.choice(['', 'Rarely', 'Daily', '3-4 times a week'])
+    }
+    return metrics, profile
+
+
+def equivalent(rng, metrics, profile, ranges):
+    """The same inputs, moved only in ways the fingerprint ignores"""
+    metrics, profile = dict(metrics), dict(profile)
+    for key in ('heartRate', 'bloodPressureSystolic', 'bloodPressureDiastolic', 'oxygenSaturation',
+                'bloodGlucose', 'sleepHours'):
+        low, high = ranges[key]
+        if metrics[key] is not None and low <= metrics[key] <= high:
+            metrics[key] = rng.choice([low, high, round(rng.uniform(low, high), 1)])
+    if metrics['steps'] is not None:
+        metrics['steps'] = rng.randrange(0, 3000) if metrics['steps'] < 3000 else rng.randrange(3000, 30000)
+    metrics['temperature'] = rng.choice([None, 35.0, 40.0])
+    metrics['caloriesBurned'] = rng.choice([None, 1800])
+    metrics['weight'] = rng.choice([None, 120])
+    profile['gender'] = rng.choice(['', 'Female'])
+    profile['occupation'] = rng.choice(['', 'Engineer'])
+    return metrics, profile
+
+
+def test_same_fingerprint_same_prediction(predictor):
+    rng = random.Random(39)
+    for _ in range(500):
+        metrics, profile = random_inputs(rng)
+        other_metrics, other_profile = equivalent(rng, metrics, profile, predictor.normal_ranges)
+        a = HealthMetrics.from_dict(metrics), UserProfile.from_dict(profile)
+        b = HealthMetrics.from_dict(other_metrics), UserProfile.from_dict(other_profile)
+
+        assert fingerprint(*a, predictor.normal_ranges) == fingerprint(*b, predictor.normal_ranges)
+        assert predictor.predict(*a) == predictor.predict(*b), (metrics, other_metrics)
+
+
+def test_fingerprint_is_not_coarser_than_the_prediction(predictor):
+    rng = random.Random(40)
+    shared = 0
+    for _ in range(2000):
+        metrics, profile = random_inputs(rng)
+        # Redraw one input from scratch: sometimes it crosses a threshold, sometimes not
+        fresh_metrics, fresh_profile = random_inputs(rng)
+        other_metrics, other_profile = dict(metrics), dict(profile)
+        if rng.random() < 0.5:
+            key = rng.choice(list(metrics))
+            other_metrics[key] = fresh_metrics[key]
+        else:
+            key = rng.choice(list(profile))
+            other_profile[key] = fresh_profile[key]
+        a = HealthMetrics.from_dict(metrics), UserProfile.from_dict(profile)
+        b = HealthMetrics.from_dict(other_metrics), UserProfile.from_dict(other_profile)
+
+        if fingerprint(*a, predictor.normal_ranges) == fingerprint(*b, predictor.normal_ranges):
+            shared += 1
+            assert predictor.predict(*a) == predictor.predict(*b), (key, metrics, other_metrics, profile, other_profile)
+    assert shared > 500
+
+
+def test_a_changed_fingerprint_comes_from_a_changed_input(predictor):
+    profile = UserProfile.from_dict({})
+    base = fingerprint(HealthMetrics.from_dict({'steps': 3000}), profile, predictor.normal_ranges)
+
+    assert fingerprint(HealthMetrics.from_dict({'steps': 2999}), profile, predictor.normal_ranges) != base
+    assert fingerprint(HealthMetrics.from_dict({'steps': 3000, 'stressLevel': 3}), profile,
+                       predictor.normal_ranges) != base
+    assert fingerprint(HealthMetrics.from_dict({'steps': 3000}), UserProfile.from_dict({'age': 51}),
+                       predictor.normal_ranges) != base
+
+
+def test_values_inside_the_normal_range_band_together(predictor):
+    profile = UserProfile.from_dict({})
+    low = fingerprint(HealthMetrics.from_dict({'heartRate': 61}), profile, predictor.normal_ranges)
+    high = fingerprint(HealthMetrics.from_dict({'heartRate': 99.5}), profile, predictor.normal_ranges)
+    outside = fingerprint(HealthMetrics.from_dict({'heartRate': 101}), profile, predictor.normal_ranges)
+
+    assert low == high
+    assert low[0] == IN_RANGE
+    assert outside[0] == 101
+
+
+def test_cache_reuses_a_prediction_until_an_input_crosses_a_threshold(predictor):
+    cache = PredictionCache()
+    profile = UserProfile.from_dict({'age': 40})
+
+    first, cached = cache.predict(predictor, 'u1', HealthMetrics.from_dict({'heartRate': 70, 'steps': 5000}), profile)
+    assert not cached
+    again, cached = cache.predict(predictor, 'u1', HealthMetrics.from_dict({'heartRate': 80, 'steps': 9000}), profile)
+    assert cached and again is first
+    _, cached = cache.predict(predictor, 'u1', HealthMetrics.from_dict({'heartRate': 80, 'steps': 2000}), profile)
+    assert not cached
+
+    cache.invalidate('u1')
+    _, cached = cache.predict(predictor, 'u1', HealthMetrics.from_dict({'heartRate': 80, 'steps': 2000}), profile)
+    assert not cached
+    assert cache.stats()['hits'] == 1
+
+
+def test_least_recently_used_user_is_evicted(predictor):
+    cache = PredictionCache(max_users=2)
+    metrics, profile = HealthMetrics.from_dict({'heartRate': 70}), UserProfile.from_dict({})
+    for user_id in ('a', 'b', 'a', 'c'):
+        cache.predict(predictor, user_id, metrics, profile)
+
+    assert cache.predict(predictor, 'a', metrics, profile)[1]
+    assert not cache.predict(predictor, 'b', metrics, profile)[1]
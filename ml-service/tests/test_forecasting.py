@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pytest
+
+from columnar import ColumnarHistory
+from forecasting import SECONDS_PER_DAY, ForecastService, HoltModels
+from schemas import HealthMetrics
+
+TODAY = 19_700  # 2023-12-09
+NOON = TODAY * SECONDS_PER_DAY + 43_200
+
+
+def weight(value):
+    return HealthMetrics.from_dict({'weight': value})
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / 'forecasts')
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ColumnarHistory(str(tmp_path / 'history'))
+
+
+def test_fit_recovers_a_linear_trend():
+    models = HoltModels('weight')
+    models.fit(['u1'], [80 - 0.1 * np.arange(30)], TODAY - 1)
+    projection = models.forecast(np.array([0]), 3, TODAY)
+    assert projection['days'].tolist() == [[TODAY, TODAY + 1, TODAY + 2]]
+    assert projection['mean'][0] == pytest.approx([77.0, 76.9, 76.8], abs=0.01)
+
+
+def test_forecasts_start_after_the_day_the_state_is_as_of():
+    models = HoltModels('weight')
+    models.fit(['u1'], [[80.0, 80.0, 80.0]], TODAY - 5)
+    # Days since the state are skipped: the first forecast is for today
+    assert models.forecast(np.array([0]), 2, TODAY)['days'].tolist() == [[TODAY, TODAY + 1]]
+    assert models.forecast(np.array([0]), 2)['days'].tolist() == [[TODAY - 4, TODAY - 3]]
+
+
+def test_update_advances_the_trend_over_missing_days_and_skips_covered_ones():
+    models = HoltModels('weight')
+    models.fit(['u1'], [[80.0, 81.0, 82.0, 83.0]], TODAY - 3)
+    trend = models.trend[0]
+    models.update(['u1'], [models.level[0] + 3 * trend], TODAY)
+    assert models.day[0] == TODAY
+    # Exactly on the projected value: no error, so the trend is unchanged
+    assert models.trend[0] == pytest.approx(trend)
+    before = models.level.copy()
+    models.update(['u1'], [0.0], TODAY)
+    assert models.level.tolist() == before.tolist()
+
+
+def test_merge_keeps_the_newer_state():
+    ours, theirs = HoltModels('weight'), HoltModels('weight')
+    ours.fit(['a', 'b'], [[70.0, 70.0], [90.0, 90.0]], TODAY - 1)
+    ours.update(['b'], [91.0], TODAY)
+    theirs.fit(['a', 'b', 'c'], [[71.0, 71.0], [80.0, 80.0], [60.0, 60.0]], TODAY - 1)
+    ours.merge(theirs)
+    assert ours.level[[ours.rows[u] for u in 'abc']].tolist() == pytest.approx([71.0, 90.1, 60.0], abs=0.5)
+    assert ours.day[ours.rows['b']] == TODAY
+
+
+def test_incremental_state_survives_a_restart(archive, directory):
+    service = ForecastService(archive, directory=directory)
+    service.observe('u1', weight(80), NOON - SECONDS_PER_DAY)
+    service.observe('u1', weight(81), NOON)
+    service.save()
+
+    restarted = ForecastService(archive, directory=directory)
+    models = restarted.models['weight']
+    assert models.day[models.rows['u1']] == TODAY - 1
+    # Today's open day came back too, so tomorrow's reading closes it
+    restarted.observe('u1', weight(90), NOON + SECONDS_PER_DAY)
+    assert models.day[models.rows['u1']] == TODAY
+    assert restarted.forecast('u1', 1, NOON + SECONDS_PER_DAY)['weight'][0]['date'] == '2023-12-10'
+
+
+def test_a_running_service_picks_up_a_nightly_run(archive, directory):
+    service = ForecastService(archive, directory=directory)
+    service.observe('live', weight(70), NOON)
+    assert service.forecast('stored', now=NOON) == {}
+
+    days = np.arange(TODAY - 20, TODAY)
+    archive.append('stored', 'weight_mean', days * SECONDS_PER_DAY + 600, 75 + 0.1 * (days - days[0]))
+    nightly = ForecastService(ColumnarHistory(archive.root, read_only=True), directory=directory)
+    assert nightly.nightly(now=NOON)['users'] == 1
+
+    service.sync()
+    forecast = service.forecast('stored', 2, NOON)['weight']
+    assert [day['date'] for day in forecast] == ['2023-12-09', '2023-12-10']
+    assert forecast[0]['mean'] == pytest.approx(77.0, abs=0.1)
+    assert os.path.exists(os.path.join(directory, 'open-days.json'))
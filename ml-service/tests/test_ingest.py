@@ -0,0 +1,173 @@
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import ingest
+from columnar import ColumnarHistory
+from ingest import RECORD_DTYPE, Batch, Ingestor, ParseStats, parse_ndjson
+from timeseries import METRIC_INDEX, TimeSeriesStore
+
+START = 1_704_067_200  # a minute boundary
+
+
+def ndjson(*lines):
+    return io.BytesIO('\n'.join(lines).encode('utf-8'))
+
+
+def parse(body, user=None):
+    stats = ParseStats()
+    batches = list(parse_ndjson(body, stats, user))
+    return stats, batches
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ColumnarHistory(str(tmp_path / 'history'))
+
+
+def test_ndjson_lines_become_one_reading_per_metric():
+    stats, [batch] = parse(ndjson(f'{{"userId": "u1", "timestamp": {START}, "heartRate": 72, "steps": 10}}',
+                                  '',
+                                  f'{{"userId": "u2", "timestamp": {START + 5}, "heartRate": 80.5}}'))
+    assert (stats.readings, stats.rejected) == (3, 0)
+    assert batch.users == ['u1', 'u2']
+    assert sorted(zip(batch.user.tolist(), batch.metric.tolist(), batch.value.tolist())) == [
+        (0, METRIC_INDEX['heartRate'], 72), (0, METRIC_INDEX['steps'], 10), (1, METRIC_INDEX['heartRate'], 80.5)]
+
+
+def test_every_bad_line_is_rejected_with_an_error():
+    stats, batches = parse(ndjson('not json',
+                                  '{"userId": "u1", "heartRate": 72}',
+                                  f'{{"timestamp": {START}, "heartRate": 72}}',
+                                  f'{{"userId": "u1", "timestamp": {START}, "heartRate": "72"}}',
+                                  f'{{"userId": "u1", "timestamp": {START}, "metric": "heartRate", "value": 72}}'))
+    assert batches == []
+    assert stats.readings == 0
+    assert stats.rejected == 5
+    assert [error['field'] for error in stats.errors] == [f'line {n}' for n in range(1, 6)]
+    assert stats.errors[-1]['message'].startswith('no known metric')
+
+
+def test_query_user_overrides_the_lines():
+    _, [batch] = parse(ndjson(f'{{"userId": "u1", "timestamp": {START}, "heartRate": 72}}'), user='u9')
+    assert batch.users == ['u9']
+
+
+def test_ingest_aggregates_per_minute(archive):
+    history = TimeSeriesStore(capacity=8)
+    ingestor = Ingestor(archive, history)
+    lines = [f'{{"userId": "u1", "timestamp": {START + s}, "heartRate": {60 + s}}}' for s in (0, 30, 60)]
+    result = ingestor.ingest(ndjson(*lines), 'application/x-ndjson')
+    assert (result['accepted'], result['late'], result['rejected']) == (3, 0, 0)
+    # Both minutes are long past the flush grace period
+    assert result['bucketsWritten'] == 2
+    assert archive.scan('u1', 'heartRate_mean')[1].tolist() == [75, 120]
+    assert archive.scan('u1', 'heartRate_count')[1].tolist() == [2, 1]
+    assert history.window('u1', 'heartRate')[1].tolist() == [75, 120]
+
+
+def test_the_open_minute_waits_for_a_later_one(archive):
+    minute = int(time.time()) // 60 * 60
+    ingestor = Ingestor(archive)
+    result = ingestor.ingest(ndjson(f'{{"userId": "u1", "timestamp": {minute}, "heartRate": 70}}'),
+                             'application/x-ndjson')
+    assert (result['bucketsUpdated'], result['bucketsWritten']) == (1, 0)
+    assert ingestor.aggregator.flush(everything=True) == (1, 0)
+
+
+def test_binary_records(archive):
+    records = np.zeros(3, dtype=RECORD_DTYPE)
+    records['t'] = [START, START + 1, START + 2]
+    records['m'] = [METRIC_INDEX['steps'], 250, METRIC_INDEX['steps']]
+    records['v'] = [10, 1, np.nan]
+    result = Ingestor(archive).ingest(io.BytesIO(records.tobytes() + b'\x00'), 'application/octet-stream', 'u1')
+    assert (result['accepted'], result['rejected']) == (1, 3)
+
+
+def test_minutes_already_archived_by_another_process_are_late(archive):
+    line = f'{{"userId": "u1", "timestamp": {START}, "heartRate": 70}}'
+    Ingestor(archive).ingest(ndjson(line), 'application/x-ndjson')
+
+    restarted = Ingestor(ColumnarHistory(archive.root))
+    result = restarted.ingest(ndjson(line), 'application/x-ndjson')
+    assert (result['accepted'], result['late']) == (0, 1)
+    assert restarted.aggregator.flush(everything=True) == (0, 0)
+    assert archive.scan('u1', 'heartRate_count')[1].tolist() == [1]
+
+
+def test_a_refused_bucket_writes_no_column(archive):
+    minute = int(time.time()) // 60 * 60
+    ingestor = Ingestor(archive)
+    ingestor.ingest(ndjson(f'{{"userId": "u1", "timestamp": {minute}, "heartRate": 70}}'), 'application/x-ndjson')
+    # Another writer archives a later minute of one aggregate column first
+    archive.append('u1', 'heartRate_max', [minute + 60], [90])
+    assert ingestor.aggregator.flush(everything=True) == (0, 1)
+    assert [len(archive.scan('u1', f'heartRate_{name}')[0]) for name in ('min', 'mean', 'max', 'count')] == [0, 0, 1, 0]
+
+
+def test_user_ids_the_archive_cannot_store_are_rejected(archive):
+    result = Ingestor(archive).ingest(ndjson(f'{{"userId": "!!", "timestamp": {START}, "heartRate": 70}}'),
+                                      'application/x-ndjson')
+    assert (result['accepted'], result['rejected']) == (0, 1)
+
+
+def test_the_flusher_writes_a_quiet_series_without_another_request(archive, monkeypatch):
+    clock = [START + 10]
+    monkeypatch.setattr(ingest.time, 'time', lambda: clock[0])
+    ingestor = Ingestor(archive)
+    ingestor.ingest(ndjson(f'{{"userId": "u1", "timestamp": {START}, "heartRate": 70}}'), 'application/x-ndjson')
+    assert archive.last('u1', 'heartRate_mean') is None
+
+    ingestor.aggregator.start_flusher(interval=0.01)
+    try:
+        clock[0] = START + 60 + ingest.FLUSH_GRACE_SECONDS
+        deadline = time.monotonic() + 5
+        while archive.last('u1', 'heartRate_mean') is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        ingestor.aggregator.stop_flusher()
+    assert archive.scan('u1', 'heartRate_count')[1].tolist() == [1]
+
+
+def test_a_flush_waits_for_the_one_writing_earlier_minutes(archive, monkeypatch):
+    aggregator = Ingestor(archive).aggregator
+    times = START + 60 * np.arange(10)
+    aggregator.add(Batch(['u1'], np.zeros(10), np.full(10, METRIC_INDEX['heartRate']), times, np.full(10, 70.0)))
+
+    # The first flush stalls in its first append, while a second one runs
+    writing, resume = threading.Event(), threading.Event()
+    append = archive.append
+
+    def slow_append(*args):
+        if not writing.is_set():
+            writing.set()
+            resume.wait(5)
+        return append(*args)
+    monkeypatch.setattr(archive, 'append', slow_append)
+
+    results, errors = [], []
+
+    def flush(**kwargs):
+        try:
+            results.append(aggregator.flush(**kwargs))
+        except ValueError as e:
+            errors.append(e)
+
+    # The first takes every minute but the newest, the second that one
+    first = threading.Thread(target=flush, kwargs={'now': START})
+    first.start()
+    writing.wait(5)
+    second = threading.Thread(target=flush, kwargs={'everything': True})
+    second.start()
+    second.join(0.2)
+    resume.set()
+    first.join()
+    second.join()
+
+    assert errors == []
+    assert sorted(results) == [(1, 0), (9, 0)]
+    for name in ingest.AGGREGATES:
+        np.testing.assert_array_equal(archive.scan('u1', f'heartRate_{name}')[0], times)
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from flask import Flask
+
+from profiling import RequestProfiler
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv('PROFILE_TOKEN', 'secret')
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path))
+    app = Flask(__name__)
+    RequestProfiler(app)
+    app.add_url_rule('/api/ping', 'ping', lambda: 'pong')
+    return app.test_client()
+
+
+def test_profiles_are_listed_only_with_the_token(client):
+    assert client.get(RequestProfiler.ADMIN_PATH).status_code == 403
+
+    response = client.get('/api/ping', headers={RequestProfiler.HEADER: 'secret', 'X-Request-ID': 'r1'})
+    assert response.headers['X-Profile-ID'] == 'r1'
+
+    listing = client.get(RequestProfiler.ADMIN_PATH, headers={RequestProfiler.HEADER: 'secret',
+                                                               'Accept-Encoding': 'identity'})
+    assert listing.status_code == 200
+    assert listing.mimetype == 'application/json'
+    # Served by json_response, like every other endpoint
+    assert 'Accept-Encoding' in listing.headers['Vary']
+    [profile] = listing.get_json()['profiles']
+    assert (profile['requestId'], profile['path'], profile['statusCode']) == ('r1', '/api/ping', 200)
+
+
+def test_unprofiled_requests_get_no_profile_id(client):
+    assert 'X-Profile-ID' not in client.get('/api/ping').headers
+
+
+def test_imports_without_flask():
+    # A None entry in sys.modules makes `import flask` fail
+    code = "import sys; sys.modules['flask'] = None; import profiling; profiling.RequestProfiler()"
+    subprocess.run([sys.executable, '-c', code], cwd=SERVICE_DIR, check=True)
@@ -0,0 +1,59 @@
+import pytest
+
+from schemas import HealthMetrics, NutritionRequest, PredictionRequest, TrendQuery, ValidationError
+
+
+def errors_of(schema, data):
+    with pytest.raises(ValidationError) as info:
+        schema.from_dict(data)
+    return {error['field']: error['message'] for error in info.value.errors}
+
+
+def test_numbers_are_coerced_and_ints_stay_ints():
+    metrics = HealthMetrics.from_dict({'heartRate': '72', 'sleepHours': ' 7.5 ', 'steps': 8000})
+    assert metrics.heart_rate == 72 and type(metrics.heart_rate) is int
+    assert metrics.sleep_hours == 7.5
+    assert metrics.steps == 8000
+    assert metrics.temperature is None
+
+
+def test_missing_fields_take_their_defaults():
+    payload = NutritionRequest.from_dict({})
+    assert (payload.weight, payload.height, payload.occupation) == (70, 170, 'Other')
+    assert payload.health_conditions == []
+    # Defaults that are lists are copied, not shared between requests
+    payload.health_conditions.append('Diabetes')
+    assert NutritionRequest.from_dict({}).health_conditions == []
+
+
+def test_absent_prediction_sections_decode_to_empty_models():
+    payload = PredictionRequest.from_dict({'userId': 'u1'})
+    assert payload.metrics.heart_rate is None
+    assert payload.user_profile.age == 30
+
+
+def test_all_bad_fields_are_reported_with_their_paths():
+    errors = errors_of(PredictionRequest, {'metrics': {'heartRate': 'fast', 'oxygenSaturation': 140},
+                                           'userProfile': 'me'})
+    assert errors == {
+        'metrics.heartRate': 'must be a number',
+        'metrics.oxygenSaturation': 'must be between 0 and 100',
+        'userProfile': 'must be an object'
+    }
+
+
+def test_non_finite_numbers_are_rejected():
+    assert errors_of(HealthMetrics, {'temperature': 'nan'}) == {'temperature': 'must be a number'}
+
+
+@pytest.mark.parametrize('query, message', [
+    ({'start': '-5'}, 'must be at least 0'),
+    ({'width': '5'}, 'must be between 10 and 5000'),
+])
+def test_range_messages_name_only_the_bounds_that_exist(query, message):
+    field = next(iter(query))
+    assert errors_of(TrendQuery, query) == {field: message}
+
+
+def test_body_must_be_an_object():
+    assert errors_of(PredictionRequest, ['not', 'an', 'object']) == {'': 'request body must be a JSON object'}
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from serialization import CatalogItem, JSONSerializer, StaticDict, StaticList, orjson
+
+ENCODERS = [('json', True), ('json', False)] + ([('orjson', True), ('orjson', False)] if orjson else [])
+
+
+@pytest.fixture(params=ENCODERS, ids=lambda p: f'{p[0]}-{"fragments" if p[1] else "plain"}')
+def serializer(request):
+    return JSONSerializer(*request.param)
+
+
+def test_static_values_encode_like_plain_ones(serializer):
+    tips = StaticList(['Drink water', 'Eat greens'])
+    meal = StaticDict(name='Oats', tags=StaticList(['quick']))
+    payload = {'tips': tips, 'meals': [CatalogItem(meal, calories=350), CatalogItem(meal)], 'n': 1.5}
+    expected = {'tips': list(tips), 'meals': [{'name': 'Oats', 'tags': ['quick'], 'calories': 350},
+                                              {'name': 'Oats', 'tags': ['quick']}], 'n': 1.5}
+    assert json.loads(serializer.dumps(payload)) == expected
+    # The second call reuses the cached bytes
+    assert json.loads(serializer.dumps(payload)) == expected
+
+
+@pytest.mark.parametrize('text', ['\x000\x00', '\x001\x00', '\x0099\x00', '"\x000\x00'])
+def test_strings_that_look_like_markers_are_left_alone(serializer, text):
+    payload = {'a': text, text: 'key', 'b': StaticList(['x'])}
+    assert json.loads(serializer.dumps(payload)) == {'a': text, text: 'key', 'b': ['x']}
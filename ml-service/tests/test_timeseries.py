@@ -0,0 +1,50 @@
+import pytest
+
+from timeseries import TimeSeriesStore, UserSeries
+
+
+def test_window_is_the_newest_samples_oldest_first_across_wraparound():
+    store = TimeSeriesStore(capacity=4)
+    for i in range(10):
+        store.append_value('u1', 'heartRate', 1000 + i, 60 + i)
+    times, values = store.window('u1', 'heartRate')
+    assert times.tolist() == [1006, 1007, 1008, 1009]
+    assert values.tolist() == [66, 67, 68, 69]
+    assert store.window('u1', 'heartRate', 2)[1].tolist() == [68, 69]
+    assert store.window('u1', 'heartRate', 99)[1].tolist() == [66, 67, 68, 69]
+
+
+def test_partial_window_before_the_buffer_fills():
+    store = TimeSeriesStore(capacity=8)
+    store.append('u1', {'heartRate': 70, 'steps': 500}, timestamp=10)
+    store.append('u1', {'heartRate': 72}, timestamp=20)
+    assert store.window('u1', 'heartRate')[1].tolist() == [70, 72]
+    assert store.window('u1', 'steps')[0].tolist() == [10]
+    assert store.latest('u1') == {'heartRate': 72.0, 'steps': 500.0}
+
+
+def test_windows_are_read_only_views():
+    store = TimeSeriesStore(capacity=4)
+    store.append_value('u1', 'weight', 1, 80)
+    _, values = store.window('u1', 'weight')
+    with pytest.raises(ValueError):
+        values[0] = 0
+
+
+def test_unknown_user_has_empty_windows():
+    store = TimeSeriesStore(capacity=4)
+    times, values = store.window('nobody', 'heartRate')
+    assert len(times) == len(values) == 0
+    assert store.latest('nobody') == {}
+
+
+def test_least_recently_used_users_are_evicted_past_the_byte_budget():
+    per_user = UserSeries(4).nbytes
+    store = TimeSeriesStore(capacity=4, max_bytes=2 * per_user)
+    for user in ('a', 'b'):
+        store.append_value(user, 'heartRate', 1, 70)
+    store.window('a', 'heartRate')  # a is now the most recently used
+    store.append_value('c', 'heartRate', 1, 70)
+    assert store.users() == ['a', 'c']
+    assert store.evictions == 1
+    assert store.nbytes == 2 * per_user
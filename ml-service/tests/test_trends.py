@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from trends import compute_trend, lttb, minmax, percentile_band, rolling_mean, summary
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(36)
+    t = np.arange(10_000, dtype=np.float64) * 60
+    y = 70 + 10 * np.sin(t / 20_000) + rng.normal(0, 2, len(t))
+    y[4321], y[8765] = 190.0, 20.0
+    return t, y
+
+
+def reference_lttb(x, y, threshold):
+    """Straight transcription of the published algorithm"""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    keep, a = [0], 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if i == threshold - 3:
+            next_start, next_end = n - 1, n
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep.append(a)
+    return np.array(keep + [n - 1])
+
+
+def test_lttb_keeps_the_endpoints_and_the_requested_width(series):
+    t, y = series
+    keep = lttb(t, y, 800)
+
+    assert len(keep) == 800
+    assert keep[0] == 0 and keep[-1] == len(t) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert {4321, 8765} <= set(keep.tolist())
+
+
+def test_lttb_matches_the_reference_algorithm(series):
+    t, y = series
+    for threshold in (3, 10, 333, 800):
+        np.testing.assert_array_equal(lttb(t, y, threshold), reference_lttb(t, y, threshold))
+
+
+def test_short_series_are_returned_whole(series):
+    t, y = series
+    np.testing.assert_array_equal(lttb(t[:5], y[:5], 800), np.arange(5))
+    np.testing.assert_array_equal(lttb(t, y, 2), np.arange(len(t)))
+    np.testing.assert_array_equal(minmax(y[:5], 800), np.arange(5))
+
+
+def test_minmax_keeps_every_buckets_extremes(series):
+    t, y = series
+    keep = minmax(y, 800)
+
+    assert len(keep) <= 800 + 2
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert np.all(np.diff(keep) > 0)
+    size = -(-len(y) // 400)
+    for start in range(0, len(y), size):
+        bucket = y[start:start + size]
+        kept = y[keep[(keep >= start) & (keep < start + size)]]
+        assert kept.min() == bucket.min() and kept.max() == bucket.max()
+
+
+def test_statistics_match_direct_computation(series):
+    t, y = series
+    at = t[::997]
+    expected = [y[(t > when - 3600) & (t <= when)].mean() for when in at]
+    np.testing.assert_allclose(rolling_mean(t, y, at, 3600), expected)
+
+    stats = summary(t, y)
+    assert stats['count'] == len(y)
+    assert stats['mean'] == round(float(y.mean()), 2)
+    assert stats['std'] == pytest.approx(float(y.std()), abs=0.01)
+    assert stats['max'] == 190.0 and stats['min'] == 20.0
+
+    band = percentile_band(t.astype(np.int64), y, 100)
+    assert len(band['t']) == len(band['p10']) == 100
+    assert all(low <= mid <= high for low, mid, high in zip(band['p10'], band['p50'], band['p90']))
+
+
+def test_compute_trend_drops_nan_and_sizes_by_width(series):
+    t, y = series
+    y = y.copy()
+    y[::10] = np.nan
+    trend = compute_trend(t, y, width=200, method='minmax')
+
+    assert trend['sourcePoints'] == int(np.isfinite(y).sum())
+    assert len(trend['points']['t']) == len(trend['points']['v']) == len(trend['rollingMean']) <= 202
+    assert None not in trend['points']['v']
+    assert compute_trend([], [])['summary'] is None
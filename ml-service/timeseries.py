@@ -0,0 +1,189 @@
+"""
+In-memory recent history for the ML service.
+
+Keeps the last `capacity` readings per user for every metric the health
+predictor knows, in fixed-size float32 ring buffers. Each buffer is written
+twice (at i and i + capacity) so the most recent window is always one
+contiguous slice: appends are O(1) and window reads are zero-copy views.
+A global byte budget evicts the least recently used users.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from schemas import HealthMetrics
+
+# (payload key, HealthMetrics attribute) for every tracked metric
+METRICS = (
+    ('heartRate', 'heart_rate'),
+    ('bloodPressureSystolic', 'systolic'),
+    ('bloodPressureDiastolic', 'diastolic'),
+    ('oxygenSaturation', 'oxygen_saturation'),
+    ('temperature', 'temperature'),
+    ('stressLevel', 'stress_level'),
+    ('bloodGlucose', 'blood_glucose'),
+    ('sleepHours', 'sleep_hours'),
+    ('steps', 'steps'),
+    ('weight', 'weight')
+)
+METRIC_INDEX = {key: i for i, (key, _) in enumerate(METRICS)}
+
+DEFAULT_CAPACITY = int(os.getenv('HISTORY_CAPACITY', '256'))
+DEFAULT_MAX_BYTES = int(os.getenv('HISTORY_MAX_BYTES', str(64 * 1024 * 1024)))
+
+
+class UserSeries:
+    """Ring buffers for one user: a row of values and timestamps per metric"""
+
+    __slots__ = ('values', 'times', 'heads', 'counts', '_width', '_flat_values', '_flat_times')
+
+    def __init__(self, capacity: int):
+        # Doubled width so the last `capacity` samples are always contiguous
+        self.values = np.full((len(METRICS), 2 * capacity), np.nan, dtype=np.float32)
+        # Seconds since the epoch; uint32 holds dates until 2106 in half the space of float64
+        self.times = np.zeros((len(METRICS), 2 * capacity), dtype=np.uint32)
+        self.heads = [0] * len(METRICS)
+        self.counts = [0] * len(METRICS)
+        # Flat memoryviews over the same memory: scalar writes through them
+        # cost about half of numpy item assignment
+        self._width = 2 * capacity
+        self._flat_values = memoryview(self.values).cast('B').cast('f')
+        self._flat_times = memoryview(self.times).cast('B').cast('I')
+
+    @property
+    def capacity(self) -> int:
+        return self.values.shape[1] // 2
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.times.nbytes
+
+    def push(self, metric: int, timestamp: int, value: float):
+        capacity = self._width >> 1
+        head = self.heads[metric]
+        i = metric * self._width + head
+        self._flat_values[i] = self._flat_values[i + capacity] = value
+        self._flat_times[i] = self._flat_times[i + capacity] = timestamp
+        self.heads[metric] = head + 1 if head + 1 < capacity else 0
+        if self.counts[metric] < capacity:
+            self.counts[metric] += 1
+
+    def push_reading(self, timestamp: int, values):
+        """push() for every metric at once; `values` is indexed like METRICS, None = missing"""
+        width = self._width
+        capacity = width >> 1
+        flat_values = self._flat_values
+        flat_times = self._flat_times
+        heads = self.heads
+        counts = self.counts
+        for metric, value in enumerate(values):
+            if value is None:
+                continue
+            head = heads[metric]
+            i = metric * width + head
+            flat_values[i] = flat_values[i + capacity] = value
+            flat_times[i] = flat_times[i + capacity] = timestamp
+            heads[metric] = head + 1 if head + 1 < capacity else 0
+            if counts[metric] < capacity:
+                counts[metric] += 1
+
+    def window(self, metric: int, size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only (times, values) views of the newest `size` samples, oldest first"""
+        count = self.counts[metric]
+        size = count if size is None else max(0, min(size, count))
+        end = self.heads[metric] + self.values.shape[1] // 2
+        times = self.times[metric, end - size:end]
+        values = self.values[metric, end - size:end]
+        times.flags.writeable = False
+        values.flags.writeable = False
+        return times, values
+
+
+class TimeSeriesStore:
+    """
+    Per-user recent history with a global memory cap.
+
+    Window views alias the ring buffers: later appends overwrite them, so
+    callers that keep a window past the current request should copy it.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self._users: 'OrderedDict[str, UserSeries]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._users
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def users(self):
+        with self._lock:
+            return list(self._users)
+
+    def _series(self, user_id: str, create: bool) -> Optional[UserSeries]:
+        series = self._users.get(user_id)
+        if series is not None:
+            self._users.move_to_end(user_id)
+            return series
+        if not create:
+            return None
+        series = UserSeries(self.capacity)
+        self._users[user_id] = series
+        self._bytes += series.nbytes
+        # Evict cold users, but never the one being written
+        while self._bytes > self.max_bytes and len(self._users) > 1:
+            _, evicted = self._users.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+        return series
+
+    def append(self, user_id: str, metrics: Union[HealthMetrics, Dict], timestamp: Optional[float] = None):
+        """Record every metric present in one reading"""
+        if isinstance(metrics, dict):
+            metrics = HealthMetrics.from_dict(metrics)
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        values = [getattr(metrics, attr) for _, attr in METRICS]
+        with self._lock:
+            self._series(user_id, create=True).push_reading(timestamp, values)
+
+    def append_value(self, user_id: str, metric: str, timestamp: float, value: float):
+        """Record a single metric sample"""
+        with self._lock:
+            self._series(user_id, create=True).push(METRIC_INDEX[metric], int(timestamp), value)
+
+    def window(self, user_id: str, metric: str, size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(times, values) for the newest `size` samples of one metric; empty if unknown"""
+        with self._lock:
+            series = self._series(user_id, create=False)
+            if series is None:
+                return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.float32)
+            return series.window(METRIC_INDEX[metric], size)
+
+    def latest(self, user_id: str) -> Dict[str, float]:
+        """The newest value of every metric this user has history for"""
+        with self._lock:
+            series = self._series(user_id, create=False)
+            if series is None:
+                return {}
+            capacity = series.capacity
+            return {key: float(series.values[i, series.heads[i] + capacity - 1])
+                    for i, (key, _) in enumerate(METRICS) if series.counts[i]}
+
+    def drop(self, user_id: str):
+        with self._lock:
+            series = self._users.pop(user_id, None)
+            if series is not None:
+                self._bytes -= series.nbytes
@@ -0,0 +1,200 @@
+import contextvars
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, g, request
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Parse a W3C traceparent header into (trace_id, parent_span_id)"""
+    if not header:
+        return None
+    match = _TRACEPARENT_RE.match(header.strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, _ = match.groups()
+    if trace_id == '0' * 32 or span_id == '0' * 16:
+        return None
+    return trace_id, span_id
+
+
+def format_traceparent(trace_id: str, span_id: str) -> str:
+    return f'00-{trace_id}-{span_id}-01'
+
+
+class Span:
+    """A single timed operation, collected into its request's span list"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'kind',
+                 'start_ns', 'end_ns', 'attributes', 'status', 'collected')
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, collected: List):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = {}
+        self.status = STATUS_OK
+        self.collected = collected
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.collected.append(self)
+
+    def to_otlp(self) -> Dict:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            'status': {'code': self.status}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Record a child span of the active request span.
+    Outside of a traced request this is a no-op, so the engines can be
+    instrumented without depending on Flask being active.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, parent.trace_id, parent.span_id, SPAN_KIND_INTERNAL, parent.collected)
+    child.attributes.update(attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except Exception:
+        child.status = STATUS_ERROR
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+class Tracer:
+    """
+    Records a server span per request plus any engine-stage spans opened
+    with `span()`, and exports them as OTLP/JSON lines to a local file.
+    Incoming `traceparent` headers are continued; the response carries
+    the server span's `traceparent` so callers can correlate.
+    """
+
+    def __init__(self, app: Optional[Flask] = None, service_name: str = 'medtwin-ml'):
+        self.service_name = service_name
+        self.enabled = os.getenv('TRACING_ENABLED', '1') != '0'
+        self.export_path = os.getenv(
+            'TRACE_EXPORT_PATH', os.path.join(os.path.dirname(__file__), 'traces', 'spans.jsonl')
+        )
+        self.max_bytes = int(os.getenv('TRACE_MAX_BYTES', str(50 * 1024 * 1024)))
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        if not self.enabled:
+            return
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+
+    def _start(self):
+        incoming = parse_traceparent(request.headers.get('traceparent'))
+        trace_id, parent_id = incoming if incoming else (secrets.token_hex(16), None)
+
+        root = Span(f'{request.method} {request.path}', trace_id, parent_id, SPAN_KIND_SERVER, [])
+        root.set_attribute('http.method', request.method)
+        root.set_attribute('http.route', request.path)
+        g.trace_span = root
+        g.trace_token = _current_span.set(root)
+
+    def _finish(self, response):
+        root = g.get('trace_span')
+        if root is not None:
+            root.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                root.status = STATUS_ERROR
+            response.headers['traceparent'] = format_traceparent(root.trace_id, root.span_id)
+        return response
+
+    def _teardown(self, error=None):
+        root = g.pop('trace_span', None)
+        token = g.pop('trace_token', None)
+        if token is not None:
+            _current_span.reset(token)
+        if root is None:
+            return
+        if error is not None:
+            root.status = STATUS_ERROR
+        root.end()
+        try:
+            self.export(root.collected)
+        except OSError:
+            # Tracing must never break the request it is observing
+            pass
+
+    def export(self, spans: List[Span]):
+        """Append one OTLP ExportTraceServiceRequest line for the given spans"""
+        if not spans:
+            return
+        payload = {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'medtwin.tracing'},
+                    'spans': [s.to_otlp() for s in spans]
+                }]
+            }]
+        }
+        line = json.dumps(payload, separators=(',', ':')) + '\n'
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.export_path) or '.', exist_ok=True)
+            if os.path.exists(self.export_path) and os.path.getsize(self.export_path) > self.max_bytes:
+                os.replace(self.export_path, self.export_path + '.1')
+            with open(self.export_path, 'a', encoding='utf-8') as f:
+                f.write(line)
@@ -0,0 +1,216 @@
+"""
+Chart-ready trends for a user's metric history.
+
+Every output is sized by the requested pixel width, not by the amount of
+history: the raw series is downsampled with LTTB (largest triangle three
+buckets) or min/max decimation, and the rolling mean, percentile band and
+summary statistics are computed with vectorized NumPy over the full range.
+`history_for_query` serves the raw points instead, in pages newer than a
+timestamp, for clients that keep their own copy and only fetch what's new.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from columnar import ColumnarHistory
+from schemas import HistoryQuery, TrendQuery, ValidationError
+from timeseries import METRIC_INDEX, TimeSeriesStore
+from tracing import span
+
+METHODS = ('lttb', 'minmax')
+BAND_PERCENTILES = (10, 50, 90)
+SUMMARY_PERCENTILES = (5, 50, 95)
+# Percentile band buckets per pixel; a band wider than this is hard to read anyway
+PIXELS_PER_BAND_BUCKET = 8
+
+
+def _bucket_edges(n: int, buckets: int) -> np.ndarray:
+    return np.linspace(0, n, buckets + 1).astype(np.int64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points LTTB keeps; first and last are always kept"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Interior points split into threshold - 2 buckets
+    edges = 1 + _bucket_edges(n - 2, threshold - 2)
+    # The mean of each bucket (plus the last point as a final "bucket") is
+    # the third triangle vertex for the bucket before it
+    cx, cy = np.cumsum(np.r_[0.0, x]), np.cumsum(np.r_[0.0, y])
+    lo, hi = edges[1:], np.r_[edges[2:], n]
+    sizes = hi - lo
+    avg_x = (cx[hi] - cx[lo]) / sizes
+    avg_y = (cy[hi] - cy[lo]) / sizes
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - avg_x[i]) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y[i] - ay))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def minmax(y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of each bucket's minimum and maximum, in time order"""
+    n = len(y)
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return np.arange(n)
+    size = -(-n // buckets)
+    # Pad the last bucket by repeating the final index so every row is full
+    index = np.minimum(np.arange(buckets * size), n - 1).reshape(buckets, size)
+    values = y[index]
+    rows = np.arange(buckets)
+    picked = np.concatenate([index[rows, values.argmin(axis=1)], index[rows, values.argmax(axis=1)]])
+    return np.unique(np.r_[0, picked, n - 1])
+
+
+def rolling_mean(t: np.ndarray, y: np.ndarray, at: np.ndarray, window: float) -> np.ndarray:
+    """Mean of the samples in (at - window, at] for each time in `at`"""
+    total = np.cumsum(np.r_[0.0, y])
+    lo = np.searchsorted(t, at - window, 'right')
+    hi = np.searchsorted(t, at, 'right')
+    counts = hi - lo
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, (total[hi] - total[lo]) / np.maximum(counts, 1), np.nan)
+
+
+def percentile_band(t: np.ndarray, y: np.ndarray, buckets: int) -> Dict:
+    """Per-bucket percentiles via one row-wise sort (NaN padding sorts last)"""
+    n = len(y)
+    buckets = max(1, min(buckets, n))
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    rows = np.sort(padded.reshape(buckets, size), axis=1)
+    counts = np.minimum(size, n - np.arange(buckets) * size)
+    band = {'t': t[np.arange(buckets) * size + (counts - 1) // 2].tolist()}
+    for q in BAND_PERCENTILES:
+        position = ((counts - 1) * q) // 100
+        band[f'p{q}'] = np.round(rows[np.arange(buckets), position], 2).tolist()
+    return band
+
+
+def summary(t: np.ndarray, y: np.ndarray) -> Dict:
+    n = len(y)
+    tf = t - float(t[0])
+    mean_t, mean_y = tf.mean(), y.mean()
+    # Least-squares slope from dot products: no n-sized temporaries
+    var_t = np.dot(tf, tf) / n - mean_t ** 2
+    slope = (np.dot(tf, y) / n - mean_t * mean_y) / var_t if var_t > 0 else 0.0
+    # One partition for all three percentiles (nearest rank)
+    ranks = [min(n - 1, (n - 1) * q // 100) for q in SUMMARY_PERCENTILES]
+    low, median, high = np.partition(y, ranks)[ranks]
+    return {
+        'count': int(n),
+        'mean': round(float(mean_y), 2),
+        'std': round(float(np.sqrt(max(np.dot(y, y) / n - mean_y ** 2, 0.0))), 2),
+        'min': round(float(y.min()), 2),
+        'max': round(float(y.max()), 2),
+        f'p{SUMMARY_PERCENTILES[0]}': round(float(low), 2),
+        f'p{SUMMARY_PERCENTILES[1]}': round(float(median), 2),
+        f'p{SUMMARY_PERCENTILES[2]}': round(float(high), 2),
+        'first': int(t[0]),
+        'last': int(t[-1]),
+        'slopePerDay': round(float(slope) * 86400, 4)
+    }
+
+
+def load_series(archive: ColumnarHistory, history: Optional[TimeSeriesStore], user_id: str, metric: str,
+                start: Optional[int], end: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-minute means from the archive, or the recent in-memory readings when there are none"""
+    times, values = archive.scan(user_id, f'{metric}_mean', start, end)
+    if not len(times) and history is not None:
+        times, values = history.window(user_id, metric)
+        mask = np.ones(len(times), dtype=bool)
+        if start is not None:
+            mask &= times >= start
+        if end is not None:
+            mask &= times <= end
+        times, values = times[mask], values[mask]
+    return times, values
+
+
+def compute_trend(times: np.ndarray, values: np.ndarray, width: int = 800, method: str = 'lttb',
+                  window: float = 3600) -> Dict:
+    t = np.asarray(times, dtype=np.float64)
+    y = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(y)
+    if not finite.all():
+        t, y = t[finite], y[finite]
+    if not len(y):
+        return {'sourcePoints': 0, 'points': {'t': [], 'v': []}, 'rollingMean': [], 'band': {}, 'summary': None}
+
+    with span('trends.downsample', method=method, points=len(y)):
+        keep = lttb(t, y, width) if method == 'lttb' else minmax(y, width)
+    with span('trends.statistics'):
+        at = t[keep]
+        rolling = rolling_mean(t, y, at, window)
+        band = percentile_band(t.astype(np.int64), y, max(1, width // PIXELS_PER_BAND_BUCKET))
+        stats = summary(t, y)
+
+    return {
+        'sourcePoints': int(len(y)),
+        'points': {'t': at.astype(np.int64).tolist(), 'v': np.round(y[keep], 2).tolist()},
+        'rollingMean': [None if value != value else round(value, 2) for value in rolling.tolist()],
+        'band': band,
+        'summary': stats
+    }
+
+
+def _series_errors(query) -> List[Dict]:
+    errors = []
+    if not query.user_id:
+        errors.append({'field': 'userId', 'message': 'is required'})
+    if query.metric not in METRIC_INDEX:
+        errors.append({'field': 'metric', 'message': f'must be one of {", ".join(METRIC_INDEX)}'})
+    return errors
+
+
+def trend_for_query(archive: ColumnarHistory, history: TimeSeriesStore, args: Dict) -> Dict:
+    query = TrendQuery.from_dict(args)
+    errors = _series_errors(query)
+    if query.method not in METHODS:
+        errors.append({'field': 'method', 'message': f'must be one of {", ".join(METHODS)}'})
+    if errors:
+        raise ValidationError(errors)
+
+    start = None if query.start is None else int(query.start)
+    end = None if query.end is None else int(query.end)
+    with span('trends.load', metric=query.metric):
+        times, values = load_series(archive, history, query.user_id, query.metric, start, end)
+    trend = compute_trend(times, values, int(query.width), query.method, query.window)
+    trend.update({'metric': query.metric, 'method': query.method, 'width': int(query.width)})
+    return trend
+
+
+def history_for_query(archive: ColumnarHistory, history: TimeSeriesStore, args: Dict) -> Dict:
+    """Up to `limit` raw points after `since`, oldest first; `more` says another page follows"""
+    query = HistoryQuery.from_dict(args)
+    errors = _series_errors(query)
+    if errors:
+        raise ValidationError(errors)
+
+    since = None if query.since is None else int(query.since)
+    limit = int(query.limit)
+    with span('history.load', metric=query.metric):
+        times, values = load_series(archive, history, query.user_id, query.metric,
+                                    None if since is None else since + 1, None)
+    finite = np.isfinite(values)
+    if not finite.all():
+        times, values = times[finite], values[finite]
+    more = len(times) > limit
+    times, values = times[:limit], values[:limit]
+    return {
+        'metric': query.metric,
+        'points': {'t': times.astype(np.int64).tolist(), 'v': np.round(values.astype(np.float64), 2).tolist()},
+        'last': int(times[-1]) if len(times) else since,
+        'more': more
+    }
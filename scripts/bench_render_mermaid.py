@@ -0,0 +1,92 @@
+"""
+Time render_mermaid_diagram.py on generated flowcharts of a few hundred nodes.
+
+For each size it reports parse, cold layout, arrange (coordinates) and draw
+times, then relabels every node and renders again: the layout comes from the
+cache, so only parse, arrange and draw are paid. placement_ms is parse, layout
+and arrange; total_ms adds drawing the PNG, which grows with the image's area.
+Exits with status 1 when a graph of up to --budget-nodes nodes takes longer
+than --budget-ms end to end.
+
+    python scripts/bench_render_mermaid.py [--nodes 100 200 300 600] [--seed 7] [--compress-level 1]
+                                           [--budget-ms 1000] [--budget-nodes 200]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from render_mermaid_diagram import PNG_COMPRESS_LEVEL, arrange, cached_layout, parse, render
+
+
+def flowchart(nodes, seed, label="Service"):
+    """A layered service graph: subgraphs of 8-20 nodes, edges mostly to the next few subgraphs"""
+    rng = random.Random(seed)
+    lines, groups, count = ["flowchart TB", "  classDef api fill:#FFF3E0,stroke:#EF6C00,color:#E65100;"], [], 0
+    while count < nodes:
+        size = min(rng.randint(8, 20), nodes - count)
+        group = [f"N{count + i}" for i in range(size)]
+        lines.append(f'  subgraph G{len(groups)}["Group {len(groups)}"]')
+        lines.extend(f"    {node}[{label} {node}]:::api" for node in group)
+        lines.append("  end")
+        groups.append(group)
+        count += size
+    for index, group in enumerate(groups[:-1]):
+        for node in group:
+            for _ in range(rng.randint(1, 2)):
+                target = rng.choice(groups[min(len(groups) - 1, index + rng.choice([1, 1, 1, 2, 3]))])
+                lines.append(f"  {node} -->|call| {target}" if rng.random() < 0.2 else f"  {node} --> {target}")
+    return "\n".join(lines)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+def run(text, cache_path, output, compress_level):
+    graph, parse_ms = timed(parse, text)
+    layout, layout_ms = timed(cached_layout, graph, cache_path)
+    placed, arrange_ms = timed(arrange, graph, layout)
+    size, draw_ms = timed(render, graph, placed, "Benchmark", output, 1, compress_level)
+    placement_ms = round(parse_ms + layout_ms + arrange_ms, 1)
+    return {"parse_ms": parse_ms, "layout_ms": layout_ms, "arrange_ms": arrange_ms, "placement_ms": placement_ms,
+            "draw_ms": draw_ms, "total_ms": round(placement_ms + draw_ms, 1), "crossings": layout["crossings"],
+            "size": "x".join(map(str, size))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 200, 300, 600])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--compress-level", type=int, default=PNG_COMPRESS_LEVEL,
+                        help="PNG zlib level of the drawn outputs")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="end-to-end limit per render")
+    parser.add_argument("--budget-nodes", type=int, default=200, help="largest graph the limit applies to")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for nodes in args.nodes:
+            cache_path = os.path.join(directory, f"bench-{nodes}.layout.json")
+            output = os.path.join(directory, f"bench-{nodes}.png")
+            results[f"{nodes} nodes"] = {
+                "cold": run(flowchart(nodes, args.seed), cache_path, output, args.compress_level),
+                "relabelled (cached layout)": run(flowchart(nodes, args.seed, label="Renamed"), cache_path, output,
+                                                  args.compress_level)
+            }
+    print(json.dumps(results, indent=2))
+
+    over = [f"{nodes} nodes, {name}: {run['total_ms']} ms" for nodes in args.nodes if nodes <= args.budget_nodes
+            for name, run in results[f"{nodes} nodes"].items() if run["total_ms"] > args.budget_ms]
+    if over:
+        print(f"Over the {args.budget_ms:g} ms budget: " + "; ".join(over), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,146 @@
+"""
+Draws architecture-diagram-styled.png.
+
+    python scripts/generate_architecture_diagram.py [--scale 1 8 33] [--format png webp] [--jobs 4]
+
+The diagram is laid out on a 2560x1440 canvas and can be rendered at any
+scale. Above TILE_PIXELS a PNG is rendered in horizontal bands: the
+drawing is replayed into one band at a time and each band's rows are
+compressed into the PNG as soon as they are drawn, so memory stays at about
+one band however large the output is.
+
+Every requested scale and format is exported by its own worker process. An
+output is skipped when the hash of what it is drawn from (this script, the
+Pillow version, the fonts, scale and format) matches the one recorded in
+HASHES_FILE for it and the file is still there; --force redraws everything.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import numpy as np
+import PIL
 from PIL import Image, ImageDraw, ImageFont
 
+WIDTH, HEIGHT = 2560, 1440
+BACKGROUND = "#F8FBFF"
+# Pixels per band in tiled mode (about 48 MB of RGB)
+TILE_PIXELS = 16 * 1024 * 1024
+PNG_COMPRESS_LEVEL = 6
+# Extension -> Pillow format, and the largest side each format can store
+FORMATS = {"png": "PNG", "webp": "WEBP", "jpg": "JPEG"}
+MAX_SIDE = {"png": 2 ** 31 - 1, "webp": 16383, "jpg": 65535}
+HASHES_FILE = "architecture-diagram-styled.hashes.json"
 
+
+@lru_cache(maxsize=None)
 def get_font(size, bold=False):
+    # Cached: the diagram asks for the same few sizes dozens of times, in every band
     try:
         # Windows common fonts
         name = "arialbd.ttf" if bold else "arial.ttf"
         return ImageFont.truetype(name, size)
     except Exception:
-        return ImageFont.load_default()
+        # Pillow's bundled font, which (unlike the bitmap fallback) scales with the diagram
+        return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=None)
+def _font_at(font, size):
+    return font.font_variant(size=size)
+
+
+class Canvas:
+    """
+    The ImageDraw calls the diagram uses, in diagram coordinates, drawn at
+    `scale` into an image whose top-left corner is `origin` (in output
+    pixels). Shapes entirely outside the image are skipped.
+    """
+
+    def __init__(self, image, scale=1, origin=(0, 0)):
+        self.image = image
+        self.draw = ImageDraw.Draw(image)
+        self.scale = scale
+        self.origin = origin
+        self.size = image.size
+
+    def _point(self, point):
+        return point[0] * self.scale - self.origin[0], point[1] * self.scale - self.origin[1]
+
+    def _points(self, xy):
+        # [x1, y1, x2, y2] boxes and [(x, y), ...] point lists
+        if isinstance(xy[0], (int, float)):
+            return [self._point(xy[i:i + 2]) for i in range(0, len(xy), 2)]
+        return [self._point(point) for point in xy]
+
+    def _width(self, width):
+        return max(1, round(width * self.scale))
+
+    def _visible(self, points, margin=0):
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return (max(xs) + margin >= 0 and min(xs) - margin < self.size[0]
+                and max(ys) + margin >= 0 and min(ys) - margin < self.size[1])
+
+    def _box(self, xy):
+        (x1, y1), (x2, y2) = self._points(xy)
+        return [x1, y1, x2, y2]
+
+    def line(self, xy, fill=None, width=1):
+        points, width = self._points(xy), self._width(width)
+        if self._visible(points, width):
+            self.draw.line(points, fill=fill, width=width)
+
+    def polygon(self, xy, fill=None, outline=None):
+        points = self._points(xy)
+        if self._visible(points):
+            self.draw.polygon(points, fill=fill, outline=outline)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        box = self._box(xy)
+        if self._visible(self._points(xy)):
+            self.draw.ellipse(box, fill=fill, outline=outline, width=self._width(width))
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        box = self._box(xy)
+        if self._visible(self._points(xy)):
+            self.draw.rectangle(box, fill=fill, outline=outline, width=self._width(width))
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1):
+        box = self._box(xy)
+        if self._visible(self._points(xy)):
+            self.draw.rounded_rectangle(box, radius=radius * self.scale, fill=fill, outline=outline,
+                                        width=self._width(width))
+
+    def text(self, xy, text, font=None, fill=None):
+        if self.scale != 1 and hasattr(font, "font_variant"):
+            font = _font_at(font, max(1, round(font.size * self.scale)))
+        x, y = self._point(xy)
+        # Rough bounds (no glyph is wider than 2em); Pillow clips the rest, so measuring exactly only costs time
+        size = getattr(font, "size", 10)
+        if self._visible([(x, y - size), (x + 2 * size * len(text), y + 2 * size)]):
+            self.draw.text((x, y), text, font=font, fill=fill)
+
+    def gradient(self, xy, top_color, bottom_color):
+        """Vertical gradient over the box: one colour per output row, computed with NumPy, filled in runs"""
+        x1, y1, x2, y2 = self._box(xy)
+        top, bottom = max(0, int(y1)), min(self.size[1], int(y2))
+        left, right = max(0, int(x1)), min(self.size[0], int(x2) + 1)
+        if top >= bottom or left >= right:
+            return
+        t = (np.arange(top, bottom) - y1) / (y2 - y1)
+        start, end = np.array(top_color, float), np.array(bottom_color, float)
+        colors = (start + (end - start) * t[:, None]).astype(np.uint8)
+        # Neighbouring rows mostly share a colour: one rectangle per run of them
+        changes = np.flatnonzero((colors[1:] != colors[:-1]).any(axis=1)) + 1
+        for first, last in zip(np.r_[0, changes].tolist(), np.r_[changes, len(colors)].tolist()):
+            self.draw.rectangle([left, top + first, right - 1, top + last - 1], fill=tuple(colors[first].tolist()))
 
 
 def rounded_rect(draw, xy, radius, fill, outline=None, width=2):
@@ -31,11 +164,7 @@ def arrow(draw, start, end, color, width=4, head=12):
 
 
 def draw_gradient(draw, width, height, top_color, bottom_color):
-    for y in range(height):
-        r = int(top_color[0] + (bottom_color[0] - top_color[0]) * (y / height))
-        g = int(top_color[1] + (bottom_color[1] - top_color[1]) * (y / height))
-        b = int(top_color[2] + (bottom_color[2] - top_color[2]) * (y / height))
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    draw.gradient([0, 0, width, height], top_color, bottom_color)
 
 
 def draw_heart(draw, center, size, color):
@@ -55,10 +184,9 @@ def draw_chart(draw, box, color):
         draw.ellipse([px - 4, py - 4, px + 4, py + 4], fill=color)
 
 
-def main():
-    w, h = 2560, 1440
-    img = Image.new("RGB", (w, h), "#F8FBFF")
-    draw = ImageDraw.Draw(img)
+def draw_diagram(draw):
+    """Everything on the diagram, through a Canvas"""
+    w, h = WIDTH, HEIGHT
 
     draw_gradient(draw, w, h, (248, 251, 255), (236, 243, 255))
 
@@ -154,7 +282,152 @@ def main():
     draw.text((80, 1280), "End-to-end flow: UI → Backend API → ML Service → Insights & Recommendations",
               font=get_font(20), fill="#4A5568")
 
-    img.save("architecture-diagram-styled.png")
+
+
+def output_size(scale):
+    return round(WIDTH * scale), round(HEIGHT * scale)
+
+
+def render(scale=1):
+    """The whole diagram as one image"""
+    img = Image.new("RGB", output_size(scale), BACKGROUND)
+    draw_diagram(Canvas(img, scale))
+    return img
+
+
+def render_bands(scale, tile_pixels=TILE_PIXELS):
+    """Yields the diagram as full-width bands of about `tile_pixels`, top to bottom"""
+    width, height = output_size(scale)
+    rows = max(1, tile_pixels // width)
+    for top in range(0, height, rows):
+        band = Image.new("RGB", (width, min(rows, height - top)), BACKGROUND)
+        draw_diagram(Canvas(band, scale, origin=(0, top)))
+        yield band
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def write_png(path, width, height, bands, level=PNG_COMPRESS_LEVEL):
+    """
+    Write RGB `bands` (full-width images, top to bottom) as one PNG,
+    compressing each band's rows as it arrives instead of holding the image.
+    """
+    stride = width * 3
+    compressor = zlib.compressobj(level)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        # 8-bit truecolour, no interlacing
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        for band in bands:
+            raw = memoryview(band.tobytes())
+            for start in range(0, len(raw), stride):
+                # Each scanline starts with its filter type (0: none)
+                data = compressor.compress(b"\x00") + compressor.compress(raw[start:start + stride])
+                if data:
+                    f.write(_png_chunk(b"IDAT", data))
+        f.write(_png_chunk(b"IDAT", compressor.flush()))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def output_name(scale, fmt):
+    suffix = "" if scale == 1 else f"@{scale:g}x"
+    return f"architecture-diagram-styled{suffix}.{fmt}"
+
+
+def input_hash(scale, fmt):
+    """Hash of everything an output is drawn from"""
+    digest = hashlib.sha256()
+    with open(__file__, "rb") as f:
+        digest.update(f.read())
+    # A font file's path, or Pillow's bundled font (held in memory)
+    fonts = [getattr(get_font(10, bold), "path", None) for bold in (False, True)]
+    fonts = [path if isinstance(path, str) else "bundled" for path in fonts]
+    digest.update(json.dumps([PIL.__version__, fonts, scale, fmt]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def export(path, scale, fmt, tiled=False, tile_pixels=TILE_PIXELS):
+    """Draw one output file; returns (path, seconds). Runs in a worker process"""
+    started = time.perf_counter()
+    width, height = output_size(scale)
+    if fmt == "png" and (tiled or width * height > tile_pixels):
+        write_png(path, width, height, render_bands(scale, tile_pixels))
+    else:
+        image = render(scale)
+        if fmt == "png":
+            image.save(path, compress_level=PNG_COMPRESS_LEVEL)
+        else:
+            image.save(path, FORMATS[fmt], quality=95)
+    return path, time.perf_counter() - started
+
+
+def load_hashes(directory):
+    try:
+        with open(os.path.join(directory, HASHES_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hashes(directory, hashes):
+    with open(os.path.join(directory, HASHES_FILE), "w") as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draw the styled architecture diagram")
+    parser.add_argument("--scale", type=float, nargs="+", default=[1],
+                        help="output sizes as multiples of 2560x1440, e.g. --scale 1 8 33")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=sorted(FORMATS), help="output formats")
+    parser.add_argument("--output", help="output file when exporting one scale and format "
+                                         "(default: architecture-diagram-styled[@<scale>x].<format>)")
+    parser.add_argument("--output-dir", default=".", help="directory for the default output names")
+    parser.add_argument("--tiled", action="store_true",
+                        help="render PNGs in bands even when the image would fit in one (otherwise automatic)")
+    parser.add_argument("--tile-pixels", type=int, default=TILE_PIXELS, help="pixels per band in tiled mode")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--force", action="store_true", help="redraw outputs even when their hash matches")
+    args = parser.parse_args()
+
+    outputs = [(scale, fmt) for scale in dict.fromkeys(args.scale) for fmt in dict.fromkeys(args.format)]
+    if args.output and len(outputs) > 1:
+        parser.error("--output needs a single --scale and --format")
+    for scale, fmt in outputs:
+        if max(output_size(scale)) > MAX_SIDE[fmt]:
+            parser.error(f"{fmt} can't store {'x'.join(map(str, output_size(scale)))}; use png at this scale")
+    directory = os.path.dirname(args.output) if args.output else args.output_dir
+    directory = directory or "."
+    hashes = load_hashes(directory)
+    jobs = {}
+    for scale, fmt in outputs:
+        path = args.output or os.path.join(directory, output_name(scale, fmt))
+        key, expected = os.path.basename(path), input_hash(scale, fmt)
+        if not args.force and hashes.get(key) == expected and os.path.exists(path):
+            print(f"Skipped {path} (unchanged)")
+            continue
+        jobs[path] = (scale, fmt, key, expected)
+
+    def finished(path, seconds):
+        scale, fmt, key, expected = jobs[path]
+        width, height = output_size(scale)
+        print(f"Wrote {path} ({width}x{height}) in {seconds:.1f}s")
+        # Recorded as each output lands, so an interrupted run keeps what it finished
+        hashes[key] = expected
+        save_hashes(directory, hashes)
+
+    # Largest first, so the long renders start while the small ones fill the other workers
+    order = sorted(jobs, key=lambda path: -jobs[path][0])
+    if len(order) <= 1 or args.jobs == 1:
+        for path in order:
+            finished(*export(path, *jobs[path][:2], args.tiled, args.tile_pixels))
+        return
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(order))) as pool:
+        futures = [pool.submit(export, path, *jobs[path][:2], args.tiled, args.tile_pixels) for path in order]
+        for future in as_completed(futures):
+            finished(*future.result())
 
 
 if __name__ == "__main__":
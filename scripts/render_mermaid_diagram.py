@@ -0,0 +1,558 @@
+"""
+Draws architecture-diagram.mmd (or any Mermaid flowchart) in the style of
+generate_architecture_diagram.py.
+
+    python scripts/render_mermaid_diagram.py [architecture-diagram.mmd] [--output architecture-diagram.png] [--scale 2]
+
+The graph is laid out in layers (Sugiyama style): cycles are broken, every
+node gets the layer of its longest path from a source, edges spanning several
+layers are routed through dummy points, and the order within each layer is
+improved by barycenter sweeps, keeping subgraph members together. That part
+only depends on the graph's structure (node IDs, edges, subgraphs and
+direction), so it is cached under a hash of the structure in LAYOUT_CACHE
+next to the output: relabelling nodes or restyling them only recomputes the
+coordinates, which is linear in the size of the graph.
+
+Parsing, layout and coordinates take about 40 ms at 300 nodes and 65 ms at
+600. Drawing is proportional to the image's area and is most of the time.
+PNGs are drawn in bands and compressed at zlib level 1. A whole 200-node
+graph (about 6000x3600 pixels) renders in about half a second, end to end.
+A 300-node one (8299x5494) takes about a second, and a 600-node one (6594x10598)
+about 1.6 s; pass --scale below 1 to draw fewer pixels. bench_render_mermaid.py
+checks the one-second budget end to end for graphs up to 200 nodes.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+
+from PIL import Image
+
+from generate_architecture_diagram import (BACKGROUND, TILE_PIXELS, Canvas, arrow, draw_gradient, get_font, rounded_rect,
+                                           write_png)
+
+LAYOUT_CACHE = "{stem}.layout.json"
+# zlib level 1: large diagrams compress about twice as fast as at 6, into a file about twice the size
+PNG_COMPRESS_LEVEL = 1
+# Part of the cache key: bump when layered_layout changes what it returns
+LAYOUT_VERSION = 2
+SWEEPS = 8
+NODE_FONT, EDGE_FONT, CLUSTER_FONT = 18, 14, 22
+NODE_HEIGHT, NODE_PADDING, NODE_MIN_WIDTH = 56, 24, 120
+DUMMY_WIDTH = 16
+NODE_GAP, LAYER_GAP, CLUSTER_PADDING = 40, 90, 28
+MARGIN, HEADER_HEIGHT = 60, 120
+DEFAULT_STYLE = {"fill": "#FFFFFF", "stroke": "#B0C7F2", "color": "#0B2A66", "stroke-width": "2px"}
+EDGE_COLOR = "#5B7DBF"
+
+# Node shapes by their brackets: A[rect], A(round), A([stadium]), A[(cylinder)], A((circle)), A{rhombus}
+SHAPES = [("([", "])", "stadium"), ("[(", ")]", "cylinder"), ("((", "))", "circle"),
+          ("[", "]", "rect"), ("(", ")", "round"), ("{", "}", "rhombus")]
+NODE = re.compile(r"([A-Za-z_][\w-]*)\s*(\(\[.*?\]\)|\[\(.*?\)\]|\(\(.*?\)\)|\[.*?\]|\(.*?\)|\{.*?\})?"
+                  r"(?::::([\w-]+))?")
+EDGE = re.compile(r"\s*(-->|---|-\.->|-\.-|==>|===)\s*(?:\|([^|]*)\|)?\s*")
+SUBGRAPH = re.compile(r"subgraph\s+([\w-]+)\s*(?:\[\"?(.*?)\"?\])?\s*$|subgraph\s+(.+)$")
+
+
+class Graph:
+    """A Mermaid flowchart: nodes, edges, subgraphs and classDef styles"""
+
+    def __init__(self):
+        self.direction = "TB"
+        self.nodes = {}
+        self.edges = []
+        self.clusters = {}
+        self.styles = {}
+
+    def node(self, node_id, label=None, shape=None, style=None, cluster=None):
+        node = self.nodes.setdefault(node_id, {"label": node_id, "shape": "rect", "class": None,
+                                               "cluster": cluster})
+        if label is not None:
+            node["label"], node["shape"] = label, shape
+        if style:
+            node["class"] = style
+        return node_id
+
+    def structure(self):
+        """What the layered layout depends on; labels and styles are left out"""
+        return {
+            "direction": self.direction,
+            "nodes": list(self.nodes),
+            "edges": [[src, dst] for src, dst, _ in self.edges],
+            "clusters": {node_id: node["cluster"] for node_id, node in self.nodes.items() if node["cluster"]}
+        }
+
+
+def _unquote(text):
+    text = text.strip()
+    return text[1:-1] if len(text) > 1 and text[0] == text[-1] == '"' else text
+
+
+def _parse_node(line, pos, graph, cluster):
+    match = NODE.match(line, pos)
+    if not match:
+        raise ValueError(f"expected a node at {line[pos:]!r}")
+    node_id, brackets, style = match.groups()
+    label = shape = None
+    if brackets:
+        opening, closing, shape = next(shape for shape in SHAPES
+                                       if brackets.startswith(shape[0]) and brackets.endswith(shape[1]))
+        label = _unquote(brackets[len(opening):-len(closing)])
+    return graph.node(node_id, label, shape, style, cluster), match.end()
+
+
+def parse(text):
+    """Graph of a Mermaid flowchart (the subset architecture-diagram.mmd uses, plus the usual node shapes)"""
+    graph = Graph()
+    stack = []
+    for number, raw in enumerate(text.splitlines(), 1):
+        line = raw.split("%%")[0].strip().rstrip(";")
+        if not line:
+            continue
+        try:
+            head = line.split()[0]
+            if head in ("flowchart", "graph"):
+                graph.direction = {"TD": "TB"}.get(line.split()[1], line.split()[1]) if len(line.split()) > 1 else "TB"
+            elif head == "classDef":
+                _, name, body = line.split(None, 2)
+                graph.styles[name] = dict(item.split(":", 1) for item in body.split(",") if ":" in item)
+            elif head == "class":
+                _, ids, name = line.split(None, 2)
+                for node_id in ids.split(","):
+                    graph.node(node_id.strip(), style=name.strip())
+            elif head == "subgraph":
+                match = SUBGRAPH.match(line)
+                cluster_id = match.group(1) or match.group(3).strip()
+                graph.clusters[cluster_id] = _unquote(match.group(2) or match.group(3) or cluster_id)
+                stack.append(cluster_id)
+            elif head == "end":
+                stack.pop()
+            elif head in ("direction", "style", "linkStyle", "click"):
+                continue
+            else:
+                cluster = stack[-1] if stack else None
+                src, pos = _parse_node(line, 0, graph, cluster)
+                while pos < len(line):
+                    match = EDGE.match(line, pos)
+                    if not match:
+                        raise ValueError(f"expected an edge at {line[pos:]!r}")
+                    dst, pos = _parse_node(line, match.end(), graph, cluster)
+                    graph.edges.append((src, dst, _unquote(match.group(2) or "") or None))
+                    src = dst
+        except (ValueError, IndexError, StopIteration, AttributeError) as e:
+            raise ValueError(f"line {number}: {raw.strip()}: {e}") from None
+    return graph
+
+
+def _crossings(upper, lower, edges):
+    """Edge crossings between two adjacent layers (accumulator tree, E log V)"""
+    position = {node: i for i, node in enumerate(lower)}
+    upper_index = {node: i for i, node in enumerate(upper)}
+    targets = sorted((upper_index[src], position[dst]) for src, dst in edges)
+    size = 1
+    while size < len(lower):
+        size *= 2
+    tree = [0] * (2 * size)
+    count = 0
+    for _, target in targets:
+        index = target + size
+        tree[index] += 1
+        while index > 1:
+            if index % 2 == 0:
+                count += tree[index + 1]
+            index //= 2
+            tree[index] += 1
+    return count
+
+
+def layered_layout(structure):
+    """
+    Layers of node IDs (and "~n" dummy points), each in drawing order, plus
+    every edge's route: [src, dst, [dummy points], reversed]. Depends only on
+    `structure` (Graph.structure()), so the result can be cached under it.
+    """
+    nodes, clusters = structure["nodes"], structure["clusters"]
+    successors = {node: [] for node in nodes}
+    for src, dst in structure["edges"]:
+        if src != dst:
+            successors[src].append(dst)
+
+    # Break cycles: reverse the edges DFS finds pointing back up its stack
+    state, reversed_edges = {}, set()
+    for root in nodes:
+        if root in state:
+            continue
+        state[root] = "open"
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[node] = "done"
+                stack.pop()
+            elif state.get(child) == "open":
+                reversed_edges.add((node, child))
+            elif child not in state:
+                state[child] = "open"
+                stack.append((child, iter(successors[child])))
+
+    dag = {node: [] for node in nodes}
+    predecessors = {node: [] for node in nodes}
+    for src, dst in structure["edges"]:
+        if src == dst:
+            continue
+        if (src, dst) in reversed_edges:
+            src, dst = dst, src
+        dag[src].append(dst)
+        predecessors[dst].append(src)
+
+    # Earliest layer of every node (longest path from a source), in topological order
+    earliest = {node: 0 for node in nodes}
+    waiting = {node: len(predecessors[node]) for node in nodes}
+    order = [node for node in nodes if not waiting[node]]
+    for node in order:
+        for child in dag[node]:
+            earliest[child] = max(earliest[child], earliest[node] + 1)
+            waiting[child] -= 1
+            if not waiting[child]:
+                order.append(child)
+    # ...and latest layer (longest path to a sink, counted from the bottom)
+    height = {node: 0 for node in nodes}
+    for node in reversed(order):
+        for child in dag[node]:
+            height[node] = max(height[node], height[child] + 1)
+    bottom = max(earliest.values(), default=0)
+    latest = {node: bottom - height[node] for node in nodes}
+
+    # A subgraph aims for one layer, the deepest its members' earliest layers reach, so its box spans one
+    # row where the edges allow it
+    target = {}
+    for node in nodes:
+        cluster = clusters.get(node)
+        if cluster:
+            target[cluster] = max(target.get(cluster, 0), earliest[node])
+    rank = {}
+    for node in order:
+        wanted = target[clusters[node]] if clusters.get(node) else earliest[node]
+        wanted = min(max(wanted, earliest[node]), latest[node])
+        rank[node] = max([wanted] + [rank[parent] + 1 for parent in predecessors[node]])
+    # Other sources sink to just above their nearest child, beside their siblings rather than a layer up
+    for node in reversed(order):
+        if not predecessors[node] and dag[node] and not clusters.get(node):
+            rank[node] = min(rank[child] for child in dag[node]) - 1
+
+    layers = [[] for _ in range(max(rank.values(), default=-1) + 1)]
+    for node in nodes:
+        layers[rank[node]].append(node)
+
+    # Edges spanning several layers pass through one dummy point per layer in between
+    routes, links, dummies = [], [], 0
+    for src, dst in structure["edges"]:
+        if src == dst:
+            continue
+        flipped = (src, dst) in reversed_edges
+        top, bottom = (dst, src) if flipped else (src, dst)
+        points = []
+        for layer in range(rank[top] + 1, rank[bottom]):
+            dummy = f"~{dummies}"
+            dummies += 1
+            layers[layer].append(dummy)
+            points.append(dummy)
+        chain = [top] + points + [bottom]
+        links.extend(zip(chain, chain[1:]))
+        routes.append([src, dst, points, flipped])
+
+    up = {node: [] for layer in layers for node in layer}
+    down = {node: [] for layer in layers for node in layer}
+    for upper, lower in links:
+        down[upper].append(lower)
+        up[lower].append(upper)
+    layer_links = [[(upper, lower) for upper in layers[i] for lower in down[upper]] for i in range(len(layers) - 1)]
+
+    def total_crossings():
+        return sum(_crossings(layers[i], layers[i + 1], layer_links[i]) for i in range(len(layers) - 1))
+
+    def reorder(layer, neighbours, reference):
+        position = {node: i for i, node in enumerate(reference)}
+        keys = {}
+        for i, node in enumerate(layer):
+            placed = [position[other] for other in neighbours[node]]
+            # Scaled to the reference layer's length so nodes without neighbours keep their place
+            keys[node] = sum(placed) / len(placed) if placed else i * len(reference) / max(len(layer), 1)
+        # Subgraph members stay together, ordered by their subgraph's average
+        groups = {}
+        for node in layer:
+            groups.setdefault(clusters.get(node), []).append(keys[node])
+        group_key = {cluster: sum(values) / len(values) for cluster, values in groups.items()}
+        layer.sort(key=lambda node: (group_key[clusters.get(node)] if clusters.get(node) else keys[node],
+                                     keys[node]))
+
+    best, best_crossings = [list(layer) for layer in layers], total_crossings()
+    for sweep in range(SWEEPS):
+        if sweep % 2 == 0:
+            for i in range(1, len(layers)):
+                reorder(layers[i], up, layers[i - 1])
+        else:
+            for i in range(len(layers) - 2, -1, -1):
+                reorder(layers[i], down, layers[i + 1])
+        crossings = total_crossings()
+        if crossings < best_crossings:
+            best, best_crossings = [list(layer) for layer in layers], crossings
+        if not best_crossings:
+            break
+    return {"layers": best, "routes": routes, "crossings": best_crossings}
+
+
+def structure_key(structure):
+    payload = json.dumps([LAYOUT_VERSION, SWEEPS, structure], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_layout(graph, cache_path=None):
+    """layered_layout of the graph, read from `cache_path` when its structure hasn't changed"""
+    structure = graph.structure()
+    key = structure_key(structure)
+    if cache_path:
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                return cached["layout"]
+        except (OSError, ValueError):
+            pass
+    layout = layered_layout(structure)
+    if cache_path:
+        with open(cache_path, "w") as f:
+            json.dump({"key": key, "layout": layout}, f)
+    return layout
+
+
+@lru_cache(maxsize=4096)
+def _text_width(text, size, bold=False):
+    return get_font(size, bold).getlength(text)
+
+
+def _node_size(node):
+    width = _text_width(node["label"], NODE_FONT, True) + 2 * NODE_PADDING
+    width = max(NODE_MIN_WIDTH, width)
+    if node["shape"] == "circle":
+        return width, width
+    if node["shape"] == "rhombus":
+        return width * 1.5, NODE_HEIGHT * 1.5
+    return width, NODE_HEIGHT
+
+
+def _spread(desired, extents, gaps):
+    """Positions as close to `desired` as the order and minimum gaps allow"""
+    # Average of pushing overlaps right and pushing them left; both keep the gaps, so their mean does
+    forward = list(desired)
+    for i in range(1, len(forward)):
+        forward[i] = max(forward[i], forward[i - 1] + (extents[i - 1] + extents[i]) / 2 + gaps[i])
+    backward = list(desired)
+    for i in range(len(backward) - 2, -1, -1):
+        backward[i] = min(backward[i], backward[i + 1] - (extents[i] + extents[i + 1]) / 2 - gaps[i + 1])
+    return [(a + b) / 2 for a, b in zip(forward, backward)]
+
+
+def arrange(graph, layout):
+    """
+    Coordinates for a layout: {"size", "nodes": {id: box}, "clusters": {id: box},
+    "edges": [(points, label)]}. Recomputed on every render; labels only change this.
+    """
+    horizontal = graph.direction in ("LR", "RL")
+    layers = layout["layers"]
+    clusters = {node_id: node["cluster"] for node_id, node in graph.nodes.items()}
+    sizes = {node_id: _node_size(node) for node_id, node in graph.nodes.items()}
+
+    def size(node):
+        return sizes.get(node, (DUMMY_WIDTH, DUMMY_WIDTH))
+
+    # Across = along a layer, along = from layer to layer
+    across = {node: size(node)[1 if horizontal else 0] for layer in layers for node in layer}
+    along = [max((size(node)[0 if horizontal else 1] for node in layer), default=0) for layer in layers]
+    neighbours = {node: [] for layer in layers for node in layer}
+    for src, dst, points, flipped in layout["routes"]:
+        chain = ([dst] if flipped else [src]) + points + ([src] if flipped else [dst])
+        for a, b in zip(chain, chain[1:]):
+            neighbours[a].append(b)
+            neighbours[b].append(a)
+
+    position = {}
+    for layer in layers:
+        gaps = [0] + [NODE_GAP + (2 * CLUSTER_PADDING if clusters.get(a) != clusters.get(b) else 0)
+                      for a, b in zip(layer, layer[1:])]
+        desired, x = [], 0
+        for i, node in enumerate(layer):
+            x += (across[layer[i - 1]] + across[node]) / 2 + gaps[i] if i else 0
+            desired.append(x)
+        for node, x in zip(layer, desired):
+            position[node] = x
+    # Pull each node towards its neighbours in the layers above and below, a few passes each way
+    for sweep in range(4):
+        order = layers if sweep % 2 == 0 else layers[::-1]
+        for layer in order:
+            gaps = [0] + [NODE_GAP + (2 * CLUSTER_PADDING if clusters.get(a) != clusters.get(b) else 0)
+                          for a, b in zip(layer, layer[1:])]
+            desired = []
+            for node in layer:
+                placed = [position[other] for other in neighbours[node]]
+                desired.append(sum(placed) / len(placed) if placed else position[node])
+            for node, x in zip(layer, _spread(desired, [across[node] for node in layer], gaps)):
+                position[node] = x
+
+    label_room = 30 if any(label for _, _, label in graph.edges) else 0
+    depth, offset = [], 0
+    for extent in along:
+        depth.append(offset + extent / 2)
+        offset += extent + LAYER_GAP + label_room + 2 * CLUSTER_PADDING
+
+    def centre(node, layer_index):
+        a, b = position[node], depth[layer_index]
+        return (b, a) if horizontal else (a, b)
+
+    centres = {node: centre(node, i) for i, layer in enumerate(layers) for node in layer}
+    if graph.direction in ("BT", "RL"):
+        last = offset
+        centres = {node: ((last - x, y) if horizontal else (x, last - y)) for node, (x, y) in centres.items()}
+
+    # Shift everything below the header and inside the margins
+    cluster_top = CLUSTER_PADDING + CLUSTER_FONT + 16
+    min_x = min((x - size(node)[0] / 2 for node, (x, y) in centres.items()), default=0) - CLUSTER_PADDING
+    min_y = min((y - size(node)[1] / 2 for node, (x, y) in centres.items()), default=0) - cluster_top
+    dx, dy = MARGIN - min_x, HEADER_HEIGHT + MARGIN - min_y
+    centres = {node: (x + dx, y + dy) for node, (x, y) in centres.items()}
+
+    boxes = {}
+    for node_id in graph.nodes:
+        (x, y), (w, h) = centres[node_id], sizes[node_id]
+        boxes[node_id] = (x - w / 2, y - h / 2, x + w / 2, y + h / 2)
+
+    cluster_boxes = {}
+    for node_id, cluster in clusters.items():
+        if cluster:
+            x1, y1, x2, y2 = boxes[node_id]
+            box = cluster_boxes.get(cluster, (x1, y1, x2, y2))
+            cluster_boxes[cluster] = (min(box[0], x1), min(box[1], y1), max(box[2], x2), max(box[3], y2))
+    cluster_boxes = {cluster: (x1 - CLUSTER_PADDING, y1 - cluster_top, x2 + CLUSTER_PADDING, y2 + CLUSTER_PADDING)
+                     for cluster, (x1, y1, x2, y2) in cluster_boxes.items()}
+
+    def port(node, towards):
+        # Where the edge leaves or enters the node's box, on the side facing `towards`
+        x1, y1, x2, y2 = boxes.get(node) or (*centres[node], *centres[node])
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        if horizontal:
+            return (x2 if towards[0] > cx else x1), cy
+        return cx, (y2 if towards[1] > cy else y1)
+
+    edges = []
+    for (src, dst, points, flipped), (_, _, label) in zip(layout["routes"], [e for e in graph.edges if e[0] != e[1]]):
+        middle = [centres[point] for point in (points[::-1] if flipped else points)]
+        start = port(src, middle[0] if middle else centres[dst])
+        end = port(dst, middle[-1] if middle else centres[src])
+        edges.append(([start] + middle + [end], label))
+
+    boxes_and_clusters = list(boxes.values()) + list(cluster_boxes.values())
+    width = max((box[2] for box in boxes_and_clusters), default=0) + MARGIN
+    height = max((box[3] for box in boxes_and_clusters), default=0) + MARGIN
+    return {"size": (max(int(width), 800), int(height)), "nodes": boxes, "clusters": cluster_boxes, "edges": edges}
+
+
+def _style(graph, node):
+    style = dict(DEFAULT_STYLE, **graph.styles.get(node["class"], {}))
+    width = float(re.sub(r"[^\d.]", "", style["stroke-width"]) or 2)
+    return style["fill"], style["stroke"], style["color"], max(2, round(width * 1.4))
+
+
+def draw_graph(draw, graph, placed, title):
+    """Everything on the diagram, through a Canvas"""
+    w, h = placed["size"]
+    draw_gradient(draw, w, h, (248, 251, 255), (236, 243, 255))
+
+    # Header ribbon
+    draw.rectangle([0, 0, w, HEADER_HEIGHT - 20], fill="#0B2A66")
+    draw.text((MARGIN, 28), title, font=get_font(40, True), fill="#FFFFFF")
+
+    for cluster, box in placed["clusters"].items():
+        rounded_rect(draw, box, 18, "#FFFFFF", outline="#B0C7F2", width=3)
+        draw.text((box[0] + 20, box[1] + 12), graph.clusters.get(cluster, cluster),
+                  font=get_font(CLUSTER_FONT, True), fill="#0B2A66")
+
+    label_font = get_font(EDGE_FONT)
+    for points, label in placed["edges"]:
+        for start, end in zip(points[:-2], points[1:-1]):
+            draw.line([start, end], fill=EDGE_COLOR, width=3)
+        arrow(draw, points[-2], points[-1], EDGE_COLOR, width=3, head=12)
+        if label:
+            (x1, y1), (x2, y2) = points[len(points) // 2 - 1], points[len(points) // 2]
+            tx, ty = (x1 + x2) / 2, (y1 + y2) / 2
+            half = _text_width(label, EDGE_FONT) / 2
+            rounded_rect(draw, (tx - half - 6, ty - 11, tx + half + 6, ty + 11), 8, "#FFFFFF", outline="#DCE6FF",
+                         width=1)
+            draw.text((tx - half, ty - 9), label, font=label_font, fill="#4A5568")
+
+    node_font = get_font(NODE_FONT, True)
+    for node_id, box in placed["nodes"].items():
+        node = graph.nodes[node_id]
+        fill, stroke, color, width = _style(graph, node)
+        x1, y1, x2, y2 = box
+        if node["shape"] == "circle":
+            draw.ellipse(box, fill=fill, outline=stroke, width=width)
+        elif node["shape"] == "rhombus":
+            cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+            draw.polygon([(cx, y1), (x2, cy), (cx, y2), (x1, cy)], fill=fill, outline=stroke)
+        else:
+            radius = {"stadium": (y2 - y1) / 2, "round": 20}.get(node["shape"], 12)
+            rounded_rect(draw, box, radius, fill, outline=stroke, width=width)
+            if node["shape"] == "cylinder":
+                draw.ellipse((x1, y1, x2, y1 + 16), fill=fill, outline=stroke, width=width)
+        text_width = _text_width(node["label"], NODE_FONT, True)
+        draw.text(((x1 + x2 - text_width) / 2, (y1 + y2) / 2 - NODE_FONT * 0.6), node["label"], font=node_font,
+                  fill=color)
+
+
+def render(graph, placed, title, path, scale=1, compress_level=PNG_COMPRESS_LEVEL):
+    """Draw to `path` (PNGs in bands of about TILE_PIXELS, other formats whole); returns the size in pixels"""
+    width, height = round(placed["size"][0] * scale), round(placed["size"][1] * scale)
+    if not path.lower().endswith(".png"):
+        image = Image.new("RGB", (width, height), BACKGROUND)
+        draw_graph(Canvas(image, scale), graph, placed, title)
+        image.save(path)
+        return width, height
+
+    def bands():
+        rows = max(1, TILE_PIXELS // width)
+        for top in range(0, height, rows):
+            band = Image.new("RGB", (width, min(rows, height - top)), BACKGROUND)
+            draw_graph(Canvas(band, scale, origin=(0, top)), graph, placed, title)
+            yield band
+    write_png(path, width, height, bands(), compress_level)
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draw a Mermaid flowchart in the styled diagram look")
+    parser.add_argument("source", nargs="?", default="architecture-diagram.mmd")
+    parser.add_argument("--output", help="default: the source's name with .png")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--title", default="Architecture Diagram")
+    parser.add_argument("--compress-level", type=int, default=PNG_COMPRESS_LEVEL, choices=range(10),
+                        help="PNG zlib level; 6 or 9 for a smaller file, at about twice the time or more")
+    parser.add_argument("--no-cache", action="store_true", help="lay the graph out even if its structure is cached")
+    args = parser.parse_args()
+
+    stem = os.path.splitext(args.source)[0]
+    output = args.output or f"{stem}.png"
+    cache_path = None if args.no_cache else os.path.join(os.path.dirname(output) or ".",
+                                                           LAYOUT_CACHE.format(stem=os.path.basename(stem)))
+    with open(args.source, encoding="utf-8") as f:
+        graph = parse(f.read())
+    layout = cached_layout(graph, cache_path)
+    width, height = render(graph, arrange(graph, layout), args.title, output, args.scale,
+                           args.compress_level)
+    print(f"Wrote {output} ({width}x{height}, {len(graph.nodes)} nodes, {layout['crossings']} crossings)")
+
+
+if __name__ == "__main__":
+    main()
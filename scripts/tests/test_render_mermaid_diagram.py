@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from render_mermaid_diagram import arrange, cached_layout, layered_layout, parse
+
+CHART = """
+flowchart TD
+  classDef api fill:#FFF3E0,stroke:#EF6C00;
+  subgraph Backend["Backend"]
+    API([API]) -->|calls| DB[(Database)]
+  end
+  UI[Web UI]:::api --> API
+  API --> ML((Model))
+"""
+
+
+def rank(layout):
+    return {node: i for i, layer in enumerate(layout["layers"]) for node in layer}
+
+
+def test_parse_reads_shapes_edges_subgraphs_and_classes():
+    graph = parse(CHART)
+
+    assert graph.direction == "TB"
+    assert graph.nodes["API"]["shape"] == "stadium"
+    assert graph.nodes["DB"]["shape"] == "cylinder"
+    assert graph.nodes["ML"]["shape"] == "circle"
+    assert graph.nodes["UI"]["class"] == "api"
+    assert graph.nodes["DB"]["cluster"] == "Backend"
+    assert graph.clusters == {"Backend": "Backend"}
+    assert ("API", "DB", "calls") in graph.edges
+
+
+def test_parse_reports_the_line_it_cannot_read():
+    with pytest.raises(ValueError, match="line 2"):
+        parse("flowchart TB\n  A --> [oops]")
+
+
+def test_every_edge_points_down_and_long_edges_get_dummy_points():
+    layout = layered_layout(parse("flowchart TB\n A --> B\n B --> C\n A --> C").structure())
+    ranks = rank(layout)
+
+    assert ranks["A"] < ranks["B"] < ranks["C"]
+    long_edge = next(route for route in layout["routes"] if route[:2] == ["A", "C"])
+    assert len(long_edge[2]) == ranks["C"] - ranks["A"] - 1
+
+
+def test_cycles_are_broken_by_reversing_an_edge():
+    layout = layered_layout(parse("flowchart TB\n A --> B\n B --> C\n C --> A").structure())
+    ranks = rank(layout)
+
+    assert len(set(ranks.values()) & {ranks["A"], ranks["B"], ranks["C"]}) == 3
+    assert sum(route[3] for route in layout["routes"]) == 1
+
+
+def test_sweeps_undo_a_crossing():
+    # Declared in an order whose two edges cross
+    layout = layered_layout(parse("flowchart TB\n A\n B\n C\n D\n A --> D\n B --> C").structure())
+
+    assert layout["crossings"] == 0
+    assert layout["layers"][1].index("D") < layout["layers"][1].index("C")
+
+
+def test_relabelling_reuses_the_cached_layout(tmp_path, monkeypatch):
+    cache = str(tmp_path / "chart.layout.json")
+    first = cached_layout(parse(CHART), cache)
+
+    import render_mermaid_diagram
+    monkeypatch.setattr(render_mermaid_diagram, "layered_layout",
+                        lambda structure: pytest.fail("layout recomputed for a relabel"))
+    relabelled = parse(CHART.replace("Web UI", "Browser").replace("Model", "Predictor"))
+    assert cached_layout(relabelled, cache) == first
+
+
+def test_a_new_edge_invalidates_the_cache(tmp_path):
+    cache = str(tmp_path / "chart.layout.json")
+    cached_layout(parse(CHART), cache)
+
+    layout = cached_layout(parse(CHART + "  ML --> DB\n"), cache)
+    assert ["ML", "DB", [], False] in layout["routes"]
+
+
+def test_arrange_places_every_node_inside_the_canvas():
+    graph = parse(CHART)
+    placed = arrange(graph, cached_layout(graph))
+    width, height = placed["size"]
+
+    assert set(placed["nodes"]) == set(graph.nodes)
+    for x1, y1, x2, y2 in placed["nodes"].values():
+        assert 0 <= x1 < x2 <= width and 0 <= y1 < y2 <= height
+    assert len(placed["edges"]) == len(graph.edges)
+
+
+def test_render_writes_the_drawing_as_a_banded_png(tmp_path, monkeypatch):
+    import render_mermaid_diagram
+    from generate_architecture_diagram import Canvas
+    from PIL import Image
+
+    graph = parse(CHART)
+    placed = arrange(graph, cached_layout(graph))
+    whole = Image.new("RGB", placed["size"], render_mermaid_diagram.BACKGROUND)
+    render_mermaid_diagram.draw_graph(Canvas(whole), graph, placed, "Chart")
+
+    # Bands of a few dozen rows, so that shapes straddle band edges
+    monkeypatch.setattr(render_mermaid_diagram, "TILE_PIXELS", placed["size"][0] * 37)
+    path = str(tmp_path / "chart.png")
+    assert render_mermaid_diagram.render(graph, placed, "Chart", path) == placed["size"]
+    with Image.open(path) as written:
+        different = (np.asarray(written) != np.asarray(whole)).any(axis=2)
+    # Pillow can place a wide diagonal line's edge pixels one off once it is shifted into a band
+    assert different.sum() <= 4
@@ -0,0 +1,379 @@
+"""
+HTTP client for the backend and ML service.
+
+Streamlit reruns the whole script on every widget interaction, so anything
+created per call is created per click. This module keeps one pooled
+`requests.Session` per server process (`st.cache_resource`), applies
+timeouts and jittered retries to every call, and caches read-only GETs with
+`st.cache_data`, keyed on the URL, query, user token and a per-session
+generation that writes bump. A rerun that needs the same data makes no
+network call until the TTL expires or this session writes something.
+
+Tail latency and failing upstreams:
+  - `page_budget` gives a page a total latency budget; every call inside it
+    (including fan_out workers) is cut off when the budget is spent
+  - GETs are hedged: if one is still running after the endpoint's observed
+    p95, an identical second request is sent and the first answer wins
+  - a circuit breaker per upstream host fails calls fast after repeated
+    errors, and get_json / query_json then serve the last good answer
+"""
+import contextvars
+import json
+import os
+import random
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from time import monotonic
+from urllib.parse import urlsplit
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from tracing import traced_request
+
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "15"))
+RETRIES = int(os.getenv("API_RETRIES", "3"))
+BACKOFF_SECONDS = 0.3
+CACHE_TTL_SECONDS = int(os.getenv("API_CACHE_TTL", "60"))
+POOL_SIZE = 10
+RETRY_STATUSES = (502, 503, 504)
+HEDGING = os.getenv("API_HEDGE", "1") == "1"
+HEDGED_METHODS = ("GET", "HEAD")
+# No hedging until an endpoint has this many samples, nor sooner than the floor
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_SECONDS = 0.05
+# Hedges may add at most this share of extra GETs, so a slow upstream isn't doubled
+HEDGE_MAX_RATIO = float(os.getenv("API_HEDGE_MAX_RATIO", "0.1"))
+LATENCY_WINDOW = 200
+BREAKER_FAILURES = int(os.getenv("API_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("API_BREAKER_COOLDOWN", "30"))
+LAST_GOOD_ENTRIES = 1000
+
+_deadline = contextvars.ContextVar("api_deadline", default=None)
+
+
+class ApiError(Exception):
+    """A non-2xx response; `payload` is the decoded error body when there is one"""
+
+    def __init__(self, status_code, payload=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.payload = payload or {}
+
+
+class BudgetExceeded(requests.Timeout):
+    """The page's latency budget was spent before this call could be made"""
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The upstream failed repeatedly; calls fail fast until its cooldown ends"""
+
+
+class JitteredRetry(Retry):
+    """Full jitter: sleep a random time up to the exponential backoff, so reruns don't retry in lockstep"""
+
+    def get_backoff_time(self):
+        backoff = random.uniform(0, super().get_backoff_time())
+        left = remaining()
+        return backoff if left is None else min(backoff, left)
+
+    def is_exhausted(self):
+        # urllib3 retries in the calling thread, so the page budget is visible here
+        left = remaining()
+        return super().is_exhausted() or (left is not None and left <= 0)
+
+
+@st.cache_resource(show_spinner=False)
+def session():
+    """One keep-alive connection pool per host, shared by every session of this server"""
+    retry = JitteredRetry(
+        total=RETRIES,
+        # Connection failures are retried for any method; the request never reached the server
+        connect=RETRIES,
+        # Read errors and gateway statuses only for methods that are safe to repeat
+        read=RETRIES,
+        status=RETRIES,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}),
+        backoff_factor=BACKOFF_SECONDS,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    http = requests.Session()
+    http.mount("http://", adapter)
+    http.mount("https://", adapter)
+    return http
+
+
+class LatencyTracker:
+    """Recent latencies per endpoint, for the hedging delay"""
+
+    def __init__(self):
+        self._samples = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def hedge_delay(self, endpoint):
+        """Seconds to wait before hedging a call to `endpoint`, or None to not hedge it"""
+        with self._lock:
+            self.requests += 1
+            samples = self._samples.get(endpoint)
+            if not samples or len(samples) < HEDGE_MIN_SAMPLES or self.hedges >= self.requests * HEDGE_MAX_RATIO:
+                return None
+            ordered = sorted(samples)
+        return max(HEDGE_MIN_DELAY_SECONDS, ordered[int(len(ordered) * 0.95)])
+
+    def hedged(self):
+        with self._lock:
+            self.hedges += 1
+
+
+class CircuitBreaker:
+    """Closed, open after BREAKER_FAILURES failures in a row, half-open (one trial call) after the cooldown"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or monotonic() - self.opened_at < BREAKER_COOLDOWN_SECONDS:
+                return False
+            self.trial = True
+            return True
+
+    def record(self, ok):
+        """Outcome of an allowed call; None when it ended without saying whether the upstream is healthy"""
+        with self._lock:
+            self.trial = False
+            if ok is None:
+                return
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= BREAKER_FAILURES:
+                self.opened_at = monotonic()
+
+
+@st.cache_resource(show_spinner=False)
+def _latency():
+    return LatencyTracker()
+
+
+@st.cache_resource(show_spinner=False)
+def _breakers():
+    return {}
+
+
+@st.cache_resource(show_spinner=False)
+def _hedge_pool():
+    # Separate from fan_out's pool: fan_out workers block on these attempts
+    return ThreadPoolExecutor(max_workers=2 * POOL_SIZE, thread_name_prefix="api-hedge")
+
+
+def _breaker(host):
+    breakers = _breakers()
+    breaker = breakers.get(host)
+    if breaker is None:
+        breaker = breakers.setdefault(host, CircuitBreaker())
+    return breaker
+
+
+def open_circuits():
+    """Upstream hosts currently failing fast"""
+    return sorted(host for host, breaker in _breakers().items() if breaker.is_open)
+
+
+@contextmanager
+def page_budget(seconds):
+    """Calls inside share `seconds` of latency in total; None lifts the budget (long uploads)"""
+    token = _deadline.set(None if seconds is None else monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(default=None):
+    """Seconds left in the current page budget, or `default` outside one"""
+    deadline = _deadline.get()
+    return default if deadline is None else max(0.0, deadline - monotonic())
+
+
+def _budgeted(timeout):
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    left = remaining()
+    if left is None:
+        return connect, read
+    if left <= 0:
+        raise BudgetExceeded("page latency budget spent")
+    return min(connect, left), min(read, left)
+
+
+def _headers(token):
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def _send(http, tracker, method, url, endpoint, **kwargs):
+    started = monotonic()
+    response = traced_request(method, url, session=http, **kwargs)
+    tracker.record(endpoint, monotonic() - started)
+    return response
+
+
+def _discard(future):
+    if future.exception() is None:
+        future.result().close()
+
+
+def _hedged(http, tracker, method, url, endpoint, **kwargs):
+    """First answer of the call and, if it is slower than the endpoint's p95, an identical copy"""
+    delay = tracker.hedge_delay(endpoint) if HEDGING else None
+    if delay is None:
+        return _send(http, tracker, method, url, endpoint, **kwargs)
+    pool = _hedge_pool()
+    args = (_send, http, tracker, method, url, endpoint)
+    # Each attempt gets its own copy of the context (trace span, page budget)
+    attempts = [pool.submit(contextvars.copy_context().run, *args, **kwargs)]
+    done, _ = wait(attempts, timeout=delay)
+    if not done:
+        tracker.hedged()
+        attempts.append(pool.submit(contextvars.copy_context().run, *args, **kwargs))
+    pending = set(attempts)
+    while True:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.add_done_callback(_discard)
+                return future.result()
+        if not pending:
+            raise next(iter(done)).exception()
+
+
+def request(method, url, token=None, read_only=False, **kwargs):
+    """Any call through the pooled session; returns the `requests.Response`.
+
+    A successful non-GET counts as a write and invalidates this session's
+    cached reads unless `read_only` says it only computes something. Raises
+    BudgetExceeded when the page budget is spent and CircuitOpenError while
+    the upstream's breaker is open.
+    """
+    kwargs["timeout"] = _budgeted(kwargs.get("timeout"))
+    headers = {**_headers(token), **(kwargs.pop("headers", None) or {})}
+    parts = urlsplit(url)
+    breaker = _breaker(parts.netloc)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{parts.netloc} is failing; retrying after {BREAKER_COOLDOWN_SECONDS:.0f}s")
+    endpoint = f"{method} {parts.netloc}{parts.path}"
+    send = _hedged if method in HEDGED_METHODS else _send
+    try:
+        response = send(session(), _latency(), method, url, endpoint, headers=headers, **kwargs)
+    except Exception:
+        # A call the page budget cut short says nothing about the upstream's health
+        breaker.record(None if remaining() == 0 else False)
+        raise
+    breaker.record(response.status_code < 500)
+    if method != "GET" and not read_only and response.status_code < 400:
+        invalidate()
+    return response
+
+
+def post(url, token=None, **kwargs):
+    return request("POST", url, token, **kwargs)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False, max_entries=1000)
+def _cached_call(method, url, params, body, token, generation, timeout):
+    response = request(method, url, token, read_only=True, params=params, json=body, timeout=timeout)
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = None
+    # Raising keeps failures out of the cache
+    if response.status_code >= 300:
+        raise ApiError(response.status_code, payload)
+    return payload
+
+
+class LastGood:
+    """The last successful payload per cached call, served while its upstream is failing"""
+
+    def __init__(self, max_entries=LAST_GOOD_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key, payload):
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key, _MISSING)
+
+
+_MISSING = object()
+
+
+@st.cache_resource(show_spinner=False)
+def _last_good():
+    return LastGood()
+
+
+def _with_fallback(method, url, params, body, token, timeout):
+    key = (method, url, params, json.dumps(body, sort_keys=True), token)
+    try:
+        payload = _cached_call(method, url, params, body, token, st.session_state.get("api_generation", 0),
+                               timeout or (CONNECT_TIMEOUT, READ_TIMEOUT))
+    except (requests.RequestException, ApiError) as e:
+        # Client errors (404, 401) are answers, not outages
+        if isinstance(e, ApiError) and e.status_code < 500:
+            raise
+        payload = _last_good().get(key)
+        if payload is _MISSING:
+            raise
+        return payload
+    _last_good().put(key, payload)
+    return payload
+
+
+def get_json(url, token=None, params=None, timeout=None):
+    """Decoded JSON of a GET, served from the cache while it is fresh; raises ApiError on non-2xx"""
+    # Sorted items make the cache key independent of dict order
+    return _with_fallback("GET", url, tuple(sorted((params or {}).items())), None, token, timeout)
+
+
+def query_json(url, token=None, json=None, timeout=None):
+    """Like get_json, for POST endpoints that compute a result without storing anything"""
+    return _with_fallback("POST", url, (), json, token, timeout)
+
+
+def invalidate():
+    """Make this session's next GETs go to the network (called after every successful write)"""
+    st.session_state["api_generation"] = st.session_state.get("api_generation", 0) + 1
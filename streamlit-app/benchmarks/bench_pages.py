@@ -0,0 +1,144 @@
+"""
+Cold start and rerun latency of the Streamlit app, before and after a change.
+
+Runs the working tree's app and the app as of a git revision (--baseline,
+default HEAD) against a local stub of the backend and ML service, with
+streamlit.testing's AppTest. For each version it reports:
+  - cold_login_ms / cold_dashboard_ms: first script run in a fresh
+    interpreter (what a new server process pays), logged out and logged in
+  - login_modules: modules loaded after rendering the login screen, and
+    whether pandas / plotly were among them
+  - rerun_ms: median full-script rerun per page once it has been visited
+
+AppTest always reruns the whole script, so rerun_ms is the cost of an
+interaction outside a fragment; one inside an st.fragment only reruns the
+fragment's function. AppTest also recompiles app.py on every run, which a
+real server caches, so a long app.py weighs more here than in production.
+
+    python benchmarks/bench_pages.py [--baseline HEAD~1] [--runs 5] [--reruns 20]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+from fault_stub import USER, FaultStub
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+REPO_DIR = os.path.dirname(APP_DIR)
+PAGES = ["Dashboard", "Health Data Entry", "AI Predictions", "Nutrition Plan", "Medical Documents", "Profile"]
+
+# Runs in a fresh interpreter per measurement; prints one JSON line
+CHILD = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app, logged_in, pages, reruns = sys.argv[1], sys.argv[2] == "1", json.loads(sys.argv[3]), int(sys.argv[4])
+baseline_modules = set(sys.modules)
+at = AppTest.from_file(app, default_timeout=60)
+if logged_in:
+    at.session_state.logged_in = True
+    at.session_state.user_token = "bench"
+    at.session_state.user_data = json.loads(sys.argv[5])
+first = time.perf_counter()
+at.run()
+result = {"first_ms": (time.perf_counter() - first) * 1000, "exceptions": [e.value for e in at.exception]}
+loaded = set(sys.modules) - baseline_modules
+result["modules"] = len(loaded)
+result["heavy"] = sorted(name for name in ("pandas", "plotly", "numpy") if name in loaded)
+rerun = {}
+for page in pages:
+    at.sidebar.radio[0].set_value(page).run()
+    times = []
+    for _ in range(reruns):
+        t = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - t) * 1000)
+    rerun[page] = sorted(times)[len(times) // 2]
+result["rerun_ms"] = rerun
+print(json.dumps(result))
+"""
+
+
+def extract(revision, target):
+    """The streamlit-app directory as of `revision`, under `target`"""
+    archive = subprocess.run(["git", "archive", revision, "streamlit-app"], cwd=REPO_DIR,
+                             capture_output=True, check=True).stdout
+    archive_path = os.path.join(target, "app.tar")
+    with open(archive_path, "wb") as f:
+        f.write(archive)
+    with tarfile.open(archive_path) as tar:
+        tar.extractall(target)
+    return os.path.join(target, "streamlit-app")
+
+
+def point_at_stub(app_dir, url):
+    # Older revisions hard-code the service URLs in app.py
+    path = os.path.join(app_dir, "app.py")
+    with open(path) as f:
+        source = f.read()
+    for default in ("http://localhost:5000/api", "http://localhost:5001/api"):
+        source = source.replace(f'"{default}"', f'"{url}"')
+    with open(path, "w") as f:
+        f.write(source)
+
+
+def measure(app_dir, env, logged_in, pages, reruns):
+    out = subprocess.run([sys.executable, "-c", CHILD, os.path.join(app_dir, "app.py"), "1" if logged_in else "0",
+                          json.dumps(pages), str(reruns), json.dumps(USER)],
+                         cwd=app_dir, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def profile_version(app_dir, env, runs, reruns):
+    login = [measure(app_dir, env, False, [], 0) for _ in range(runs)]
+    dashboard = [measure(app_dir, env, True, [], 0) for _ in range(runs)]
+    pages = measure(app_dir, env, True, PAGES, reruns)
+    exceptions = [e for run in login + dashboard + [pages] for e in run["exceptions"]]
+    return {
+        "cold_login_ms": round(median([run["first_ms"] for run in login]), 1),
+        "cold_dashboard_ms": round(median([run["first_ms"] for run in dashboard]), 1),
+        "login_modules": {"count": login[0]["modules"], "heavy": login[0]["heavy"]},
+        "rerun_ms": {page: round(ms, 1) for page, ms in pages["rerun_ms"].items()},
+        "exceptions": exceptions
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--baseline", default="HEAD", help="git revision to compare the working tree with")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per cold-start figure")
+    parser.add_argument("--reruns", type=int, default=20, help="reruns per page")
+    args = parser.parse_args()
+
+    server = FaultStub().start()
+    url = server.url
+    env = dict(os.environ, BACKEND_URL=url, ML_URL=url, TRACING_ENABLED="0",
+               ML_SERVICE_DIR=os.path.join(REPO_DIR, "ml-service"))
+
+    workdir = tempfile.mkdtemp(prefix="medtwin-pages-")
+    try:
+        baseline_dir = extract(args.baseline, workdir)
+        point_at_stub(baseline_dir, url)
+        results = {
+            f"baseline ({args.baseline})": profile_version(baseline_dir, env, args.runs, args.reruns),
+            "working tree": profile_version(APP_DIR, env, args.runs, args.reruns)
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
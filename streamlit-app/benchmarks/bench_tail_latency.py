@@ -0,0 +1,109 @@
+"""
+Tail latency and failure handling of api_client against a faulty upstream.
+
+Runs api_client against benchmarks/fault_stub.py and reports:
+  - tail: p50/p95/p99/max of sequential GETs when a share of requests is
+    slow, with hedging off and on, and how many hedges were sent. Hedges go
+    out after the observed p95, so they cut the tail only when fewer than 5%
+    of requests are slow
+  - budget: how long a GET to an upstream that takes longer than the page
+    budget blocks, and what it raises
+  - breaker: per-call latency once the upstream is down, and whether
+    get_json served the last good answer
+
+    python benchmarks/bench_tail_latency.py [--requests 400] [--latency 0.02] [--tail-rate 0.02] [--tail-latency 1]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+os.environ.setdefault("TRACING_ENABLED", "0")
+
+import api_client as api  # noqa: E402
+from fault_stub import FaultStub  # noqa: E402
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 1)
+    return {"p50_ms": pick(0.5), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": round(ordered[-1] * 1000, 1)}
+
+
+def tail(server, requests_count, hedging):
+    api.HEDGING = hedging
+    api._latency.clear()
+    url = f"{server.url}/health/latest"
+    # Warm-up: the tracker needs samples before it hedges
+    for _ in range(api.HEDGE_MIN_SAMPLES):
+        api.request("GET", url)
+    before = server.requests
+    samples = []
+    for _ in range(requests_count):
+        started = time.perf_counter()
+        api.request("GET", url).close()
+        samples.append(time.perf_counter() - started)
+    return {**percentiles(samples), "hedges": api._latency().hedges, "upstream_requests": server.requests - before}
+
+
+def budget(server, seconds):
+    server.set_faults(latency=seconds * 3, tail_rate=0.0, error_rate=0.0)
+    started = time.perf_counter()
+    try:
+        with api.page_budget(seconds):
+            api.request("GET", f"{server.url}/user/profile")
+        outcome = "answered"
+    except Exception as e:
+        outcome = type(e).__name__
+    return {"budget_ms": seconds * 1000, "blocked_ms": round((time.perf_counter() - started) * 1000, 1),
+            "outcome": outcome}
+
+
+def breaker(server, calls):
+    server.set_faults(latency=0.0, tail_rate=0.0, error_rate=0.0, down=False)
+    url = f"{server.url}/documents"
+    fresh = api.get_json(url, token="bench")
+    server.set_faults(down=True)
+    results = []
+    for _ in range(calls):
+        # Past the cache, as if the TTL had expired on every call
+        api._cached_call.clear()
+        started = time.perf_counter()
+        try:
+            stale = api.get_json(url, token="bench") == fresh
+        except Exception as e:
+            stale = type(e).__name__
+        results.append({"ms": round((time.perf_counter() - started) * 1000, 1), "served_last_good": stale})
+    return {"calls": results, "open_circuits": api.open_circuits()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=400, help="GETs per tail measurement")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds a normal request takes")
+    parser.add_argument("--tail-rate", type=float, default=0.02, help="share of requests that are slow")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="seconds a slow request takes")
+    args = parser.parse_args()
+
+    server = FaultStub(latency=args.latency, tail_rate=args.tail_rate, tail_latency=args.tail_latency).start()
+    try:
+        results = {
+            "tail": {
+                "hedging off": tail(server, args.requests, False),
+                "hedging on": tail(server, args.requests, True)
+            },
+            "budget": budget(server, 0.5),
+            "breaker": breaker(server, api.BREAKER_FAILURES + 3)
+        }
+    finally:
+        server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Stub of the backend and ML service that answers slowly or fails on demand.
+
+Serves canned responses for every endpoint the pages call, with injected
+faults:
+  - latency: every request waits this long (seconds)
+  - tail_rate / tail_latency: that share of requests waits tail_latency instead
+  - error_rate: that share of requests answers 503
+  - down: every request answers 503
+
+Faults can be changed while it runs: POST /__faults with a JSON object of the
+fields to change (GET /__faults shows them, plus request counts).
+
+    python benchmarks/fault_stub.py --port 5000 --latency 0.02 --tail-rate 0.02 --tail-latency 1
+    BACKEND_URL=http://127.0.0.1:5000/api ML_URL=http://127.0.0.1:5000/api streamlit run app.py
+"""
+import argparse
+import http.server
+import json
+import random
+import threading
+import time
+
+USER = {"id": "bench-user", "email": "bench@example.com"}
+READING = {"metrics": {"heartRate": 72, "bloodPressureSystolic": 118, "bloodPressureDiastolic": 78,
+                       "oxygenSaturation": 98, "sleepHours": 7.2, "stressLevel": 4, "steps": 8000},
+           "prediction": {"overallHealthScore": 88, "riskLevel": "Low", "recommendations": ["Keep it up"]}}
+PROFILE = {"email": USER["email"], "profile": {"name": "Bench", "age": 35, "gender": "Female",
+                                                "occupation": "Teacher", "height": 165, "weight": 60}}
+STUB_RESPONSES = {
+    "/api/health/latest": READING,
+    "/api/user/profile": PROFILE,
+    "/api/documents": [],
+    "/api/predictions/nutrition": {"recommendations": {}},
+    "/api/trends": {"trend": None},
+    "/api/predictions/history": {"points": {"t": [], "v": []}, "last": None, "more": False}
+}
+DEFAULT_FAULTS = {"latency": 0.0, "tail_rate": 0.0, "tail_latency": 0.0, "error_rate": 0.0, "down": False}
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, each reply waits out a delayed ACK
+    disable_nagle_algorithm = True
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting (a timeout or a losing hedge)
+            self.close_connection = True
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = self.path.split("?")[0]
+        server = self.server
+        if path == "/__faults":
+            if self.command == "POST":
+                server.set_faults(**json.loads(body or b"{}"))
+            self._send(200, {**server.faults, "requests": server.requests, "failed": server.failed})
+            return
+
+        faults = server.count()
+        slow = random.random() < faults["tail_rate"]
+        time.sleep(faults["tail_latency"] if slow else faults["latency"])
+        if faults["down"] or random.random() < faults["error_rate"]:
+            with server.lock:
+                server.failed += 1
+            self._send(503, {"error": "injected fault"})
+            return
+        self._send(200, STUB_RESPONSES.get(path, {}))
+
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class FaultStub(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), **faults):
+        super().__init__(address, StubHandler)
+        self.lock = threading.Lock()
+        self.faults = dict(DEFAULT_FAULTS)
+        self.requests = 0
+        self.failed = 0
+        self.set_faults(**faults)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def set_faults(self, **faults):
+        unknown = set(faults) - set(DEFAULT_FAULTS)
+        if unknown:
+            raise ValueError(f"unknown faults: {', '.join(sorted(unknown))}")
+        with self.lock:
+            self.faults.update(faults)
+
+    def count(self):
+        """Counts a request; returns the faults to apply to it"""
+        with self.lock:
+            self.requests += 1
+            return dict(self.faults)
+
+    def start(self):
+        """Serve from a daemon thread; returns self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every request waits")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="share of requests that are slow")
+    parser.add_argument("--tail-latency", type=float, default=0.0, help="seconds a slow request waits")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answering 503")
+    parser.add_argument("--down", action="store_true", help="answer 503 to everything")
+    args = parser.parse_args()
+
+    server = FaultStub((args.host, args.port), latency=args.latency, tail_rate=args.tail_rate,
+                       tail_latency=args.tail_latency, error_rate=args.error_rate, down=args.down)
+    print(f"Fault stub on {server.url}; POST /__faults to change faults", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
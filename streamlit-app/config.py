@@ -0,0 +1,5 @@
+"""Service endpoints shared by the app shell and every page"""
+import os
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:5000/api")
+ML_URL = os.getenv("ML_URL", "http://localhost:5001/api")
@@ -0,0 +1,120 @@
+"""
+Health predictions and nutrition plans, in process when possible.
+
+On a single machine (START_STREAMLIT.bat) the ML service's engines are
+imported straight from ../ml-service and kept in `st.cache_resource`, so a
+prediction is a function call rather than an HTTP round trip to ML_URL.
+Results are memoized per input with `st.cache_data`. When the engines can't
+be imported (a Streamlit-only deployment without ../ml-service) or
+EMBEDDED_ENGINES=0, the same functions call the ML service over HTTP instead;
+the fallback is logged. The engines need nothing beyond this app's
+requirements.
+
+    EMBEDDED_ENGINES=auto   embed when importable (default); 1 = require; 0 = always HTTP
+    ML_SERVICE_DIR          where to import the engines from (default ../ml-service)
+"""
+import logging
+import os
+import sys
+from datetime import datetime
+
+import streamlit as st
+
+import api_client as api
+from config import ML_URL
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ML_SERVICE_DIR = os.getenv("ML_SERVICE_DIR", os.path.join(os.path.dirname(APP_DIR), "ml-service"))
+EMBEDDED_ENGINES = os.getenv("EMBEDDED_ENGINES", "auto").lower()
+MEMO_ENTRIES = 1000
+
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource(show_spinner=False)
+def _engines():
+    """(HealthPredictor, NutritionRecommender), or None when they can't be imported"""
+    if EMBEDDED_ENGINES in ("0", "false", "off"):
+        return None
+    # Appended, so this app's own modules (tracing) keep precedence over the service's
+    if ML_SERVICE_DIR not in sys.path:
+        sys.path.append(ML_SERVICE_DIR)
+    try:
+        from nutrition_engine import NutritionRecommender
+        from prediction_engine import HealthPredictor
+    except ImportError as e:
+        if EMBEDDED_ENGINES in ("1", "true", "on"):
+            raise
+        logger.warning("ML engines not importable from %s (%s); calling the ML service at %s", ML_SERVICE_DIR, e,
+                       ML_URL)
+        return None
+    return HealthPredictor(), NutritionRecommender()
+
+
+def embedded():
+    return _engines() is not None
+
+
+@st.cache_data(max_entries=MEMO_ENTRIES, show_spinner=False)
+def _predict(metrics, profile):
+    predictor, _ = _engines()
+    return predictor.predict(metrics, profile)
+
+
+@st.cache_data(max_entries=MEMO_ENTRIES, show_spinner=False)
+def _nutrition(payload, week):
+    # `week` is only part of the key: the meal rotation changes every ISO week
+    _, recommender = _engines()
+    return recommender.generate_recommendations(payload)
+
+
+def predict(metrics, profile):
+    """The /api/predict result for these inputs; raises api.ApiError or requests errors over HTTP"""
+    if embedded():
+        return _predict(metrics, profile)
+    data = api.query_json(f"{ML_URL}/predict", json={"metrics": metrics, "userProfile": profile})
+    return data["prediction"]
+
+
+def nutrition(payload):
+    """The /api/nutrition result for this payload"""
+    if embedded():
+        return _nutrition(payload, datetime.now().isocalendar()[1])
+    return api.query_json(f"{ML_URL}/nutrition", json=payload)["recommendations"]
+
+
+def _present(values):
+    # Absent fields fall back to the engines' defaults, as when the backend omits them
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def prediction_inputs(latest, user):
+    """(metrics, profile) shaped like backend/routes/predictions.js builds them"""
+    profile = (user or {}).get("profile") or {}
+    metrics = _present((latest or {}).get("metrics") or {})
+    return metrics, _present({
+        "age": profile.get("age"),
+        "gender": profile.get("gender"),
+        "weight": profile.get("weight"),
+        "height": profile.get("height"),
+        "occupation": profile.get("occupation"),
+        "exerciseFrequency": profile.get("exerciseFrequency"),
+        "sleepHours": profile.get("averageSleepHours")
+    })
+
+
+def nutrition_inputs(latest, user):
+    profile = (user or {}).get("profile") or {}
+    metrics = (latest or {}).get("metrics") or {}
+    return _present({
+        "occupation": profile.get("occupation"),
+        "gender": profile.get("gender"),
+        "age": profile.get("age"),
+        "weight": profile.get("weight"),
+        "height": profile.get("height"),
+        "stressLevel": metrics.get("stressLevel"),
+        "heartRate": metrics.get("heartRate"),
+        "exerciseFrequency": profile.get("exerciseFrequency"),
+        "dietType": profile.get("dietType"),
+        "healthConditions": profile.get("currentChronicConditions")
+    })
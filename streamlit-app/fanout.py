@@ -0,0 +1,67 @@
+"""
+Concurrent data loading for Streamlit pages.
+
+`fan_out` starts every fetch a page needs on a shared thread pool and yields
+results on the script thread in completion order, so each section can be
+drawn into its placeholder as soon as its own data arrives. Page latency is
+then the slowest single call, capped by the deadline; whatever is still
+running at the deadline is reported as timed out, and its result still lands
+in the API cache for the next rerun. Inside an `api_client.page_budget` the
+deadline is whatever is left of the page's budget.
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from time import monotonic
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import api_client as api
+
+PAGE_DEADLINE_SECONDS = float(os.getenv("PAGE_DEADLINE_SECONDS", "4"))
+MAX_WORKERS = 16
+
+
+class SectionTimeout(Exception):
+    """The section's data did not arrive before the page deadline"""
+
+
+@st.cache_resource(show_spinner=False)
+def _executor():
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="page-fetch")
+
+
+def _bind(fetch):
+    """Run `fetch` in a worker with this script run's Streamlit context and trace span"""
+    script_ctx = get_script_run_ctx()
+    context = contextvars.copy_context()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), script_ctx)
+        return context.run(fetch)
+    return run
+
+
+def fan_out(fetches, deadline=None):
+    """
+    Run {name: zero-argument callable} concurrently; yields (name, result, error)
+    as each finishes. error is the exception a fetch raised, or SectionTimeout.
+    """
+    if deadline is None:
+        deadline = api.remaining(PAGE_DEADLINE_SECONDS)
+    pool = _executor()
+    pending = {pool.submit(_bind(fetch)): name for name, fetch in fetches.items()}
+    stop = monotonic() + deadline
+    while pending:
+        remaining = stop - monotonic()
+        if remaining <= 0:
+            break
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = pending.pop(future)
+            error = future.exception()
+            yield name, None if error else future.result(), error
+    for name in pending.values():
+        yield name, None, SectionTimeout(name)
@@ -0,0 +1,122 @@
+"""
+Metric history for the dashboard chart, fetched incrementally.
+
+Each session keeps the readings it has already seen in `st.session_state`,
+one DataFrame per metric with compact dtypes (uint32 epoch seconds and
+float32 values, 8 bytes a reading, so a million readings is 8 MB). A sync
+only asks the backend for readings newer than the last one it holds, in
+pages, and appends them (the backend checks the session's token and reads
+the signed-in user's history from the ML service); reruns in between make no call at all. Charts are
+drawn with WebGL (`Scattergl`) from at most a few thousand points: the
+selected range is plotted raw when it is small enough, otherwise aggregated
+into one mean/min/max bucket per horizontal pixel.
+"""
+import os
+from time import monotonic
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import api_client as api
+from config import BACKEND_URL
+
+PAGE_POINTS = int(os.getenv("HISTORY_PAGE_POINTS", "200000"))
+# A rerun within this many seconds of the last complete sync reuses what the session holds
+REFRESH_SECONDS = api.CACHE_TTL_SECONDS
+MAX_RAW_POINTS = 10000
+CHART_BUCKETS = 1000
+TIME_DTYPE = np.uint32
+VALUE_DTYPE = np.float32
+
+
+def _state(metric):
+    return st.session_state.setdefault("history", {}).get(metric)
+
+
+def frame(metric):
+    """Everything this session holds for `metric`, oldest first (empty before the first sync)"""
+    state = _state(metric)
+    if state is None:
+        return pd.DataFrame({"t": np.empty(0, TIME_DTYPE), "v": np.empty(0, VALUE_DTYPE)})
+    return state["frame"]
+
+
+def due(metric):
+    """Whether the next rerun should ask the backend for new readings"""
+    state = _state(metric)
+    return state is None or not state["complete"] or monotonic() - state["synced_at"] > REFRESH_SECONDS
+
+
+def since(metric):
+    held = frame(metric)
+    return int(held["t"].iloc[-1]) if len(held) else None
+
+
+def fetch_new(metric, after, token, budget=None):
+    """
+    The signed-in user's readings newer than `after`, page by page, until there are no more or
+    `budget` seconds have passed; returns (times, values, complete). Touches
+    no session state, so it can run in a fan_out worker.
+    """
+    stop = None if budget is None else monotonic() + budget
+    times, values = [], []
+    while True:
+        params = {"metric": metric, "limit": PAGE_POINTS}
+        if after is not None:
+            params["since"] = after
+        # Not api.get_json: the session state is the cache, a second copy would double the memory
+        response = api.request("GET", f"{BACKEND_URL}/predictions/history", token, params=params)
+        page = response.json()
+        if response.status_code >= 300:
+            raise api.ApiError(response.status_code, page)
+        points = page["points"]
+        if points["t"]:
+            times.append(np.asarray(points["t"], dtype=TIME_DTYPE))
+            values.append(np.asarray(points["v"], dtype=VALUE_DTYPE))
+        after = page["last"]
+        if not page["more"]:
+            complete = True
+            break
+        if stop is not None and monotonic() >= stop:
+            complete = False
+            break
+    if not times:
+        return np.empty(0, TIME_DTYPE), np.empty(0, VALUE_DTYPE), complete
+    return np.concatenate(times), np.concatenate(values), complete
+
+
+def append(metric, times, values, complete=True):
+    """Add a fetch_new result to this session's copy; returns the whole frame"""
+    held = frame(metric)
+    if len(times):
+        new = pd.DataFrame({"t": times, "v": values})
+        held = new if not len(held) else pd.concat([held, new], ignore_index=True)
+    st.session_state.setdefault("history", {})[metric] = {
+        "frame": held,
+        "complete": complete,
+        "synced_at": monotonic()
+    }
+    return held
+
+
+def screen_points(held, start=None, width=CHART_BUCKETS):
+    """
+    Chart data for readings at or after `start`: (times, mean, low, high)
+    with datetime times. low/high are None when the readings are plotted raw.
+    """
+    t = held["t"].to_numpy()
+    v = held["v"].to_numpy()
+    if start is not None:
+        first = int(np.searchsorted(t, start))
+        t, v = t[first:], v[first:]
+    if len(t) <= MAX_RAW_POINTS:
+        return pd.to_datetime(t, unit="s"), v, None, None
+    # Equal-count buckets: one per pixel, each drawn as its mean and min-max range
+    edges = np.linspace(0, len(t), width + 1).astype(np.int64)[:-1]
+    counts = np.diff(np.append(edges, len(t)))
+    mean = np.add.reduceat(v.astype(np.float64), edges) / counts
+    low = np.minimum.reduceat(v, edges)
+    high = np.maximum.reduceat(v, edges)
+    middle = t[edges + counts // 2]
+    return pd.to_datetime(middle, unit="s"), mean, low, high
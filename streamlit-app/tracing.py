@@ -0,0 +1,138 @@
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+SERVICE_NAME = 'medtwin-streamlit'
+EXPORT_PATH = os.getenv('TRACE_EXPORT_PATH', os.path.join(os.path.dirname(__file__), 'traces', 'spans.jsonl'))
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', '1') != '0'
+
+_current = contextvars.ContextVar('current_trace_span', default=None)
+_lock = threading.Lock()
+
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+def _export(spans):
+    """Append spans as one OTLP/JSON line (same layout as the ML service)"""
+    if not TRACING_ENABLED or not spans:
+        return
+    payload = {
+        'resourceSpans': [{
+            'resource': {'attributes': [_attribute('service.name', SERVICE_NAME)]},
+            'scopeSpans': [{'scope': {'name': 'medtwin.tracing'}, 'spans': spans}]
+        }]
+    }
+    try:
+        with _lock:
+            os.makedirs(os.path.dirname(EXPORT_PATH), exist_ok=True)
+            with open(EXPORT_PATH, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(payload, separators=(',', ':')) + '\n')
+    except OSError:
+        pass
+
+
+def _record(name, kind, trace_id, span_id, parent_id, start_ns, attributes, error=False):
+    span = {
+        'traceId': trace_id,
+        'spanId': span_id,
+        'name': name,
+        'kind': kind,
+        'startTimeUnixNano': str(start_ns),
+        'endTimeUnixNano': str(time.time_ns()),
+        'attributes': [_attribute(k, v) for k, v in attributes.items()],
+        'status': {'code': 2 if error else 1}
+    }
+    if parent_id:
+        span['parentSpanId'] = parent_id
+    _export([span])
+
+
+@contextmanager
+def page_span(name):
+    """Group all backend/ML calls made while rendering one page under a single trace"""
+    parent = _current.get()
+    trace_id = parent[0] if parent else secrets.token_hex(16)
+    parent_id = parent[1] if parent else None
+    span_id = secrets.token_hex(8)
+    token = _current.set((trace_id, span_id))
+    start = time.time_ns()
+    error = False
+    try:
+        yield trace_id
+    except Exception:
+        error = True
+        raise
+    finally:
+        _current.reset(token)
+        _record(name, 1, trace_id, span_id, parent_id, start, {}, error)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Child span of the current page span (a no-op outside one). Same signature
+    as the ML service's `tracing.span`, so embedded engines record their
+    stages into the page's trace.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    trace_id, parent_id = parent
+    span_id = secrets.token_hex(8)
+    token = _current.set((trace_id, span_id))
+    start = time.time_ns()
+    error = False
+    try:
+        yield span_id
+    except Exception:
+        error = True
+        raise
+    finally:
+        _current.reset(token)
+        _record(name, 1, trace_id, span_id, parent_id, start, attributes, error)
+
+
+def traced_request(method, url, session=None, **kwargs):
+    """
+    `requests.request` (or `session.request`) with a client span and a W3C
+    `traceparent` header. The upstream's own span ID is read back from its
+    `traceparent` response header.
+    """
+    parent = _current.get()
+    trace_id = parent[0] if parent else secrets.token_hex(16)
+    parent_id = parent[1] if parent else None
+    span_id = secrets.token_hex(8)
+
+    headers = dict(kwargs.pop('headers', None) or {})
+    headers['traceparent'] = f'00-{trace_id}-{span_id}-01'
+
+    attributes = {'http.method': method, 'http.url': url}
+    start = time.time_ns()
+    try:
+        response = (session or requests).request(method, url, headers=headers, **kwargs)
+    except Exception:
+        _record(f'{method} {url}', 3, trace_id, span_id, parent_id, start, attributes, error=True)
+        raise
+
+    attributes['http.status_code'] = response.status_code
+    upstream = response.headers.get('traceparent')
+    if upstream:
+        attributes['upstream.traceparent'] = upstream
+    _record(f'{method} {url}', 3, trace_id, span_id, parent_id, start, attributes,
+            error=response.status_code >= 500)
+    return response
@@ -0,0 +1,107 @@
+"""
+Resumable, chunked document uploads to the backend.
+
+`st.file_uploader` has already put the whole file in the Streamlit server's
+memory (up to `server.maxUploadSize`); this module does not copy it again.
+It hashes the file and sends it in the chunk size the backend asks for, each
+chunk with its own SHA-256, so the request adds one chunk on top and the
+backend, which writes every chunk straight to disk and only counts it once
+its checksum matches, never holds more than one. The upload id is kept in
+`st.session_state` per file, so pressing Upload again after a dropped
+connection, a failed chunk or a page change picks up from the last byte the
+backend verified instead of starting over.
+
+Creating an upload is not idempotent: api_client does not retry the POST
+once it may have reached the backend, and if its answer is lost the next
+attempt creates another upload. The abandoned one is pruned after a day.
+"""
+import hashlib
+
+import streamlit as st
+
+import api_client as api
+
+HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def _checksum(file):
+    digest = hashlib.sha256()
+    file.seek(0)
+    for block in iter(lambda: file.read(HASH_BLOCK_BYTES), b""):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def _payload(response):
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def _json(response):
+    payload = _payload(response)
+    if response.status_code >= 300:
+        raise api.ApiError(response.status_code, payload)
+    return payload
+
+
+def _resume_or_start(base_url, token, key, fields):
+    """The backend's status for this file's unfinished upload, or a new one"""
+    upload_id = st.session_state.setdefault("uploads", {}).get(key)
+    if upload_id:
+        response = api.request("GET", f"{base_url}/{upload_id}", token)
+        # Gone when the backend pruned it or finished it; start over
+        if response.status_code != 404:
+            return _json(response)
+    status = _json(api.post(base_url, token, json=fields))
+    st.session_state["uploads"][key] = status["uploadId"]
+    return status
+
+
+def upload_document(backend_url, token, file, document_type, notes="", progress=None):
+    """
+    Send an uploaded file as a medical document; returns the created document.
+    `progress(sent_bytes, total_bytes)` is called after every chunk.
+    Raises api.ApiError or requests errors; calling again resumes.
+    """
+    # Outside the page budget: a large upload takes as long as it takes, chunk by chunk
+    with api.page_budget(None):
+        base_url = f"{backend_url}/documents/uploads"
+        size = file.size
+        sha256 = _checksum(file)
+        key = f"{file.name}:{size}:{sha256}"
+        status = _resume_or_start(base_url, token, key, {
+            "fileName": file.name,
+            "fileSize": size,
+            "sha256": sha256,
+            "documentType": document_type,
+            "notes": notes
+        })
+        upload_id, chunk_size, received = status["uploadId"], status["chunkSize"], status["received"]
+
+        while received < size:
+            if progress:
+                progress(received, size)
+            file.seek(received)
+            chunk = file.read(chunk_size)
+            # PUT at an explicit offset is idempotent, so api_client retries it on dropped connections
+            response = api.request("PUT", f"{base_url}/{upload_id}", token, read_only=True,
+                                   params={"offset": received}, data=chunk,
+                                   headers={"Content-Type": "application/octet-stream",
+                                            "X-Chunk-Sha256": hashlib.sha256(chunk).hexdigest()})
+            if response.status_code == 409:
+                # The backend holds a different amount (a retried chunk had already landed); continue from there
+                held = (_payload(response) or {}).get("received")
+                if held is None or held == received:
+                    raise api.ApiError(409, _payload(response))
+                received = held
+                continue
+            received = _json(response)["received"]
+        if progress:
+            progress(size, size)
+
+        document = _json(api.post(f"{base_url}/{upload_id}/complete", token))["document"]
+        st.session_state["uploads"].pop(key, None)
+        return document
+
@@ -0,0 +1,23 @@
+"""
+One module per sidebar page, imported the first time that page is shown.
+
+Streamlit reruns app.py on every interaction, but imported modules stay in
+`sys.modules`, so a page's code and its heavy dependencies (pandas, plotly,
+the engines) are loaded once per process and only for pages that are
+actually visited. The login screen imports none of them.
+"""
+import importlib
+
+# Sidebar label -> module under views/ with a show() function
+PAGES = {
+    "Dashboard": "dashboard",
+    "Health Data Entry": "health_entry",
+    "AI Predictions": "predictions",
+    "Nutrition Plan": "nutrition",
+    "Medical Documents": "documents",
+    "Profile": "profile"
+}
+
+
+def show(page):
+    importlib.import_module(f"views.{PAGES[page]}").show()
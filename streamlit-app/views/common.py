@@ -0,0 +1,24 @@
+"""Helpers shared by the predictions and nutrition pages"""
+import streamlit as st
+
+import api_client as api
+import engines
+from config import BACKEND_URL
+from fanout import fan_out
+
+
+def load_latest_and_profile():
+    """(latest reading, user document, error message) fetched concurrently"""
+    token = st.session_state.user_token
+    results = {name: (data, error) for name, data, error in fan_out({
+        "latest": lambda: api.get_json(f"{BACKEND_URL}/health/latest", token=token),
+        "profile": lambda: api.get_json(f"{BACKEND_URL}/user/profile", token=token)
+    })}
+    if any(error is not None for _, error in results.values()):
+        return None, None, "Could not load your health data. Please try again."
+    return results["latest"][0], results["profile"][0], None
+
+
+def engine_caption(elapsed):
+    mode = "in-process engines" if engines.embedded() else "ML service"
+    st.caption(f"Computed by the {mode} in {elapsed * 1000:.0f} ms")
@@ -0,0 +1,186 @@
+"""Dashboard: latest reading, heart-rate trend, today's meals, documents and profile"""
+from datetime import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import api_client as api
+import history
+from config import BACKEND_URL
+from fanout import PAGE_DEADLINE_SECONDS, SectionTimeout, fan_out
+
+
+def show():
+    st.title("📊 Health Dashboard")
+    token = st.session_state.user_token
+    
+    # Placeholders fix the layout up front; each fills in as its data arrives
+    slots = {"latest": st.empty()}
+    st.markdown("---")
+    slots["trend"] = st.empty()
+    col1, col2 = st.columns(2)
+    with col1:
+        slots["prediction"] = st.empty()
+        slots["documents"] = st.empty()
+    with col2:
+        slots["nutrition"] = st.empty()
+        slots["profile"] = st.empty()
+    for slot in slots.values():
+        slot.caption("Loading…")
+    
+    fetches = {
+        # No per-call timeouts: the page budget app.py sets cuts every call off at the deadline
+        "latest": lambda: api.get_json(f"{BACKEND_URL}/health/latest", token=token),
+        "trend": fetch_trend((st.session_state.user_data or {}).get("id"), token),
+        "nutrition": lambda: api.query_json(f"{BACKEND_URL}/predictions/nutrition", token=token),
+        "documents": lambda: api.get_json(f"{BACKEND_URL}/documents", token=token),
+        "profile": lambda: api.get_json(f"{BACKEND_URL}/user/profile", token=token)
+    }
+    for name, data, error in fan_out(fetches):
+        # The latest reading carries its prediction, so one fetch fills two sections
+        targets = ["latest", "prediction"] if name == "latest" else [name]
+        for target in targets:
+            title, render = DASHBOARD_SECTIONS[target]
+            with slots[target].container():
+                if isinstance(error, SectionTimeout):
+                    st.info(f"{title} is taking longer than usual; it will appear on the next refresh.")
+                elif isinstance(error, api.ApiError) and error.status_code == 404:
+                    render(None)
+                elif error is not None:
+                    st.warning(f"{title} is unavailable right now.")
+                else:
+                    render(data)
+
+
+def render_latest_metrics(latest):
+    metrics = (latest or {}).get("metrics") or {}
+    if not metrics:
+        st.info("No readings yet. Add some on the Health Data Entry page.")
+        return
+    
+    def show(value, unit=""):
+        return "—" if value is None else f"{value}{unit}"
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Heart Rate", show(metrics.get("heartRate"), " bpm"))
+    with col2:
+        systolic, diastolic = metrics.get("bloodPressureSystolic"), metrics.get("bloodPressureDiastolic")
+        st.metric("Blood Pressure", f"{show(systolic)}/{show(diastolic)}")
+    with col3:
+        st.metric("SpO2", show(metrics.get("oxygenSaturation"), "%"))
+    with col4:
+        st.metric("Sleep", show(metrics.get("sleepHours"), " hrs"))
+
+
+def render_latest_prediction(latest):
+    st.markdown("### 🤖 Latest Prediction")
+    prediction = (latest or {}).get("prediction") or {}
+    if prediction.get("overallHealthScore") is None:
+        st.caption("Run AI Predictions to score your latest reading.")
+        return
+    st.markdown(f"**Overall Health Score:** {prediction['overallHealthScore']}/100")
+    st.markdown(f"**Risk Level:** {prediction.get('riskLevel', '—')}")
+    for recommendation in prediction.get("recommendations", [])[:3]:
+        st.write(f"- {recommendation}")
+
+
+def render_trend(update):
+    # `update` is what this run fetched (None when the session's copy is fresh)
+    if update is not None:
+        history.append(TREND_METRIC, *update)
+    trend_chart()
+    if update is not None and not update[2]:
+        st.caption("Older readings are still syncing; the rest appears on the next refresh.")
+
+
+@st.fragment
+def trend_chart():
+    # A fragment: changing the range redraws only the chart, not the other sections
+    held = history.frame(TREND_METRIC)
+    fig = go.Figure()
+    if len(held):
+        span_label = st.radio("Range", list(TREND_RANGES), index=len(TREND_RANGES) - 1,
+                              horizontal=True, key="trend_range")
+        span_seconds = TREND_RANGES[span_label]
+        start = None if span_seconds is None else int(held["t"].iloc[-1]) - span_seconds
+        # WebGL traces; at most one point per pixel however long the history is
+        times, mean, low, high = history.screen_points(held, start)
+        if low is not None:
+            fig.add_trace(go.Scattergl(x=times, y=high, mode="lines", line=dict(width=0),
+                                       showlegend=False, hoverinfo="skip"))
+            fig.add_trace(go.Scattergl(x=times, y=low, mode="lines", line=dict(width=0), fill="tonexty",
+                                       fillcolor="rgba(30, 64, 175, 0.15)", name="Min-max"))
+        fig.add_trace(go.Scattergl(x=times, y=mean, mode="lines", name="Heart Rate"))
+        title = f"Heart Rate Trend ({len(held):,} readings)"
+    else:
+        # Sample chart until the user has synced readings
+        dates = pd.date_range(start='2024-01-01', periods=30, freq='D')
+        heart_rate = [70 + i % 10 for i in range(30)]
+        fig.add_trace(go.Scatter(x=dates, y=heart_rate, mode='lines+markers', name='Heart Rate'))
+        title = "Heart Rate Trend (Last 30 Days)"
+    fig.update_layout(title=title, xaxis_title="Date", yaxis_title="BPM")
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_todays_meals(nutrition):
+    st.markdown("### 🍎 Today's Meals")
+    recommendations = (nutrition or {}).get("recommendations") or {}
+    today = datetime.now().strftime("%A")
+    plan = next((day for day in recommendations.get("mealPlans", []) if day.get("day") == today), None)
+    if plan is None:
+        st.caption("Add a health reading to get a meal plan.")
+        return
+    st.caption(f"Daily target: {recommendations.get('dailyCalorieTarget', '—')} kcal")
+    for meal in ("breakfast", "lunch", "dinner"):
+        item = plan.get(meal) or {}
+        st.write(f"**{meal.title()}:** {item.get('name', '—')} ({item.get('calories', '—')} kcal)")
+
+
+def render_recent_documents(documents):
+    st.markdown("### 📁 Recent Documents")
+    if not documents:
+        st.caption("No documents uploaded yet.")
+        return
+    for doc in documents[:5]:
+        st.write(f"📄 {doc.get('fileName', 'Document')} · {doc.get('documentType', '')} · "
+                 f"{str(doc.get('uploadDate', ''))[:10]}")
+
+
+def render_profile_summary(user):
+    st.markdown("### 👤 Profile")
+    profile = (user or {}).get("profile") or {}
+    if not any(profile.get(key) for key in ("name", "age", "occupation")):
+        st.caption("Complete your profile for better recommendations.")
+        return
+    st.write(f"**{profile.get('name') or (user or {}).get('email', '')}**")
+    details = [f"{profile['age']} years" if profile.get("age") else None, profile.get("occupation") or None,
+               f"{profile['height']} cm" if profile.get("height") else None,
+               f"{profile['weight']} kg" if profile.get("weight") else None]
+    st.caption(" · ".join(detail for detail in details if detail))
+
+
+TREND_METRIC = "heartRate"
+TREND_RANGES = {"7 days": 7 * 86400, "30 days": 30 * 86400, "1 year": 365 * 86400, "All": None}
+
+
+# Section name -> (title used in degraded messages, renderer)
+DASHBOARD_SECTIONS = {
+    "latest": ("Latest readings", render_latest_metrics),
+    "prediction": ("Latest prediction", render_latest_prediction),
+    "trend": ("Heart rate trend", render_trend),
+    "nutrition": ("Today's meals", render_todays_meals),
+    "documents": ("Recent documents", render_recent_documents),
+    "profile": ("Profile", render_profile_summary)
+}
+
+
+def fetch_trend(user_id, token):
+    """The fan_out fetch for the trend section: only readings the session doesn't hold yet"""
+    if not user_id or not history.due(TREND_METRIC):
+        return lambda: None
+    after = history.since(TREND_METRIC)
+    # Half of what is left of the page budget, so the other sections still get theirs
+    budget = api.remaining(PAGE_DEADLINE_SECONDS) / 2
+    return lambda: history.fetch_new(TREND_METRIC, after, token, budget=budget)
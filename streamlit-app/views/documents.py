@@ -0,0 +1,64 @@
+"""Medical Documents: resumable uploads and the user's document list"""
+import streamlit as st
+
+import uploads
+from config import BACKEND_URL
+
+
+def show():
+    st.title("📁 Medical Documents")
+    upload_form()
+    document_list()
+
+
+@st.fragment
+def upload_form():
+    # A fragment: choosing a file or typing notes doesn't redraw the document list
+    st.subheader("Upload New Document")
+    
+    doc_type = st.selectbox("Document Type", 
+                           ["X-Ray", "MRI", "Prescription", "Lab Report"])
+    uploaded_file = st.file_uploader("Choose a file", 
+                                    type=['pdf', 'jpg', 'jpeg', 'png', 'docx'])
+    notes = st.text_area("Notes (optional)")
+    
+    if st.button("Upload Document", type="primary"):
+        if uploaded_file:
+            bar = st.progress(0.0, text=f"Uploading {uploaded_file.name}…")
+            
+            def show_progress(sent, total):
+                bar.progress(sent / total, text=f"Uploading {uploaded_file.name}: "
+                                                f"{sent / 1e6:.1f} of {total / 1e6:.1f} MB")
+            
+            try:
+                # Sent in checksummed chunks; pressing Upload again after a failure resumes
+                uploads.upload_document(BACKEND_URL, st.session_state.user_token, uploaded_file,
+                                        doc_type, notes, progress=show_progress)
+                st.success(f"✅ {uploaded_file.name} uploaded successfully!")
+            except Exception as e:
+                st.error(f"Upload interrupted: {str(e)}. Press Upload Document again to resume.")
+        else:
+            st.warning("Please select a file to upload")
+
+
+def document_list():
+    st.markdown("---")
+    st.subheader("Your Documents")
+    
+    # Mock document list
+    documents = [
+        {"type": "X-Ray", "name": "Chest X-Ray", "date": "2024-01-15"},
+        {"type": "Lab Report", "name": "Blood Test Results", "date": "2024-01-10"},
+        {"type": "Prescription", "name": "Monthly Prescription", "date": "2024-01-05"}
+    ]
+    
+    for doc in documents:
+        col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+        with col1:
+            st.write(f"📄 {doc['name']}")
+        with col2:
+            st.write(doc['type'])
+        with col3:
+            st.write(doc['date'])
+        with col4:
+            st.button("View", key=doc['name'])
@@ -0,0 +1,59 @@
+"""Health Data Entry: record a reading with the backend"""
+from datetime import datetime
+
+import streamlit as st
+
+import api_client as api
+from config import BACKEND_URL
+
+
+def show():
+    st.title("📝 Enter Health Data")
+    entry_form()
+
+
+@st.fragment
+def entry_form():
+    # A fragment: editing a field reruns only the form, not the sidebar and page shell
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        heart_rate = st.number_input("Heart Rate (bpm)", min_value=40, max_value=200, value=72)
+        systolic = st.number_input("Systolic BP (mmHg)", min_value=80, max_value=200, value=120)
+        oxygen = st.number_input("Oxygen Saturation (%)", min_value=70, max_value=100, value=98)
+        temperature = st.number_input("Body Temperature (°F)", min_value=95.0, max_value=105.0, value=98.6)
+        glucose = st.number_input("Blood Glucose (mg/dL)", min_value=50, max_value=400, value=100)
+    
+    with col2:
+        diastolic = st.number_input("Diastolic BP (mmHg)", min_value=40, max_value=130, value=80)
+        sleep_hours = st.number_input("Sleep Hours", min_value=0.0, max_value=24.0, value=7.0)
+        steps = st.number_input("Steps", min_value=0, max_value=50000, value=8000)
+        calories = st.number_input("Calories Burned", min_value=0, max_value=5000, value=2000)
+        stress_level = st.slider("Stress Level", min_value=1, max_value=10, value=5)
+    
+    weight = st.number_input("Weight (kg)", min_value=30.0, max_value=300.0, value=70.0)
+    
+    if st.button("Save Health Data", type="primary", use_container_width=True):
+        health_data = {
+            "heartRate": heart_rate,
+            "bloodPressure": f"{systolic}/{diastolic}",
+            "oxygenSaturation": oxygen,
+            "bodyTemperature": temperature,
+            "bloodGlucose": glucose,
+            "sleepHours": sleep_hours,
+            "steps": steps,
+            "caloriesBurned": calories,
+            "stressLevel": stress_level,
+            "weight": weight,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        try:
+            response = api.post(f"{BACKEND_URL}/health/data", token=st.session_state.user_token,
+                                json=health_data)
+            if response.status_code == 201:
+                st.success("✅ Health data saved successfully!")
+            else:
+                st.error("Failed to save data")
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
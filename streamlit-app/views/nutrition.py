@@ -0,0 +1,80 @@
+"""Nutrition Plan: the week's meals, drinks, snacks and hydration from the nutrition engine"""
+import time
+from datetime import datetime
+
+import streamlit as st
+
+import engines
+from views.common import engine_caption, load_latest_and_profile
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def show_meal(title, meal):
+    st.markdown(f"### {title}")
+    st.write(f"**{meal.get('name', '—')}**")
+    st.write(f"Calories: {meal.get('calories', '—')} kcal")
+    if meal.get("description"):
+        st.write(meal["description"])
+    if meal.get("bestTime"):
+        st.caption(f"Best time: {meal['bestTime']}")
+
+
+@st.fragment
+def day_plan(plan):
+    # A fragment: picking another day redraws only the meals, without reloading the plan
+    day = st.selectbox("Select Day", DAYS, index=datetime.now().weekday())
+    meals = next((meal_plan for meal_plan in plan["mealPlans"] if meal_plan["day"] == day), plan["mealPlans"][0])
+    st.markdown(f"**Daily calorie target:** {plan['dailyCalorieTarget']} kcal · "
+                f"**{day}:** {meals['totalCalories']} kcal planned")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        show_meal("🌅 Breakfast", meals["breakfast"])
+
+    with col2:
+        show_meal("🌞 Lunch", meals["lunch"])
+
+    with col3:
+        show_meal("🌙 Dinner", meals["dinner"])
+
+
+def show():
+    st.title("🍎 AI Nutrition Recommendations")
+
+    st.info("Personalized meal plans based on your health profile and occupation")
+
+    latest, user, error = load_latest_and_profile()
+    if error:
+        st.error(error)
+        return
+    try:
+        started = time.perf_counter()
+        plan = engines.nutrition(engines.nutrition_inputs(latest, user))
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+        return
+
+    day_plan(plan)
+    engine_caption(elapsed)
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 🥤 Healthy Drinks")
+        for drink in plan["healthyDrinks"]:
+            st.write(f"- **{drink['name']}**: {drink.get('benefits', '')}")
+
+    with col2:
+        st.markdown("### 🍪 Healthy Snacks")
+        for snack in plan["healthySnacks"]:
+            st.write(f"- **{snack['name']}** ({snack.get('calories', '—')} kcal): {snack.get('benefits', '')}")
+
+    hydration = plan["hydrationPlan"]
+    st.markdown("---")
+    st.markdown(f"### 💧 Hydration: {hydration['dailyTargetLiters']} L "
+                f"({hydration['dailyTargetGlasses']} glasses) a day")
@@ -0,0 +1,58 @@
+"""AI Predictions: score the latest reading with the health predictor"""
+import time
+
+import streamlit as st
+
+import engines
+from views.common import engine_caption, load_latest_and_profile
+
+
+def show():
+    st.title("🤖 AI Health Predictions")
+    
+    st.info("Click the button below to get AI-powered health insights based on your latest data")
+    
+    if st.button("Analyze My Health", type="primary", use_container_width=True):
+        with st.spinner("Analyzing your health data..."):
+            latest, user, error = load_latest_and_profile()
+            if error:
+                st.error(error)
+                return
+            if not (latest or {}).get("metrics"):
+                st.warning("No health readings yet. Add one on the Health Data Entry page first.")
+                return
+            try:
+                started = time.perf_counter()
+                prediction = engines.predict(*engines.prediction_inputs(latest, user))
+                elapsed = time.perf_counter() - started
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+                return
+        
+        risk = prediction.get("riskLevel", "Low")
+        box = {"Low": "success-box", "Moderate": "warning-box"}.get(risk, "danger-box")
+        st.markdown(f'<div class="{box}">', unsafe_allow_html=True)
+        st.markdown("### 🎯 Health Analysis Results")
+        st.markdown(f"**Overall Health Score:** {prediction['overallHealthScore']}/100")
+        st.markdown(f"**Risk Level:** {risk}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        engine_caption(elapsed)
+        
+        st.markdown("---")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("### 💬 Insights")
+            for insight in prediction.get("insights", []):
+                st.write(f"- {insight}")
+        
+        with col2:
+            st.markdown("### ⚠️ Areas for Improvement")
+            for area in prediction.get("areasNeedingAttention", []):
+                st.write(f"- {area}")
+        
+        st.markdown("---")
+        st.markdown("### 💡 Recommendations")
+        for i, recommendation in enumerate(prediction.get("recommendations", []), 1):
+            st.write(f"{i}. {recommendation}")
@@ -0,0 +1,53 @@
+"""Profile: basic, health and lifestyle details"""
+import streamlit as st
+
+
+def show():
+    st.title("👤 User Profile")
+    profile_form()
+
+
+@st.fragment
+def profile_form():
+    # A fragment: editing a field reruns only the form, not the sidebar and page shell
+    tab1, tab2, tab3 = st.tabs(["Basic Info", "Health Details", "Lifestyle"])
+    
+    with tab1:
+        st.subheader("Basic Information")
+        col1, col2 = st.columns(2)
+        with col1:
+            name = st.text_input("Full Name", value="")
+            age = st.number_input("Age", min_value=1, max_value=120, value=25)
+            gender = st.selectbox("Gender", ["Male", "Female", "Other"])
+        with col2:
+            email = st.text_input("Email", value=st.session_state.user_data.get('email', ''))
+            phone = st.text_input("Phone Number", value="")
+            occupation = st.selectbox("Occupation", 
+                                     ["Software Engineer", "Doctor", "Teacher", 
+                                      "Driver", "Student", "Other"])
+    
+    with tab2:
+        st.subheader("Health Details")
+        col1, col2 = st.columns(2)
+        with col1:
+            height = st.number_input("Height (cm)", min_value=100, max_value=250, value=170)
+            weight = st.number_input("Weight (kg)", min_value=30, max_value=300, value=70)
+        with col2:
+            blood_group = st.selectbox("Blood Group", 
+                                      ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"])
+            conditions = st.multiselect("Chronic Conditions", 
+                                       ["Diabetes", "Hypertension", "Asthma", 
+                                        "Heart Disease", "None"])
+    
+    with tab3:
+        st.subheader("Lifestyle Information")
+        exercise = st.selectbox("Exercise Frequency", 
+                               ["Daily", "3-4 times/week", "1-2 times/week", "Rarely"])
+        diet = st.selectbox("Diet Type", 
+                           ["Vegetarian", "Non-Vegetarian", "Vegan", "Pescatarian"])
+        smoking = st.selectbox("Smoking", ["Never", "Former", "Current"])
+        alcohol = st.selectbox("Alcohol Consumption", 
+                              ["Never", "Occasionally", "Regularly"])
+    
+    if st.button("Save Profile", type="primary", use_container_width=True):
+        st.success("✅ Profile updated successfully!")